@@ -1,11 +1,16 @@
+import secrets
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.core.config import settings
 from app.core.security import decode_access_token
 from app.core.exceptions import InvalidTokenError, TokenExpiredError
 from app.schemas.auth import TokenData
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
@@ -30,6 +35,29 @@ async def get_current_user(
         )
 
 
+async def verify_metrics_access(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> None:
+    """
+    Dependency for the metrics endpoints.
+    Accepts the static METRICS_TOKEN (for Prometheus scrapers) or a user's JWT.
+    """
+    if credentials is not None:
+        token = credentials.credentials
+        if settings.metrics_token and secrets.compare_digest(token, settings.metrics_token):
+            return
+        try:
+            if decode_access_token(token).get("sub") is not None:
+                return
+        except (InvalidTokenError, TokenExpiredError):
+            pass
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or missing metrics token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
 def verify_websocket_token(token: str) -> TokenData:
     """
     Verify JWT token for WebSocket connections.
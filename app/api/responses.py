@@ -0,0 +1,121 @@
+import hashlib
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+# Authenticated, frequently changing data: clients may keep a copy but must
+# revalidate it (cheaply, via If-None-Match) before every reuse
+REVALIDATE = "private, no-cache"
+
+# (ETag, body) rendered per state key (e.g. the inventory version); the same
+# key always names the same content, so it can be served again as-is
+_BODY_CACHE_SIZE = 16
+_bodies: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+
+
+def json_response(model: BaseModel, headers: Optional[dict[str, str]] = None) -> Response:
+    """
+    Serialize an already-typed response model straight to JSON bytes.
+
+    Returning a Response skips FastAPI's response_model pass, which would
+    validate the model again and encode it through jsonable_encoder; output
+    is the same (by alias). Keep ``response_model`` on the route for the
+    OpenAPI schema.
+    """
+    return Response(content=model.model_dump_json(by_alias=True), media_type="application/json", headers=headers)
+
+
+def etag_for(*parts: object) -> str:
+    """Strong ETag from a content hash or from state identifiers such as a version."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def is_fresh(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ validators match too
+    etag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE) -> Response:
+    """Empty 304 response carrying the validator headers."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def cached_json(
+    request: Request,
+    model: BaseModel,
+    etag: Optional[str] = None,
+    cache_control: str = REVALIDATE,
+) -> Response:
+    """
+    Serialize a response model with ETag and Cache-Control headers.
+
+    Without a precomputed ``etag`` the body is hashed; either way a matching
+    If-None-Match gets an empty 304.
+    """
+    if etag is not None and is_fresh(request, etag):
+        return not_modified(etag, cache_control)
+
+    body = model.model_dump_json(by_alias=True).encode()
+    if etag is None:
+        etag = etag_for(body)
+        if is_fresh(request, etag):
+            return not_modified(etag, cache_control)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+async def versioned_json(
+    request: Request,
+    key: str,
+    build: Callable[[], Awaitable[BaseModel]],
+    cache_control: str = REVALIDATE,
+    etag_exclude: Optional[set[str]] = None,
+) -> Response:
+    """
+    Like cached_json for content identified by process-local state.
+
+    ``key`` (e.g. an inventory version) names the content within this
+    process, so the model is built, serialized and hashed only once per key,
+    and a matching If-None-Match then gets an empty 304 without building
+    anything. The ETag itself is a content hash, so it agrees across workers
+    and restarts. Fields in ``etag_exclude`` (process-local bookkeeping such
+    as a version counter) are left out of the hash, making it a weak ETag.
+    """
+    entry = _bodies.get(key)
+    if entry is None:
+        model = await build()
+        body = model.model_dump_json(by_alias=True).encode()
+        if etag_exclude:
+            etag = "W/" + etag_for(model.model_dump_json(by_alias=True, exclude=etag_exclude))
+        else:
+            etag = etag_for(body)
+        entry = _bodies[key] = (etag, body)
+        while len(_bodies) > _BODY_CACHE_SIZE:
+            _bodies.popitem(last=False)
+    else:
+        _bodies.move_to_end(key)
+
+    etag, body = entry
+    if is_fresh(request, etag):
+        return not_modified(etag, cache_control)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
@@ -1,6 +1,10 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Request, Query
+from fastapi.responses import StreamingResponse
 
 from app.services import docker_service
+from app.api.responses import cached_json, versioned_json
 from app.api.deps import get_current_user
 from app.core.limiter import read_limit, action_limit
 from app.schemas.auth import TokenData
@@ -8,7 +12,9 @@ from app.schemas.containers import (
     ContainerListResponse,
     ContainerLogsResponse,
     ContainerActionResponse,
+    ContainerBulkActionRequest,
     ContainerDetail,
+    LogStreamFilter,
 )
 
 router = APIRouter()
@@ -21,9 +27,53 @@ async def get_containers(
     all: bool = Query(True, description="Include stopped containers"),
     current_user: TokenData = Depends(get_current_user),
 ):
-    """List all containers."""
-    containers = docker_service.list_containers(all=all)
-    return ContainerListResponse(containers=containers, total=len(containers))
+    """
+    List all containers.
+
+    The ETag is a hash of the list, so it matches across workers and
+    restarts. When served from the inventory the body and ETag are rendered
+    once per inventory version, and a matching If-None-Match returns 304
+    without building the list.
+    """
+    async def build() -> ContainerListResponse:
+        containers = await docker_service.list_containers(all=all)
+        return ContainerListResponse(
+            containers=containers,
+            total=len(containers),
+            version=docker_service.get_inventory_version(),
+        )
+
+    state = docker_service.get_inventory_state()
+    if state is None:
+        return cached_json(request, await build())
+    instance_id, version = state
+    return await versioned_json(request, f"containers:{all}:{instance_id}:{version}", build, etag_exclude={"version"})
+
+
+@router.post("/actions")
+@action_limit()
+async def bulk_action(
+    request: Request,
+    body: ContainerBulkActionRequest,
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Start, stop or restart many containers, streaming results as NDJSON.
+
+    One line per container as it finishes ({"container_id", "action", "status",
+    "joined", "duration_ms"}, plus "error" or "state"), then a summary line.
+    Duplicate actions already in flight on a container are joined, not repeated.
+    """
+    records = await docker_service.run_bulk_action(
+        body.action,
+        container_ids=body.container_ids,
+        labels=body.label,
+        max_parallel=body.max_parallel,
+        rolling=body.rolling,
+        timeout=body.timeout,
+        wait_timeout=body.wait_timeout,
+    )
+    return StreamingResponse(docker_service.encode_ndjson(records), media_type="application/x-ndjson")
 
 
 @router.get("/{container_id}", response_model=ContainerDetail)
@@ -33,8 +83,8 @@ async def get_container_details(
     container_id: str,
     current_user: TokenData = Depends(get_current_user),
 ):
-    """Get detailed information about a specific container."""
-    return docker_service.get_container_details(container_id)
+    """Get detailed information about a specific container (ETag is a content hash)."""
+    return cached_json(request, await docker_service.get_container_details(container_id))
 
 
 @router.get("/{container_id}/logs", response_model=ContainerLogsResponse)
@@ -43,15 +93,40 @@ async def logs(
     request: Request,
     container_id: str,
     tail: int = Query(100, ge=1, le=10000, description="Number of lines to return"),
+    stream: LogStreamFilter = Query("all", description="Output stream: all, stdout or stderr"),
     current_user: TokenData = Depends(get_current_user),
 ):
     """Get container logs."""
-    log_content = docker_service.get_logs(container_id, tail)
+    log_content = await docker_service.get_logs(container_id, tail, stream=stream)
     return ContainerLogsResponse(
         container_id=container_id,
         logs=log_content,
         tail=tail,
+        stream=stream,
+    )
+
+
+@router.get("/{container_id}/logs/stream")
+@read_limit()
+async def stream_logs(
+    request: Request,
+    container_id: str,
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of lines in this page"),
+    since: Optional[str] = Query(None, description="Only lines at/after this time (Unix seconds or RFC3339)"),
+    until: Optional[str] = Query(None, description="Cursor: only lines at/before this time (use next_cursor)"),
+    stream: LogStreamFilter = Query("all", description="Output stream: all, stdout or stderr"),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Stream a page of container logs as NDJSON.
+
+    Each line is {"timestamp", "stream", "line"}; the last line is {"next_cursor"}, to be
+    passed back as `until` for the previous page (null at the beginning).
+    """
+    records = await docker_service.stream_log_page(
+        container_id, limit=limit, since=since, until=until, stream=stream
     )
+    return StreamingResponse(records, media_type="application/x-ndjson")
 
 
 @router.post("/{container_id}/start", response_model=ContainerActionResponse)
@@ -62,7 +137,7 @@ async def start(
     current_user: TokenData = Depends(get_current_user),
 ):
     """Start a container."""
-    docker_service.start_container(container_id)
+    await docker_service.start_container(container_id)
     return ContainerActionResponse(
         container_id=container_id,
         status="started",
@@ -78,7 +153,7 @@ async def stop(
     current_user: TokenData = Depends(get_current_user),
 ):
     """Stop a container."""
-    docker_service.stop_container(container_id)
+    await docker_service.stop_container(container_id)
     return ContainerActionResponse(
         container_id=container_id,
         status="stopped",
@@ -95,7 +170,7 @@ async def restart(
     current_user: TokenData = Depends(get_current_user),
 ):
     """Restart a container."""
-    docker_service.restart_container(container_id, timeout=timeout)
+    await docker_service.restart_container(container_id, timeout=timeout)
     return ContainerActionResponse(
         container_id=container_id,
         status="restarted",
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Request
 
+from app.api.responses import cached_json
 from app.api.deps import get_current_user
 from app.services import docker_service
 from app.core.limiter import read_limit
@@ -15,6 +16,6 @@ async def list_images(
     request: Request,
     current_user: TokenData = Depends(get_current_user),
 ):
-    """List all Docker images."""
-    images = docker_service.list_images()
-    return ImageListResponse(images=images, total=len(images))
+    """List all Docker images (ETag is a content hash)."""
+    images = await docker_service.list_images()
+    return cached_json(request, ImageListResponse(images=images, total=len(images)))
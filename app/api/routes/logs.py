@@ -0,0 +1,70 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request, Query
+from fastapi.responses import StreamingResponse
+
+from app.services import docker_service
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.limiter import read_limit
+from app.schemas.auth import TokenData
+from app.schemas.containers import LogStreamFilter
+
+router = APIRouter()
+
+
+@router.get("/search")
+@read_limit()
+async def search_logs(
+    request: Request,
+    pattern: str = Query(
+        ..., min_length=1, max_length=settings.log_search_max_pattern_length, description="Regular expression (Python syntax)"
+    ),
+    containers: Optional[list[str]] = Query(None, description="Container IDs or names (default: all containers)"),
+    label: Optional[list[str]] = Query(None, description="Label selector: key or key=value"),
+    since: Optional[str] = Query(None, description="Only lines at/after this time (Unix seconds or RFC3339)"),
+    limit: int = Query(100, ge=1, le=10000, description="Stop after this many matches"),
+    ignore_case: bool = Query(False),
+    stream: LogStreamFilter = Query("all", description="Output stream: all, stdout or stderr"),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Search container logs with a regex, streaming matches as NDJSON.
+
+    Each match is {"container_id", "container_name", "stream", "timestamp",
+    "line"}; unreadable containers produce {"container_id", "error"}; the last
+    line is {"matched", "limit_reached"}. A pattern whose matching outruns
+    LOG_SEARCH_TIMEOUT aborts the search with {"error"}.
+    """
+    records = await docker_service.search_logs(
+        pattern,
+        container_ids=containers,
+        labels=label,
+        since=since,
+        limit=limit,
+        ignore_case=ignore_case,
+        stream=stream,
+    )
+    return StreamingResponse(docker_service.encode_ndjson(records), media_type="application/x-ndjson")
+
+
+@router.get("/merged")
+@read_limit()
+async def merged_logs(
+    request: Request,
+    containers: Optional[list[str]] = Query(None, description="Container IDs or names (default: all containers)"),
+    label: Optional[list[str]] = Query(None, description="Label selector: key or key=value"),
+    tail: int = Query(100, ge=1, le=10000, description="Lines per container"),
+    since: Optional[str] = Query(None, description="Only lines at/after this time (Unix seconds or RFC3339)"),
+    stream: LogStreamFilter = Query("all", description="Output stream: all, stdout or stderr"),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """
+    Logs of several containers merged into one time-ordered NDJSON stream.
+
+    Each line is {"container_id", "container_name", "stream", "timestamp", "line"}.
+    """
+    records = await docker_service.merge_logs(
+        container_ids=containers, labels=label, tail=tail, since=since, stream=stream
+    )
+    return StreamingResponse(docker_service.encode_ndjson(records), media_type="application/x-ndjson")
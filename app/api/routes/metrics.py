@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Response
+
+from app.api.deps import verify_metrics_access
+from app.core import metrics
+from app.services import docker_service
+from app.services.container_metrics import CONTENT_TYPE
+
+router = APIRouter(dependencies=[Depends(verify_metrics_access)])
+
+
+@router.get("", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metrics (METRICS_TOKEN or JWT bearer auth)."""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
+@router.get("/containers", include_in_schema=False)
+async def container_metrics():
+    """Per-container resource metrics from the background sampler (no daemon calls)."""
+    return Response(content=await docker_service.render_container_metrics(), media_type=CONTENT_TYPE)
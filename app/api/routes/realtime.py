@@ -1,8 +1,14 @@
+from typing import Optional
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 import logging
 
+from app.core.exceptions import SlowConsumerError
+from app.core.metrics import track_websocket
 from app.services import docker_service
+from app.services.event_hub import EventFilter
 from app.api.deps import verify_websocket_token
+from app.schemas.containers import LogStreamFilter
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -13,8 +19,15 @@ async def websocket_logs(
     websocket: WebSocket,
     container_id: str,
     token: str = Query(...),
+    stream: LogStreamFilter = Query("all"),
 ):
-    """Stream container logs via WebSocket."""
+    """
+    Stream container logs via WebSocket.
+
+    Each message carries one or more newline-separated lines. A client that
+    falls behind either skips lines (marked "[N lines skipped]") or is
+    disconnected, depending on LOG_WS_SLOW_CONSUMER_POLICY.
+    """
     token_data = verify_websocket_token(token)
     if not token_data:
         await websocket.close(code=1008, reason="Invalid or expired token")
@@ -23,26 +36,89 @@ async def websocket_logs(
     await websocket.accept()
     logger.info(f"WebSocket logs connected: container={container_id}, user={token_data.sub}")
 
-    try:
-        async for line in docker_service.stream_logs(container_id):
-            await websocket.send_text(line)
-    except WebSocketDisconnect:
-        logger.info(f"WebSocket logs disconnected: container={container_id}")
-    except Exception as e:
-        logger.error(f"WebSocket logs error: {e}")
+    with track_websocket("logs"):
         try:
-            await websocket.send_text(f"Error: {str(e)}")
-            await websocket.close(code=1011)
-        except Exception:
-            pass
+            async for frame in docker_service.stream_log_frames(container_id, stream=stream):
+                await websocket.send_text(frame)
+        except WebSocketDisconnect:
+            logger.info(f"WebSocket logs disconnected: container={container_id}")
+        except SlowConsumerError as e:
+            logger.warning(f"WebSocket logs slow consumer: container={container_id}")
+            try:
+                await websocket.close(code=1008, reason=e.message)
+            except Exception:
+                pass
+        except Exception as e:
+            logger.error(f"WebSocket logs error: {e}")
+            try:
+                await websocket.send_text(f"Error: {str(e)}")
+                await websocket.close(code=1011)
+            except Exception:
+                pass
+
+
+@router.websocket("/logs/merged/ws")
+async def websocket_merged_logs(
+    websocket: WebSocket,
+    token: str = Query(...),
+    containers: Optional[list[str]] = Query(None),
+    label: Optional[list[str]] = Query(None),
+    tail: int = Query(10, ge=0, le=1000),
+    stream: LogStreamFilter = Query("all"),
+):
+    """
+    Follow the logs of several containers (IDs/names or a label selector) as one stream.
+
+    Each message carries newline-separated JSON records ordered by timestamp,
+    {"container_id", "container_name", "stream", "timestamp", "line"}.
+    """
+    token_data = verify_websocket_token(token)
+    if not token_data:
+        await websocket.close(code=1008, reason="Invalid or expired token")
+        return
+
+    await websocket.accept()
+    logger.info(f"WebSocket merged logs connected: containers={containers}, label={label}, user={token_data.sub}")
+
+    with track_websocket("merged_logs"):
+        try:
+            frames = await docker_service.follow_merged_logs(
+                container_ids=containers, labels=label, tail=tail, stream=stream
+            )
+            async for frame in frames:
+                await websocket.send_text(frame)
+        except WebSocketDisconnect:
+            logger.info("WebSocket merged logs disconnected")
+        except SlowConsumerError as e:
+            logger.warning("WebSocket merged logs slow consumer")
+            try:
+                await websocket.close(code=1008, reason=e.message)
+            except Exception:
+                pass
+        except Exception as e:
+            logger.error(f"WebSocket merged logs error: {e}")
+            try:
+                await websocket.send_text(f"Error: {str(e)}")
+                await websocket.close(code=1011)
+            except Exception:
+                pass
 
 
 @router.websocket("/events/ws")
 async def websocket_events(
     websocket: WebSocket,
     token: str = Query(...),
+    event_type: Optional[list[str]] = Query(None, alias="type"),
+    action: Optional[list[str]] = Query(None),
+    container: Optional[list[str]] = Query(None),
+    label: Optional[list[str]] = Query(None),
 ):
-    """Stream Docker events via WebSocket."""
+    """
+    Stream Docker events via WebSocket.
+
+    All clients share one daemon events stream. Optional repeatable filters:
+    type, action, container (ID prefix or name) and label (key or key=value).
+    """
     token_data = verify_websocket_token(token)
     if not token_data:
         await websocket.close(code=1008, reason="Invalid or expired token")
@@ -51,18 +127,21 @@ async def websocket_events(
     await websocket.accept()
     logger.info(f"WebSocket events connected: user={token_data.sub}")
 
-    try:
-        async for event in docker_service.stream_events():
-            await websocket.send_text(event)
-    except WebSocketDisconnect:
-        logger.info("WebSocket events disconnected")
-    except Exception as e:
-        logger.error(f"WebSocket events error: {e}")
+    with track_websocket("events"):
         try:
-            await websocket.send_text(f"Error: {str(e)}")
-            await websocket.close(code=1011)
-        except Exception:
-            pass
+            event_filter = EventFilter(types=event_type, actions=action, containers=container, labels=label)
+            async with docker_service.subscribe_events(event_filter) as subscription:
+                async for event in subscription:
+                    await websocket.send_text(event.raw)
+        except WebSocketDisconnect:
+            logger.info("WebSocket events disconnected")
+        except Exception as e:
+            logger.error(f"WebSocket events error: {e}")
+            try:
+                await websocket.send_text(f"Error: {str(e)}")
+                await websocket.close(code=1011)
+            except Exception:
+                pass
 
 
 @router.websocket("/stats/ws/{container_id}")
@@ -80,15 +159,17 @@ async def websocket_stats(
     await websocket.accept()
     logger.info(f"WebSocket stats connected: container={container_id}, user={token_data.sub}")
 
-    try:
-        async for stat in docker_service.stream_stats(container_id):
-            await websocket.send_text(stat)
-    except WebSocketDisconnect:
-        logger.info(f"WebSocket stats disconnected: container={container_id}")
-    except Exception as e:
-        logger.error(f"WebSocket stats error: {e}")
+    with track_websocket("stats"):
         try:
-            await websocket.send_text(f"Error: {str(e)}")
-            await websocket.close(code=1011)
-        except Exception:
-            pass
+            async with docker_service.subscribe_stats(container_id) as subscription:
+                async for stat in subscription:
+                    await websocket.send_text(stat)
+        except WebSocketDisconnect:
+            logger.info(f"WebSocket stats disconnected: container={container_id}")
+        except Exception as e:
+            logger.error(f"WebSocket stats error: {e}")
+            try:
+                await websocket.send_text(f"Error: {str(e)}")
+                await websocket.close(code=1011)
+            except Exception:
+                pass
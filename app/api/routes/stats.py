@@ -1,20 +1,53 @@
-from fastapi import APIRouter, Depends, Request
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request, Query
 
 from app.api.deps import get_current_user
+from app.api.responses import json_response
 from app.services import docker_service
 from app.core.limiter import read_limit
 from app.schemas.auth import TokenData
-from app.schemas.stats import ContainerStats
+from app.schemas.stats import ContainerStats, BulkStatsResponse, StatsHistoryResponse
 
 router = APIRouter()
 
 
+@router.get("/", response_model=BulkStatsResponse)
+@read_limit()
+async def bulk_container_stats(
+    request: Request,
+    ids: Optional[list[str]] = Query(None, description="Container IDs or names (default: all running)"),
+    label: Optional[list[str]] = Query(None, description="Label selector, e.g. com.docker.compose.project=web"),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """Get resource statistics for all (or a filtered set of) running containers."""
+    stats, errors = await docker_service.get_bulk_stats(container_ids=ids, labels=label)
+    return json_response(BulkStatsResponse(stats=stats, errors=errors, total=len(stats)))
+
+
 @router.get("/{container_id}", response_model=ContainerStats)
 @read_limit()
 async def container_stats(
     request: Request,
     container_id: str,
+    one_shot: Optional[bool] = Query(
+        None,
+        description="Answer immediately, computing CPU against the previous poll (default: server setting)",
+    ),
     current_user: TokenData = Depends(get_current_user),
 ):
     """Get container resource statistics (CPU, memory, network, I/O)."""
-    return docker_service.get_container_stats(container_id)
+    return json_response(await docker_service.get_container_stats(container_id, one_shot=one_shot))
+
+
+@router.get("/{container_id}/history", response_model=StatsHistoryResponse)
+@read_limit()
+async def container_stats_history(
+    request: Request,
+    container_id: str,
+    since: Optional[float] = Query(None, description="Unix timestamp to start from (default: whole window)"),
+    step: Optional[float] = Query(None, gt=0, description="Bucket width in seconds (default: sampling interval)"),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """Get downsampled CPU/memory/network/block I/O history (min/max/avg per bucket)."""
+    return json_response(await docker_service.get_stats_history(container_id, since=since, step=step))
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, Depends, Request
 
 from app.services import docker_service
+from app.api.responses import cached_json
 from app.api.deps import get_current_user
 from app.core.limiter import read_limit
 from app.schemas.auth import TokenData
-from app.schemas.system import HealthResponse, EnhancedHealthResponse, VersionResponse
+from app.schemas.system import (
+    HealthResponse,
+    EnhancedHealthResponse,
+    VersionResponse,
+    SchedulerStatsResponse,
+)
 
 router = APIRouter()
 
@@ -12,7 +18,7 @@ router = APIRouter()
 @router.get("/healthz", response_model=HealthResponse)
 async def health_check():
     """Basic health check endpoint (no auth required)."""
-    connected = docker_service.is_connected()
+    connected = await docker_service.is_connected()
     return HealthResponse(
         status="ok" if connected else "degraded",
         docker_connected=connected,
@@ -26,7 +32,7 @@ async def enhanced_health_check(
     current_user: TokenData = Depends(get_current_user),
 ):
     """Enhanced health check with system information (requires auth)."""
-    info = docker_service.get_system_info()
+    info = await docker_service.get_system_info()
     return EnhancedHealthResponse(
         status="ok" if info.get("docker_connected") else "degraded",
         **info,
@@ -40,4 +46,15 @@ async def version_info(
     current_user: TokenData = Depends(get_current_user),
 ):
     """Get Docker version info (requires auth)."""
-    return docker_service.get_version()
+    # Only changes when the daemon is upgraded
+    return cached_json(request, await docker_service.get_version(), cache_control="private, max-age=300")
+
+
+@router.get("/scheduler", response_model=SchedulerStatsResponse)
+@read_limit()
+async def scheduler_stats(
+    request: Request,
+    current_user: TokenData = Depends(get_current_user),
+):
+    """Docker call queue depth and wait times per priority lane (requires auth)."""
+    return docker_service.get_scheduler_stats()
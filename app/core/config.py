@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator, model_validator
-from typing import List, Self
+from typing import List, Literal, Self
 import secrets
 
 
@@ -9,6 +9,7 @@ class Settings(BaseSettings):
     secret_key: str = secrets.token_urlsafe(32)
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    jwt_cache_size: int = 1024  # Validated tokens kept (until their exp); 0 disables the cache
 
     # API Authentication (for initial login or API key mode)
     api_username: str = "admin"
@@ -24,6 +25,58 @@ class Settings(BaseSettings):
     rate_limit_enabled: bool = True
     rate_limit_requests: int = 100
     rate_limit_window: int = 60  # seconds
+    rate_limit_storage_uri: str = "memory://"  # shm:///path?slots=4096 shares counters across workers
+
+    # Docker Engine API
+    docker_host: str = "unix:///var/run/docker.sock"
+    docker_api_version: str = "1.41"
+    docker_timeout: float = 30.0  # seconds
+    docker_max_connections: int = 100
+    docker_max_keepalive_connections: int = 20
+    docker_keepalive_expiry: float = 30.0  # seconds
+    docker_max_concurrent_requests: int = 32  # In-flight daemon calls, granted by priority lane
+    docker_bulk_concurrency: int = 16  # Of those, how many bulk reads may hold
+    docker_max_streams: int = 500  # Concurrent long-lived log/stats/event streams
+    docker_broker_socket: str = ""  # Unix socket of the stream broker; set to share event/stats streams across workers
+    docker_broker_queue_size: int = 4096  # Lines a worker may lag behind before the broker disconnects it
+    inventory_enabled: bool = True  # Serve container lists from an event-driven cache
+    image_cache_ttl: float = 300.0  # seconds; image events invalidate it sooner
+    log_max_line_length: int = 16384  # bytes; longer log lines are truncated
+    log_ws_batch_size: int = 500  # Max lines per WebSocket frame
+    log_ws_batch_interval: float = 0.02  # seconds to wait for a frame to fill
+    log_ws_queue_size: int = 10000  # Lines buffered per log WebSocket
+    log_ws_slow_consumer_policy: Literal["drop_oldest", "disconnect"] = "drop_oldest"
+    log_search_workers: int = 2  # Processes for regex matching in /logs/search
+    log_search_batch_size: int = 2000  # Lines per matching batch
+    log_search_concurrency: int = 8  # Containers read concurrently per search
+    log_search_timeout: float = 10.0  # seconds a matching batch may take before the search is aborted
+    log_search_max_pattern_length: int = 1024
+    log_merge_window: float = 0.25  # seconds merged live logs are held for reordering
+    log_merge_max_containers: int = 50
+
+    events_subscriber_queue_size: int = 256  # Events buffered per WebSocket subscriber
+
+    container_actions_max_parallel: int = 5  # Default parallelism for bulk container actions
+
+    # Stats
+    stats_subscriber_queue_size: int = 8  # Ticks buffered per WebSocket subscriber
+    stats_bulk_concurrency: int = 20  # Concurrent daemon stats calls per bulk request
+    stats_bulk_timeout: float = 5.0  # seconds per container
+    stats_backend: Literal["docker", "cgroup"] = "docker"  # "cgroup" reads cgroup v2 files directly
+    stats_cgroup_root: str = "/sys/fs/cgroup"  # Host cgroup v2 mount (read-only) for the cgroup backend
+    stats_cgroup_proc_root: str = "/proc"  # Network counters via <pid>/net/dev (needs the host PID namespace)
+    stats_one_shot: bool = True  # Skip the daemon's sampling wait; diff against the previous poll
+    stats_sample_cache_size: int = 4096  # Containers whose previous CPU sample is kept
+    stats_sample_max_age: float = 60.0  # seconds; older samples fall back to a full read
+    stats_history_enabled: bool = True  # Background sampler feeding /stats/{id}/history
+    stats_history_interval: float = 10.0  # seconds between samples
+    stats_history_capacity: int = 360  # Samples kept per container (1h at 10s, ~19 KB)
+    stats_history_max_containers: int = 2000
+
+    # Metrics
+    metrics_enabled: bool = True  # Expose Prometheus metrics at /metrics (requires a JWT or METRICS_TOKEN)
+    metrics_token: str = ""  # Static bearer token for Prometheus scrapers (JWTs expire too quickly for them)
+    container_metrics_enabled: bool = True  # Run the stats sampler for /metrics/containers even without history
 
     # Application
     app_name: str = "Docker Agent"
@@ -64,6 +117,13 @@ class Settings(BaseSettings):
             )
         return self
 
+    @field_validator("metrics_token", mode="after")
+    @classmethod
+    def validate_metrics_token(cls, v):
+        if v and len(v) < 16:
+            raise ValueError("METRICS_TOKEN must be at least 16 characters for security.")
+        return v
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -76,6 +76,16 @@ class InvalidTokenError(DockerAgentException):
         )
 
 
+class SlowConsumerError(DockerAgentException):
+    """Raised when a streaming client falls too far behind."""
+
+    def __init__(self, buffered: int):
+        super().__init__(
+            message=f"Client too slow: {buffered} lines buffered",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+
+
 # Exception Handlers
 
 
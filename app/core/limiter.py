@@ -1,4 +1,4 @@
-from slowapi import Limiter
+from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
@@ -6,6 +6,9 @@ from fastapi import Request
 from fastapi.responses import JSONResponse
 
 from app.core.config import settings
+from app.core.metrics import RATE_LIMITED, route_template
+# Registers the shm:// storage scheme with limits
+from app.core import rate_limit_storage  # noqa: F401
 
 
 def get_limiter_key(request: Request) -> str:
@@ -16,6 +19,7 @@ def get_limiter_key(request: Request) -> str:
 limiter = Limiter(
     key_func=get_limiter_key,
     enabled=settings.rate_limit_enabled,
+    storage_uri=settings.rate_limit_storage_uri,
     default_limits=[f"{settings.rate_limit_requests}/{settings.rate_limit_window}seconds"],
 )
 
@@ -33,6 +37,12 @@ async def rate_limit_exceeded_handler(
     )
 
 
+def counted_rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """Count the rejection, then respond like slowapi's default handler."""
+    RATE_LIMITED.labels(route_template(request.scope)).inc()
+    return _rate_limit_exceeded_handler(request, exc)
+
+
 # Rate limit decorators for different endpoint types
 def auth_limit():
     """Stricter limit for auth endpoints: 5 per minute."""
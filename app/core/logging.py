@@ -52,6 +52,8 @@ def setup_logging() -> None:
     # Reduce noise from third-party libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("docker").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
 
     # MCP library logging - suppress verbose logs unless mcp_debug is enabled
     if not settings.mcp_debug:
@@ -0,0 +1,105 @@
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Under gunicorn every worker writes its samples to files in this directory
+# and /metrics aggregates them (see gunicorn.conf.py).
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "docker_agent_http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DOCKER_CALL_DURATION = Histogram(
+    "docker_agent_docker_call_duration_seconds",
+    "Docker Engine API call latency (time to response headers for streams)",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+DOCKER_CALL_ERRORS = Counter(
+    "docker_agent_docker_call_errors_total",
+    "Failed Docker Engine API calls",
+    ["operation", "error"],
+)
+SCHEDULER_WAITING = Gauge(
+    "docker_agent_scheduler_waiting",
+    "Docker calls queued per scheduler lane",
+    ["lane"],
+    multiprocess_mode="livesum",
+)
+SCHEDULER_ACTIVE = Gauge(
+    "docker_agent_scheduler_active",
+    "Docker calls holding a scheduler slot per lane",
+    ["lane"],
+    multiprocess_mode="livesum",
+)
+SCHEDULER_WAIT = Histogram(
+    "docker_agent_scheduler_wait_seconds",
+    "Time Docker calls spent queued per scheduler lane",
+    ["lane"],
+    buckets=LATENCY_BUCKETS,
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    "docker_agent_websocket_connections",
+    "Open WebSocket streams by type",
+    ["type"],
+    multiprocess_mode="livesum",
+)
+MCP_TOOL_DURATION = Histogram(
+    "docker_agent_mcp_tool_duration_seconds",
+    "MCP tool call latency by tool and outcome",
+    ["tool", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+RATE_LIMITED = Counter(
+    "docker_agent_rate_limited_total",
+    "Requests rejected by the rate limiter",
+    ["route"],
+)
+JWT_CACHE_LOOKUPS = Counter(
+    "docker_agent_jwt_cache_lookups_total",
+    "Validated-token cache lookups by result (hit or miss)",
+    ["result"],
+)
+
+
+def route_template(scope: dict) -> str:
+    """Matched route template (e.g. /api/v1/containers/{container_id}) for a request scope."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+@contextmanager
+def track_websocket(kind: str) -> Iterator[None]:
+    """Count a WebSocket stream as open for the duration of the block."""
+    gauge = WEBSOCKET_CONNECTIONS.labels(kind)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition for all metrics, aggregated across workers in multiprocess mode."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
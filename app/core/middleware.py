@@ -1,61 +1,79 @@
 import uuid
 import time
-from typing import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import get_logger, bind_context, clear_context
+from app.core.metrics import HTTP_REQUEST_DURATION, route_template
 
 logger = get_logger(__name__)
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware to add unique request ID to each request."""
+class RequestIDMiddleware:
+    """
+    Middleware to add unique request ID to each request.
+
+    Pure ASGI: the app runs in the caller's task and messages pass straight
+    through, so streaming bodies (NDJSON, the MCP SSE stream) are never
+    buffered or re-wrapped. Headers are added and the request is logged when
+    the response starts.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # Generate or extract request ID
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request_id = Headers(scope=scope).get("X-Request-ID", str(uuid.uuid4()))
+        method = scope["method"]
 
         # Bind request context for logging
-        bind_context(
-            request_id=request_id,
-            method=request.method,
-            path=request.url.path,
-        )
+        bind_context(request_id=request_id, method=method, path=scope["path"])
 
         # Add request ID to request state for access in routes
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
 
         # Track request timing
         start_time = time.perf_counter()
+        started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                process_time = time.perf_counter() - start_time
+
+                # Add headers to response
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Process-Time"] = f"{process_time:.4f}"
+
+                # Log request completion
+                status_code = message["status"]
+                logger.info(
+                    "request_completed",
+                    status_code=status_code,
+                    duration_ms=round(process_time * 1000, 2),
+                )
+                HTTP_REQUEST_DURATION.labels(method, route_template(scope), status_code).observe(process_time)
+            await send(message)
 
         try:
-            response = await call_next(request)
-            process_time = time.perf_counter() - start_time
-
-            # Add headers to response
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = f"{process_time:.4f}"
-
-            # Log request completion
-            logger.info(
-                "request_completed",
-                status_code=response.status_code,
-                duration_ms=round(process_time * 1000, 2),
-            )
-
-            return response
-
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            process_time = time.perf_counter() - start_time
-            logger.error(
-                "request_failed",
-                error=str(e),
-                duration_ms=round(process_time * 1000, 2),
-            )
+            if not started:
+                process_time = time.perf_counter() - start_time
+                HTTP_REQUEST_DURATION.labels(method, route_template(scope), 500).observe(process_time)
+                logger.error(
+                    "request_failed",
+                    error=str(e),
+                    duration_ms=round(process_time * 1000, 2),
+                )
             raise
-
         finally:
             clear_context()
-
@@ -0,0 +1,165 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import parse_qs, urlparse
+
+from limits.storage import Storage
+
+# Slot: key digest, window expiry (unix time), hit count. An all-zero digest
+# marks a never-used slot, which ends a probe sequence.
+_SLOT = struct.Struct("<16sdq")
+_EMPTY = bytes(16)
+# Slots examined per key; a key always lives within this window of its home slot
+MAX_PROBE = 16
+
+
+class SharedMemoryStorage(Storage):
+    """
+    Rate limit counters shared by every worker process on the host.
+
+    A ``limits`` storage backend (``shm:///path/to/file?slots=4096``) over a
+    fixed-size, mmap-backed open-addressing table: each key hashes to a home
+    slot and is found by a bounded linear probe, so every operation is O(1)
+    and needs no external service. Updates take a thread lock plus an
+    exclusive ``flock`` on the file; when a key's probe window is full the
+    entry whose window ends first is evicted. Supports the fixed-window
+    strategies (slowapi's default).
+    """
+
+    STORAGE_SCHEME = ["shm"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        parsed = urlparse(uri)
+        if not parsed.path:
+            raise ValueError(f"shm storage needs a file path, e.g. shm:///tmp/ratelimit (got {uri})")
+        query = parse_qs(parsed.query)
+        self.path = parsed.path
+        self.slots = int(options.get("slots") or query.get("slots", ["4096"])[0])
+        self._size = self.slots * _SLOT.size
+        self._thread_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._fd = -1
+        self._map: Optional[mmap.mmap] = None
+
+    @property
+    def base_exceptions(self):
+        return OSError
+
+    def _open(self) -> None:
+        # Opened per process: a descriptor inherited across fork would share
+        # its flock with the parent instead of excluding it
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size != self._size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self._size)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd = fd
+        self._map = mmap.mmap(fd, self._size)
+        self._pid = os.getpid()
+
+    @contextmanager
+    def _locked(self) -> Iterator[mmap.mmap]:
+        with self._thread_lock:
+            if self._pid != os.getpid():
+                self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield self._map
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _find(self, table: mmap.mmap, digest: bytes, now: float, insert: bool) -> Optional[int]:
+        """Offset of the key's slot; with ``insert``, of the slot to (re)use for it."""
+        home = int.from_bytes(digest[:8], "little") % self.slots
+        reusable = None
+        oldest, oldest_expiry = None, float("inf")
+        for i in range(MAX_PROBE):
+            offset = ((home + i) % self.slots) * _SLOT.size
+            slot_digest, expiry, _ = _SLOT.unpack_from(table, offset)
+            if slot_digest == digest:
+                return offset
+            if slot_digest == _EMPTY:
+                return (reusable if reusable is not None else offset) if insert else None
+            if reusable is None and expiry <= now:
+                reusable = offset
+            if expiry < oldest_expiry:
+                oldest, oldest_expiry = offset, expiry
+        if not insert:
+            return None
+        return reusable if reusable is not None else oldest
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        # Keep the empty-slot marker unambiguous
+        return digest if digest != _EMPTY else b"\x01" + digest[1:]
+
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        digest = self._digest(key)
+        now = time.time()
+        with self._locked() as table:
+            offset = self._find(table, digest, now, insert=True)
+            slot_digest, window_end, count = _SLOT.unpack_from(table, offset)
+            if slot_digest != digest or window_end <= now:
+                count, window_end = 0, now + expiry
+            count += amount
+            if elastic_expiry:
+                window_end = now + expiry
+            _SLOT.pack_into(table, offset, digest, window_end, count)
+            return count
+
+    def get(self, key: str) -> int:
+        digest = self._digest(key)
+        now = time.time()
+        with self._locked() as table:
+            offset = self._find(table, digest, now, insert=False)
+            if offset is None:
+                return 0
+            _, window_end, count = _SLOT.unpack_from(table, offset)
+            return count if window_end > now else 0
+
+    def get_expiry(self, key: str) -> int:
+        digest = self._digest(key)
+        now = time.time()
+        with self._locked() as table:
+            offset = self._find(table, digest, now, insert=False)
+            if offset is None:
+                return int(now)
+            _, window_end, _ = _SLOT.unpack_from(table, offset)
+            return int(max(window_end, now))
+
+    def check(self) -> bool:
+        try:
+            with self._locked():
+                return True
+        except OSError:
+            return False
+
+    def reset(self) -> Optional[int]:
+        now = time.time()
+        with self._locked() as table:
+            active = sum(
+                1
+                for i in range(self.slots)
+                if _SLOT.unpack_from(table, i * _SLOT.size)[1] > now
+            )
+            table[:] = bytes(self._size)
+            return active
+
+    def clear(self, key: str) -> None:
+        digest = self._digest(key)
+        with self._locked() as table:
+            offset = self._find(table, digest, time.time(), insert=False)
+            if offset is not None:
+                # Keep the digest so later keys still probe past this slot
+                _SLOT.pack_into(table, offset, digest, 0.0, 0)
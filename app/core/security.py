@@ -1,3 +1,6 @@
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -6,9 +9,17 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 from app.core.exceptions import InvalidTokenError, TokenExpiredError
+from app.core.metrics import JWT_CACHE_LOOKUPS
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Token digest -> (exp, payload) for tokens that passed full verification
+_validated_tokens: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+# Signing configuration the cached entries were verified under
+_validated_with: Optional[tuple[str, str]] = None
+_cache_hits = JWT_CACHE_LOOKUPS.labels("hit")
+_cache_misses = JWT_CACHE_LOOKUPS.labels("miss")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -34,19 +45,53 @@ def create_access_token(
 
 
 def decode_access_token(token: str) -> dict:
-    """Decode and validate a JWT access token."""
+    """
+    Decode and validate a JWT access token.
+
+    Tokens that pass verification are remembered (bounded LRU keyed by a
+    digest of the token) until their ``exp``, so repeat presentations cost a
+    hash lookup instead of a signature check. Changing the secret key or
+    algorithm drops every cached entry.
+    """
+    global _validated_with
+    if settings.jwt_cache_size > 0:
+        signing = (settings.secret_key, settings.algorithm)
+        if signing != _validated_with:
+            _validated_tokens.clear()
+            _validated_with = signing
+
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        entry = _validated_tokens.get(key)
+        if entry is not None:
+            exp, payload = entry
+            if time.time() < exp:
+                _validated_tokens.move_to_end(key)
+                _cache_hits.inc()
+                return dict(payload)
+            del _validated_tokens[key]
+            _cache_hits.inc()
+            raise TokenExpiredError()
+        _cache_misses.inc()
+
     try:
         payload = jwt.decode(
             token,
             settings.secret_key,
             algorithms=[settings.algorithm],
         )
-        return payload
     except jwt.ExpiredSignatureError:
         raise TokenExpiredError()
     except JWTError:
         raise InvalidTokenError()
 
+    # Only tokens that expire are cached, so every entry ages out on its own
+    exp = payload.get("exp")
+    if settings.jwt_cache_size > 0 and isinstance(exp, (int, float)):
+        _validated_tokens[key] = (exp, dict(payload))
+        while len(_validated_tokens) > settings.jwt_cache_size:
+            _validated_tokens.popitem(last=False)
+    return payload
+
 
 def authenticate_user(username: str, password: str) -> bool:
     """
@@ -2,14 +2,13 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from docker.errors import NotFound, APIError, DockerException
 from jose import JWTError
 
-from app.api.routes import containers, auth, images, system, stats, realtime, mcp
+from app.api.routes import containers, auth, images, system, stats, logs, realtime, mcp, metrics
 from app.core.config import settings
-from app.core.limiter import limiter
+from app.core.limiter import limiter, counted_rate_limit_exceeded_handler
 from app.core.logging import setup_logging, get_logger
 from app.core.middleware import RequestIDMiddleware
 from app.core.exceptions import (
@@ -21,7 +20,7 @@ from app.core.exceptions import (
     jwt_error_handler,
     generic_exception_handler,
 )
-from app.services import docker_service
+from app.services import docker_service, log_search
 
 # Initialize structured logging
 setup_logging()
@@ -42,16 +41,26 @@ async def lifespan(app: FastAPI):
 
     # Verify Docker connection on startup
     try:
-        docker_service.get_client()
+        await docker_service.connect()
         logger.info("docker_connection_verified")
     except Exception as e:
         logger.error("docker_connection_failed", error=str(e))
 
+    # The inventory retries in the background until the daemon is reachable
+    if settings.inventory_enabled:
+        docker_service.start_inventory()
+    # With a stream broker the sampler runs there instead of in every worker
+    if docker_service.stats_sampler_wanted():
+        docker_service.start_stats_history()
+
     yield
 
     # Shutdown
     logger.info("application_shutting_down")
-    docker_service.close_client()
+    await docker_service.stop_stats_history()
+    await docker_service.stop_inventory()
+    await docker_service.close_client()
+    log_search.shutdown_pool()
     logger.info("application_stopped")
 
 
@@ -70,7 +79,7 @@ app.add_middleware(RequestIDMiddleware)
 
 # Add rate limiter
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, counted_rate_limit_exceeded_handler)
 
 # Add CORS middleware
 app.add_middleware(
@@ -98,8 +107,13 @@ app.include_router(containers.router, prefix=f"{API_V1_PREFIX}/containers", tags
 app.include_router(images.router, prefix=f"{API_V1_PREFIX}/images", tags=["Images"])
 app.include_router(system.router, prefix=API_V1_PREFIX, tags=["System"])
 app.include_router(stats.router, prefix=f"{API_V1_PREFIX}/stats", tags=["Stats"])
+app.include_router(logs.router, prefix=f"{API_V1_PREFIX}/logs", tags=["Logs"])
 app.include_router(realtime.router, prefix=API_V1_PREFIX, tags=["Realtime"])
 
+# Prometheus metrics (unversioned, like /healthz)
+if settings.metrics_enabled:
+    app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+
 # MCP (Model Context Protocol) endpoint - no auth required for AI assistants
 if settings.mcp_enabled:
     app.include_router(mcp.router, prefix="/mcp", tags=["MCP"])
@@ -1,8 +1,12 @@
+import time
+
 from mcp.server import Server
 from mcp.types import Tool, TextContent
+from pydantic_core import to_json
 
 from app.services import docker_service
 from app.core.logging import get_logger
+from app.core.metrics import MCP_TOOL_DURATION
 
 logger = get_logger(__name__)
 
@@ -68,10 +72,48 @@ async def list_tools() -> list[Tool]:
                         "description": "Number of lines to return from the end (default: 100)",
                         "default": 100,
                     },
+                    "stream": {
+                        "type": "string",
+                        "enum": ["all", "stdout", "stderr"],
+                        "description": "Only return this output stream (default: all)",
+                        "default": "all",
+                    },
                 },
                 "required": ["container_id"],
             },
         ),
+        Tool(
+            name="search_container_logs",
+            description="Search logs of one or many containers with a regular expression and return matching lines",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "pattern": {
+                        "type": "string",
+                        "description": "Regular expression (Python syntax)",
+                    },
+                    "container_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Container IDs or names (default: all containers)",
+                    },
+                    "since": {
+                        "type": "string",
+                        "description": "Only search lines at/after this time (Unix seconds or RFC3339)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of matches (default: 100)",
+                        "default": 100,
+                    },
+                    "ignore_case": {
+                        "type": "boolean",
+                        "default": False,
+                    },
+                },
+                "required": ["pattern"],
+            },
+        ),
         Tool(
             name="get_container_stats",
             description="Get resource usage statistics (CPU, memory, network, block I/O) for a container",
@@ -86,6 +128,25 @@ async def list_tools() -> list[Tool]:
                 "required": ["container_id"],
             },
         ),
+        Tool(
+            name="get_all_container_stats",
+            description="Get resource usage statistics for all running containers, or those matching IDs or a label selector, collected concurrently",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "container_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Container IDs or names (default: all running containers)",
+                    },
+                    "label": {
+                        "type": "string",
+                        "description": "Label selector, e.g. com.docker.compose.project=web",
+                    },
+                },
+                "required": [],
+            },
+        ),
         Tool(
             name="list_images",
             description="List all Docker images with their tags and sizes",
@@ -145,65 +206,91 @@ async def list_tools() -> list[Tool]:
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls."""
     logger.debug("mcp_tool_called", tool=name, arguments=arguments)
+    started = time.perf_counter()
 
     try:
         if name == "docker_health":
-            result = docker_service.get_system_info()
+            result = await docker_service.get_system_info()
 
         elif name == "docker_version":
-            version = docker_service.get_version()
-            result = version.model_dump()
+            version = await docker_service.get_version()
+            result = version
 
         elif name == "list_containers":
             include_all = arguments.get("all", True)
-            containers = docker_service.list_containers(all=include_all)
-            result = [c.model_dump() for c in containers]
+            containers = await docker_service.list_containers(all=include_all)
+            result = containers
 
         elif name == "get_container":
             container_id = arguments["container_id"]
-            result = docker_service.get_container_details(container_id)
+            result = await docker_service.get_container_details(container_id)
 
         elif name == "get_container_logs":
             container_id = arguments["container_id"]
             tail = arguments.get("tail", 100)
-            result = docker_service.get_logs(container_id, tail=tail)
+            stream = arguments.get("stream", "all")
+            result = await docker_service.get_logs(container_id, tail=tail, stream=stream)
+
+        elif name == "search_container_logs":
+            records = await docker_service.search_logs(
+                arguments["pattern"],
+                container_ids=arguments.get("container_ids"),
+                since=arguments.get("since"),
+                limit=min(arguments.get("limit", 100), 1000),
+                ignore_case=arguments.get("ignore_case", False),
+            )
+            result = [record async for record in records]
 
         elif name == "get_container_stats":
             container_id = arguments["container_id"]
-            stats = docker_service.get_container_stats(container_id)
-            result = stats.model_dump()
+            stats = await docker_service.get_container_stats(container_id)
+            result = stats
+
+        elif name == "get_all_container_stats":
+            label = arguments.get("label")
+            stats, errors = await docker_service.get_bulk_stats(
+                container_ids=arguments.get("container_ids"),
+                labels=[label] if label else None,
+            )
+            result = {
+                "stats": stats,
+                "errors": errors,
+                "total": len(stats),
+            }
 
         elif name == "list_images":
-            images = docker_service.list_images()
-            result = [img.model_dump() for img in images]
+            images = await docker_service.list_images()
+            result = images
 
         elif name == "start_container":
             container_id = arguments["container_id"]
-            docker_service.start_container(container_id)
+            await docker_service.start_container(container_id)
             result = {"status": "started", "container_id": container_id}
 
         elif name == "stop_container":
             container_id = arguments["container_id"]
-            docker_service.stop_container(container_id)
+            await docker_service.stop_container(container_id)
             result = {"status": "stopped", "container_id": container_id}
 
         elif name == "restart_container":
             container_id = arguments["container_id"]
             timeout = arguments.get("timeout", 10)
-            docker_service.restart_container(container_id, timeout=timeout)
+            await docker_service.restart_container(container_id, timeout=timeout)
             result = {"status": "restarted", "container_id": container_id}
 
         else:
             logger.warning("mcp_unknown_tool", tool=name)
+            MCP_TOOL_DURATION.labels("unknown", "error").observe(time.perf_counter() - started)
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
-        # Convert result to string for text content
-        import json
-        text_result = json.dumps(result, indent=2, default=str)
+        # Compact JSON straight from the models (no model_dump/indent pass)
+        text_result = to_json(result, by_alias=False, fallback=str).decode()
         logger.debug("mcp_tool_success", tool=name)
+        MCP_TOOL_DURATION.labels(name, "ok").observe(time.perf_counter() - started)
         return [TextContent(type="text", text=text_result)]
 
     except Exception as e:
         logger.error("mcp_tool_error", tool=name, error=str(e))
+        MCP_TOOL_DURATION.labels(name, "error").observe(time.perf_counter() - started)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
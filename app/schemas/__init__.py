@@ -4,11 +4,26 @@ from app.schemas.containers import (
     ContainerListResponse,
     ContainerLogsResponse,
     ContainerActionResponse,
+    ContainerBulkActionRequest,
     ContainerDetail,
+    LogStreamFilter,
+)
+from app.schemas.stats import (
+    ContainerStats,
+    ContainerStatsStream,
+    ContainerStatsError,
+    BulkStatsResponse,
+    SeriesAggregate,
+    StatsHistoryResponse,
 )
-from app.schemas.stats import ContainerStats, ContainerStatsStream
 from app.schemas.images import ImageSummary, ImageListResponse
-from app.schemas.system import HealthResponse, EnhancedHealthResponse, VersionResponse
+from app.schemas.system import (
+    HealthResponse,
+    EnhancedHealthResponse,
+    VersionResponse,
+    SchedulerLaneStats,
+    SchedulerStatsResponse,
+)
 
 __all__ = [
     # Auth
@@ -19,11 +34,17 @@ __all__ = [
     "ContainerSummary",
     "ContainerListResponse",
     "ContainerLogsResponse",
+    "LogStreamFilter",
     "ContainerActionResponse",
+    "ContainerBulkActionRequest",
     "ContainerDetail",
     # Stats
     "ContainerStats",
     "ContainerStatsStream",
+    "ContainerStatsError",
+    "BulkStatsResponse",
+    "SeriesAggregate",
+    "StatsHistoryResponse",
     # Images
     "ImageSummary",
     "ImageListResponse",
@@ -31,4 +52,6 @@ __all__ = [
     "HealthResponse",
     "EnhancedHealthResponse",
     "VersionResponse",
+    "SchedulerLaneStats",
+    "SchedulerStatsResponse",
 ]
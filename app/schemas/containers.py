@@ -1,7 +1,10 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Literal, Optional
 from datetime import datetime
 
+# Which output streams to return from container logs
+LogStreamFilter = Literal["all", "stdout", "stderr"]
+
 
 class ContainerState(BaseModel):
     """Container state information."""
@@ -37,6 +40,7 @@ class ContainerSummary(BaseModel):
     state: str = Field(..., description="Container state (running, exited, etc.)")
     created: int = Field(..., description="Creation timestamp")
     ports: list[ContainerPort] = Field(default_factory=list)
+    compose_project: Optional[str] = Field(None, description="Docker Compose project label, if any")
 
     class Config:
         populate_by_name = True
@@ -47,6 +51,7 @@ class ContainerListResponse(BaseModel):
 
     containers: list[ContainerSummary]
     total: int
+    version: Optional[int] = Field(None, description="Inventory version (None when read from the daemon)")
 
 
 class ContainerLogsResponse(BaseModel):
@@ -55,6 +60,25 @@ class ContainerLogsResponse(BaseModel):
     container_id: str
     logs: str
     tail: int
+    stream: LogStreamFilter = "all"
+
+
+class ContainerBulkActionRequest(BaseModel):
+    """Request body for bulk container actions."""
+
+    action: Literal["start", "stop", "restart"]
+    container_ids: Optional[list[str]] = Field(None, description="Container IDs or names")
+    label: Optional[list[str]] = Field(None, description="Label selector: key or key=value")
+    max_parallel: Optional[int] = Field(None, ge=1, le=50, description="Containers acted on at once (batch size when rolling)")
+    rolling: bool = Field(False, description="Wait for each batch to be running/healthy (or stopped) before the next")
+    timeout: int = Field(10, ge=0, le=300, description="Seconds before stop/restart kills the container")
+    wait_timeout: float = Field(60.0, gt=0, le=600, description="Rolling mode: seconds to wait for a container to settle")
+
+    @model_validator(mode="after")
+    def require_selection(self) -> "ContainerBulkActionRequest":
+        if not self.container_ids and not self.label:
+            raise ValueError("container_ids or label is required")
+        return self
 
 
 class ContainerActionResponse(BaseModel):
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -9,10 +11,16 @@ class ContainerStats(BaseModel):
     memory_usage: int = Field(..., description="Memory usage in bytes")
     memory_limit: int = Field(..., description="Memory limit in bytes")
     memory_percent: float = Field(..., description="Memory usage percentage (0-100)")
+    memory_inactive_file: Optional[int] = Field(
+        None, description="Reclaimable page cache in bytes; memory_usage minus this is the working set `docker stats` shows"
+    )
     network_rx: int = Field(0, description="Network bytes received")
     network_tx: int = Field(0, description="Network bytes transmitted")
     block_read: int = Field(0, description="Block I/O bytes read")
     block_write: int = Field(0, description="Block I/O bytes written")
+    cpu_pressure: Optional[float] = Field(None, description="Percent of time tasks stalled on CPU (PSI some avg10; cgroup backend)")
+    memory_pressure: Optional[float] = Field(None, description="Percent of time tasks stalled on memory (PSI some avg10; cgroup backend)")
+    io_pressure: Optional[float] = Field(None, description="Percent of time tasks stalled on I/O (PSI some avg10; cgroup backend)")
 
 
 class ContainerStatsStream(BaseModel):
@@ -23,3 +31,36 @@ class ContainerStatsStream(BaseModel):
     memory_percent: float
     timestamp: str
 
+
+class ContainerStatsError(BaseModel):
+    """Per-container failure in a bulk stats request."""
+
+    container_id: str = Field(..., description="Container ID")
+    error: str = Field(..., description="Why stats could not be collected")
+
+
+class BulkStatsResponse(BaseModel):
+    """Stats for many containers; failed containers are reported, not fatal."""
+
+    stats: list[ContainerStats]
+    errors: list[ContainerStatsError] = Field(default_factory=list)
+    total: int
+
+
+class SeriesAggregate(BaseModel):
+    """Per-bucket aggregates of one metric."""
+
+    min: list[float]
+    max: list[float]
+    avg: list[float]
+
+
+class StatsHistoryResponse(BaseModel):
+    """Downsampled stats history for a container (columnar)."""
+
+    container_id: str = Field(..., description="Container ID")
+    step: float = Field(..., description="Bucket width in seconds")
+    timestamps: list[float] = Field(..., description="Bucket start times (Unix seconds)")
+    series: dict[str, SeriesAggregate] = Field(
+        ..., description="cpu_percent, memory_usage, network_rx/tx, block_read/write"
+    )
@@ -34,3 +34,21 @@ class VersionResponse(BaseModel):
     os: str = Field("", description="Operating system")
     arch: str = Field("", description="Architecture")
 
+
+class SchedulerLaneStats(BaseModel):
+    """Admission counters for one Docker call lane."""
+
+    waiting: int = Field(..., description="Calls currently queued")
+    active: int = Field(..., description="Calls currently holding a slot")
+    completed: int = Field(..., description="Calls admitted and finished since startup")
+    wait_seconds_total: float = Field(..., description="Total time spent queued")
+    max_wait_seconds: float = Field(..., description="Longest time a call was queued")
+
+
+class SchedulerStatsResponse(BaseModel):
+    """Docker call scheduler limits and per-lane counters."""
+
+    max_concurrent: int = Field(..., description="Request slots shared by all lanes")
+    bulk_concurrent: int = Field(..., description="Request slots bulk reads may hold")
+    max_streams: int = Field(..., description="Concurrent long-lived streams")
+    lanes: dict[str, SchedulerLaneStats] = Field(..., description="Counters per lane: control, interactive, bulk, streams")
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, Optional
+
+_CLOSED = object()
+
+
+class Subscription:
+    """
+    Bounded, non-blocking mailbox for one subscriber of a shared stream.
+
+    Publishers never wait on a slow subscriber: when the queue is full the
+    oldest item is dropped and counted. Iterate with ``async for``; iteration
+    ends once the stream is closed and every queued item has been read, or
+    re-raises the upstream error.
+    """
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self.dropped = 0
+
+    @property
+    def full(self) -> bool:
+        """Whether the next publish would drop an item."""
+        return self._queue.full()
+
+    def publish(self, item: Any) -> None:
+        """Enqueue an item, dropping the oldest one if the subscriber is behind."""
+        if self._closed:
+            return
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(item)
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """End the subscription, optionally with the error that ended the stream."""
+        if self._closed:
+            return
+        self._closed = True
+        self._error = error
+        # The marker only wakes a waiting reader; a full queue needs no wake-up
+        # and must not lose its oldest item to it
+        if not self._queue.full():
+            self._queue.put_nowait(_CLOSED)
+
+    def drain(self, limit: int) -> list:
+        """Take up to ``limit`` queued items without waiting."""
+        items = []
+        while len(items) < limit and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is _CLOSED:
+                break
+            items.append(item)
+        return items
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._closed and self._queue.empty():
+            item = _CLOSED
+        else:
+            item = await self._queue.get()
+        if item is _CLOSED:
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        return item
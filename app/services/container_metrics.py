@@ -0,0 +1,84 @@
+import time
+from typing import Iterable, Iterator, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+
+from app.schemas.containers import ContainerSummary
+from app.schemas.stats import ContainerStats
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+LABELS = ["id", "name", "image", "compose_project"]
+
+# (metric name, help, ContainerStats field, family type); counters get _total
+_SERIES = (
+    ("docker_agent_container_cpu_percent", "CPU usage percentage (0-100)", "cpu_percent", GaugeMetricFamily),
+    ("docker_agent_container_memory_usage_bytes", "Memory usage", "memory_usage", GaugeMetricFamily),
+    ("docker_agent_container_memory_limit_bytes", "Memory limit", "memory_limit", GaugeMetricFamily),
+    ("docker_agent_container_memory_percent", "Memory usage percentage (0-100)", "memory_percent", GaugeMetricFamily),
+    ("docker_agent_container_network_receive_bytes", "Network bytes received", "network_rx", CounterMetricFamily),
+    ("docker_agent_container_network_transmit_bytes", "Network bytes transmitted", "network_tx", CounterMetricFamily),
+    ("docker_agent_container_block_read_bytes", "Block I/O bytes read", "block_read", CounterMetricFamily),
+    ("docker_agent_container_block_write_bytes", "Block I/O bytes written", "block_write", CounterMetricFamily),
+)
+
+
+class _Snapshot:
+    """One sampler tick, shaped as a prometheus_client collector."""
+
+    def __init__(self, timestamp: float, samples: list[ContainerStats], containers: dict[str, ContainerSummary]):
+        self.timestamp = timestamp
+        self.samples = samples
+        self.containers = containers
+
+    def collect(self) -> Iterator[Metric]:
+        families = [(cls(name, doc, labels=LABELS), field) for name, doc, field, cls in _SERIES]
+        for stats in self.samples:
+            key = stats.container_id[:12]
+            summary = self.containers.get(key)
+            labels = [
+                key,
+                summary.name if summary else "",
+                summary.image if summary else "",
+                (summary.compose_project or "") if summary else "",
+            ]
+            for family, field in families:
+                family.add_metric(labels, getattr(stats, field))
+        for family, _ in families:
+            yield family
+
+        sampled = GaugeMetricFamily(
+            "docker_agent_container_metrics_sampled_timestamp_seconds",
+            "Unix time of the sampler tick these values come from",
+        )
+        sampled.add_metric([], self.timestamp)
+        yield sampled
+
+
+class ContainerMetricsExporter:
+    """
+    Per-container Prometheus exposition built from background-sampled stats.
+
+    The text is rendered once per sampler tick and kept as bytes, so a scrape
+    is a memory read: it never touches the daemon, however often Prometheus
+    polls. Containers missing from the latest tick drop out of the output.
+    """
+
+    def __init__(self):
+        self._body = generate_latest(_Snapshot(0.0, [], {}))
+
+    def update(
+        self,
+        samples: list[ContainerStats],
+        containers: Iterable[ContainerSummary],
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Render a new tick of samples, labelled from the matching summaries."""
+        by_id = {c.id[:12]: c for c in containers}
+        snapshot = _Snapshot(timestamp if timestamp is not None else time.time(), samples, by_id)
+        self._body = generate_latest(snapshot)
+
+    def render(self) -> bytes:
+        """The exposition text for the latest tick."""
+        return self._body
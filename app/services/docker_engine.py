@@ -0,0 +1,220 @@
+import re
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import quote
+
+import httpx
+from docker.errors import APIError, DockerException, NotFound
+
+from app.core.logging import get_logger
+from app.core.metrics import DOCKER_CALL_DURATION, DOCKER_CALL_ERRORS
+from app.services.scheduler import DockerScheduler
+
+logger = get_logger(__name__)
+
+
+# Path segments that name an object (replaced by {id} in operation labels)
+_OBJECT_COLLECTIONS = {"containers", "images", "networks", "volumes", "exec"}
+_COLLECTION_ACTIONS = {"json", "create", "prune", "search", "load", "get"}
+
+# Live streams every subscriber sees identically, whoever joins when; these
+# can be served from one shared upstream by the stream broker
+_SHARED_STREAMS = re.compile(r"/(events|containers/[^/]+/stats)")
+
+
+def quote_id(value: str) -> str:
+    """Quote a container/image reference for use as a single path segment."""
+    return quote(value, safe="")
+
+
+def is_shared_stream(path: str) -> bool:
+    """Whether a streaming GET can be shared between subscribers (see stream_broker)."""
+    return _SHARED_STREAMS.fullmatch(path) is not None
+
+
+def operation_name(method: str, path: str) -> str:
+    """Low-cardinality metrics label for a call, e.g. ``GET /containers/{id}/json``."""
+    parts = path.split("/")
+    if len(parts) > 2 and parts[1] in _OBJECT_COLLECTIONS and parts[2] not in _COLLECTION_ACTIONS:
+        parts[2] = "{id}"
+    return f"{method} {'/'.join(parts)}"
+
+
+class DockerEngineClient:
+    """
+    Async Docker Engine API client.
+
+    Talks HTTP over the daemon's unix socket (or TCP) through a pooled,
+    keep-alive httpx transport so concurrent requests overlap instead of
+    blocking the event loop. Long-lived streams use a separate pool so they
+    can never exhaust the connections request/response calls need, and an
+    optional scheduler admits calls by priority lane. With a ``stream_broker``
+    socket, shareable streams (events, stats) are opened through the broker
+    process instead, falling back to the daemon if it is unreachable.
+    """
+
+    def __init__(
+        self,
+        docker_host: str,
+        api_version: str,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        scheduler: Optional[DockerScheduler] = None,
+        stream_broker: Optional[str] = None,
+    ):
+        if docker_host.startswith("unix://"):
+            uds = docker_host[len("unix://"):]
+            base_url = "http://docker"
+        elif docker_host.startswith(("tcp://", "http://")):
+            uds = None
+            base_url = "http://" + docker_host.split("://", 1)[1]
+        else:
+            raise DockerException(f"Unsupported DOCKER_HOST: {docker_host}")
+
+        def make_client(connections: Optional[int], uds: Optional[str], base_url: str) -> httpx.AsyncClient:
+            limits = httpx.Limits(
+                max_connections=connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+            return httpx.AsyncClient(
+                base_url=f"{base_url}/v{api_version}",
+                transport=httpx.AsyncHTTPTransport(uds=uds, limits=limits),
+                timeout=httpx.Timeout(timeout),
+            )
+
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self._http = make_client(max_connections, uds, base_url)
+        # Streams are bounded by the scheduler's stream slots, not the pool
+        self._stream_http = make_client(None, uds, base_url)
+        self._broker_http = make_client(None, stream_broker, "http://broker") if stream_broker else None
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        await self._http.aclose()
+        await self._stream_http.aclose()
+        if self._broker_http is not None:
+            await self._broker_http.aclose()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        """Send a request and raise docker-style errors for failures."""
+        operation = operation_name(method, path)
+        slot = self.scheduler.request_slot() if self.scheduler else nullcontext()
+        try:
+            async with slot:
+                started = time.perf_counter()
+                response = await self._http.request(
+                    method,
+                    path,
+                    params=params,
+                    timeout=timeout if timeout is not None else self.timeout,
+                )
+                DOCKER_CALL_DURATION.labels(operation).observe(time.perf_counter() - started)
+        except httpx.TransportError as e:
+            DOCKER_CALL_ERRORS.labels(operation, "transport").inc()
+            raise DockerException(f"Error while connecting to Docker daemon: {e}") from e
+
+        if response.status_code >= 400:
+            DOCKER_CALL_ERRORS.labels(operation, str(response.status_code)).inc()
+        _raise_for_status(response)
+        return response
+
+    async def get_json(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """GET a path and return the decoded JSON body."""
+        response = await self.request("GET", path, params=params, timeout=timeout)
+        return response.json()
+
+    async def post(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """POST to a path, discarding the response body."""
+        await self.request("POST", path, params=params, timeout=timeout)
+
+    async def ping(self) -> bool:
+        """Check the daemon responds to /_ping."""
+        response = await self.request("GET", "/_ping")
+        return response.text == "OK"
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """Open a streaming response; the read timeout is disabled for long-lived streams."""
+        timeout = httpx.Timeout(self.timeout, read=None)
+        operation = operation_name(method, path)
+        slot = self.scheduler.stream_slot() if self.scheduler else nullcontext()
+        try:
+            async with slot:
+                started = time.perf_counter()
+                async with self._open_stream(method, path, params, timeout) as response:
+                    DOCKER_CALL_DURATION.labels(operation).observe(time.perf_counter() - started)
+                    if response.status_code >= 400:
+                        DOCKER_CALL_ERRORS.labels(operation, str(response.status_code)).inc()
+                        await response.aread()
+                        _raise_for_status(response)
+                    yield response
+        except httpx.TransportError as e:
+            DOCKER_CALL_ERRORS.labels(operation, "transport").inc()
+            raise DockerException(f"Error while streaming from Docker daemon: {e}") from e
+
+    @asynccontextmanager
+    async def _open_stream(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict],
+        timeout: httpx.Timeout,
+    ) -> AsyncIterator[httpx.Response]:
+        if self._broker_http is not None and method == "GET" and is_shared_stream(path):
+            opened = False
+            try:
+                async with self._broker_http.stream(method, path, params=params, timeout=timeout) as response:
+                    opened = True
+                    yield response
+                return
+            except httpx.ConnectError as e:
+                if opened:
+                    raise
+                logger.warning("stream_broker_unavailable", path=path, error=str(e))
+
+        async with self._stream_http.stream(method, path, params=params, timeout=timeout) as response:
+            yield response
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    """Translate Engine API error responses into docker.errors exceptions."""
+    if response.status_code < 400:
+        return
+
+    try:
+        explanation = response.json().get("message", "")
+    except ValueError:
+        explanation = response.text
+
+    message = f"{response.status_code} {response.reason_phrase}: {explanation}"
+    if response.status_code == 404:
+        raise NotFound(message, explanation=explanation)
+    raise APIError(message, explanation=explanation)
+
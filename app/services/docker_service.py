@@ -1,44 +1,178 @@
 import asyncio
 import json
-from typing import Optional, Generator, Any
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional, AsyncIterator, Any
 from datetime import datetime, timezone
 
-import docker
+import httpx
 from docker.errors import NotFound, APIError, DockerException
-from docker.models.containers import Container
 
+from app.core.config import settings
+from app.core.exceptions import DockerAgentException
 from app.core.logging import get_logger
-from app.schemas.containers import ContainerSummary
-from app.schemas.stats import ContainerStats, ContainerStatsStream
+from app.schemas.containers import ContainerDetail, ContainerSummary
+from app.schemas.stats import (
+    ContainerStats,
+    ContainerStatsStream,
+    ContainerStatsError,
+    StatsHistoryResponse,
+)
 from app.schemas.images import ImageSummary
 from app.schemas.system import VersionResponse
+from app.services.docker_engine import DockerEngineClient, quote_id
+from app.services.log_parser import LogLine, LogStreamParser, iter_log_lines
+from app.services.log_batcher import batch_lines
+from app.services.log_merge import merge_live, merge_sorted
+from app.services import log_search
+from app.services.image_cache import ImageTagCache
+from app.services.inventory import ContainerInventory
+from app.services.broadcast import Subscription
+from app.services.stats_hub import StatsHub
+from app.services.event_hub import EventFilter, EventHub
+from app.services.stats_samples import CpuSampleCache
+from app.services.cgroup_stats import CgroupStatsReader
+from app.services.stats_history import StatsHistoryStore
+from app.services.container_metrics import ContainerMetricsExporter
+from app.services.scheduler import DockerScheduler, Lane, lane
 
 logger = get_logger(__name__)
 
-# Docker client singleton
-_client: Optional[docker.DockerClient] = None
+COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
 
+# Docker Engine API client singleton
+_client: Optional[DockerEngineClient] = None
 
-def get_client() -> docker.DockerClient:
-    """Get or create Docker client with connection validation."""
+# Set in the stream broker process, which talks to the daemon directly
+_is_stream_broker = False
+
+# Worker-side client for the broker's stats sampler endpoints
+_broker_http: Optional[httpx.AsyncClient] = None
+
+# Image ID -> tags cache shared by the container list and detail paths
+_image_tags: Optional[ImageTagCache] = None
+
+# Event-driven container inventory (see start_inventory)
+_inventory: Optional[ContainerInventory] = None
+
+# Container actions in flight, keyed by (action, container), for collapsing duplicates
+_inflight_actions: dict[tuple[str, str], asyncio.Task] = {}
+
+# One shared daemon events stream for the inventory and WebSocket subscribers
+_event_hub: Optional[EventHub] = None
+
+# Shared per-container stats streams for WebSocket subscribers
+_stats_hub: Optional[StatsHub] = None
+
+# Background-sampled stats history (see start_stats_history)
+_stats_history: Optional[StatsHistoryStore] = None
+
+# Latest sampler tick rendered for /metrics/containers
+_container_metrics = ContainerMetricsExporter()
+
+# Direct cgroup v2 reader (STATS_BACKEND=cgroup)
+_cgroup_stats: Optional[CgroupStatsReader] = None
+
+# Previous cpu_stats per container for one-shot stats reads
+_cpu_samples = CpuSampleCache(
+    max_size=settings.stats_sample_cache_size,
+    max_age=settings.stats_sample_max_age,
+)
+
+
+def create_client(stream_broker: Optional[str] = None) -> DockerEngineClient:
+    """Build a Docker Engine API client from settings."""
+    return DockerEngineClient(
+        docker_host=settings.docker_host,
+        api_version=settings.docker_api_version,
+        timeout=settings.docker_timeout,
+        max_connections=settings.docker_max_connections,
+        max_keepalive_connections=settings.docker_max_keepalive_connections,
+        keepalive_expiry=settings.docker_keepalive_expiry,
+        scheduler=DockerScheduler(
+            max_concurrent=settings.docker_max_concurrent_requests,
+            bulk_concurrent=settings.docker_bulk_concurrency,
+            max_streams=settings.docker_max_streams,
+        ),
+        stream_broker=stream_broker,
+    )
+
+
+def get_client() -> DockerEngineClient:
+    """Get or create the async Docker Engine API client."""
     global _client
     if _client is None:
-        try:
-            _client = docker.from_env()
-            _client.ping()
-            logger.info("docker_client_connected")
-        except DockerException as e:
-            logger.error("docker_client_connection_failed", error=str(e))
-            raise
+        _client = create_client(stream_broker=settings.docker_broker_socket if uses_stream_broker() else None)
     return _client
 
 
-def close_client() -> None:
+def become_stream_broker() -> None:
+    """Run this process as the stream broker: it streams from the daemon and runs the stats sampler."""
+    global _is_stream_broker
+    _is_stream_broker = True
+
+
+def uses_stream_broker() -> bool:
+    """Whether shared streams and stats sampling are delegated to the broker process."""
+    return bool(settings.docker_broker_socket) and not _is_stream_broker
+
+
+async def _from_broker(path: str, params: Optional[dict] = None) -> bytes:
+    """GET one of the broker's sampler endpoints, re-raising its errors with their status."""
+    global _broker_http
+    if _broker_http is None:
+        _broker_http = httpx.AsyncClient(
+            base_url="http://broker/agent",
+            transport=httpx.AsyncHTTPTransport(uds=settings.docker_broker_socket),
+            timeout=settings.docker_timeout,
+        )
+    try:
+        response = await _broker_http.get(path, params=params)
+    except httpx.TransportError as e:
+        logger.warning("stream_broker_unavailable", path=path, error=str(e))
+        raise DockerAgentException("Stats sampler (stream broker) is unavailable", status_code=503) from e
+    if response.status_code >= 400:
+        try:
+            detail = response.json().get("detail", "")
+        except ValueError:
+            detail = response.text
+        raise DockerAgentException(detail, status_code=response.status_code)
+    return response.content
+
+
+def get_scheduler_stats() -> dict:
+    """Queue depth and wait-time counters per scheduling lane."""
+    scheduler = get_client().scheduler
+    return {
+        "max_concurrent": scheduler.max_concurrent,
+        "bulk_concurrent": scheduler.bulk_concurrent,
+        "max_streams": scheduler.max_streams,
+        "lanes": scheduler.snapshot(),
+    }
+
+
+async def connect() -> None:
+    """Create the Docker client and validate the daemon connection."""
+    try:
+        await get_client().ping()
+        logger.info("docker_client_connected")
+    except DockerException as e:
+        logger.error("docker_client_connection_failed", error=str(e))
+        raise
+
+
+async def close_client() -> None:
     """Close Docker client connection."""
-    global _client
+    global _client, _image_tags, _broker_http
+    _image_tags = None
+    if _broker_http is not None:
+        await _broker_http.aclose()
+        _broker_http = None
     if _client is not None:
         try:
-            _client.close()
+            await _client.close()
             logger.info("docker_client_closed")
         except Exception as e:
             logger.warning("docker_client_close_error", error=str(e))
@@ -46,26 +180,74 @@ def close_client() -> None:
             _client = None
 
 
-def is_connected() -> bool:
+def start_inventory() -> None:
+    """Start the background container inventory fed by the events stream."""
+    global _inventory
+    if _inventory is None:
+        _inventory = ContainerInventory(
+            get_client(),
+            _fetch_containers,
+            subscribe_events,
+            on_image_event=_image_cache().invalidate,
+        )
+        _inventory.start()
+
+
+async def stop_inventory() -> None:
+    """Stop the background container inventory."""
+    global _inventory
+    if _inventory is not None:
+        await _inventory.stop()
+        _inventory = None
+
+
+def _ready_inventory() -> Optional[ContainerInventory]:
+    """Return the inventory if it is bootstrapped and tracking events."""
+    if _inventory is not None and _inventory.ready:
+        return _inventory
+    return None
+
+
+def get_inventory_version() -> Optional[int]:
+    """Current inventory version, or None when served from the daemon."""
+    inventory = _ready_inventory()
+    return inventory.version if inventory else None
+
+
+def get_inventory_state() -> Optional[tuple[str, int]]:
+    """(instance ID, version) identifying the inventory's contents in this process, or None when not ready."""
+    inventory = _ready_inventory()
+    return (inventory.instance_id, inventory.version) if inventory else None
+
+
+async def is_connected() -> bool:
     """Check if Docker daemon is reachable."""
     try:
-        get_client().ping()
-        return True
+        with lane(Lane.CONTROL):
+            return await get_client().ping()
     except Exception:
         return False
 
 
-def get_system_info() -> dict:
+async def get_system_info() -> dict:
     """Get Docker system information for enhanced health check."""
     try:
-        client = get_client()
-        info = client.info()
-        version = client.version()
+        inventory = _ready_inventory()
+        if inventory is not None:
+            info = inventory.system["info"]
+            version = inventory.system["version"]
+            running, total = inventory.counts()
+        else:
+            client = get_client()
+            info, version, containers = await asyncio.gather(
+                client.get_json("/info"),
+                client.get_json("/version"),
+                client.get_json("/containers/json", params={"all": True}),
+            )
 
-        # Count containers
-        containers = client.containers.list(all=True)
-        running = sum(1 for c in containers if c.status == "running")
-        total = len(containers)
+            # Count containers
+            running = sum(1 for c in containers if c.get("State") == "running")
+            total = len(containers)
 
         return {
             "docker_connected": True,
@@ -87,77 +269,283 @@ def get_system_info() -> dict:
         }
 
 
-def list_containers(all: bool = True) -> list[ContainerSummary]:
+def _container_name(attrs: dict) -> str:
+    """Container name without the leading slash the Engine API adds."""
+    return (attrs.get("Name") or "").lstrip("/")
+
+
+def _short_image_id(image_id: str) -> str:
+    """Short image ID in the same form as the Docker CLI/SDK (sha256:xxxxxxxxxx)."""
+    if image_id.startswith("sha256:"):
+        return image_id[:17]
+    return image_id[:10]
+
+
+def _image_cache() -> ImageTagCache:
+    """Get or create the image ID -> tags cache."""
+    global _image_tags
+    if _image_tags is None:
+        _image_tags = ImageTagCache(get_client(), ttl=settings.image_cache_ttl)
+    return _image_tags
+
+
+async def _image_name(image_id: str, fallback: str = "") -> str:
+    """Resolve an image ID to its first tag, falling back to the short ID."""
+    tags = (await _image_cache().get({image_id})).get(image_id)
+    if tags is None:
+        return fallback or _short_image_id(image_id)
+    return tags[0] if tags else _short_image_id(image_id)
+
+
+async def list_containers(all: bool = True) -> list[ContainerSummary]:
     """List all containers with summary information."""
+    inventory = _ready_inventory()
+    if inventory is not None:
+        return inventory.list_containers(all=all)
+
+    result = await _fetch_containers(None, all=all)
+    logger.debug("containers_listed", count=len(result), all=all)
+    return result
+
+
+async def _fetch_containers(filters: Optional[dict], all: bool = True) -> list[ContainerSummary]:
+    """Fetch container summaries from the daemon, optionally filtered."""
     client = get_client()
-    containers = client.containers.list(all=all)
+    params = {"all": all}
+    if filters:
+        params["filters"] = json.dumps(filters)
+    summaries = await client.get_json("/containers/json", params=params)
+
+    image_tags = await _image_cache().get({c.get("ImageID", "") for c in summaries})
 
     result = []
-    for c in containers:
+    for c in summaries:
         try:
-            # Extract port mappings
-            ports = []
-            for port_str, mappings in (c.attrs.get("NetworkSettings", {}).get("Ports") or {}).items():
-                if mappings:
-                    for m in mappings:
-                        container_port = int(port_str.split("/")[0])
-                        protocol = port_str.split("/")[1] if "/" in port_str else "tcp"
-                        ports.append({
-                            "PrivatePort": container_port,
-                            "PublicPort": int(m["HostPort"]) if m.get("HostPort") else None,
-                            "Type": protocol,
-                            "IP": m.get("HostIp"),
-                        })
-
-            result.append(ContainerSummary(
-                id=c.short_id,
-                name=c.name,
-                image=c.image.tags[0] if c.image.tags else c.image.short_id,
-                status=c.status,
-                state=c.attrs.get("State", {}).get("Status", "unknown"),
-                created=_parse_timestamp(c.attrs.get("Created", 0)),
-                ports=ports,
-            ))
+            result.append(_summary_from_payload(c, image_tags))
         except Exception as e:
-            logger.warning("container_parse_error", container_id=c.short_id, error=str(e))
+            logger.warning("container_parse_error", container_id=c.get("Id", "")[:12], error=str(e))
             continue
 
-    logger.debug("containers_listed", count=len(result), all=all)
     return result
 
 
-def get_container(container_id: str) -> Container:
-    """Get a container by ID or name."""
+def _summary_from_payload(c: dict, image_tags: dict[str, list[str]]) -> ContainerSummary:
+    """Build a ContainerSummary from a /containers/json entry."""
+    image_id = c.get("ImageID", "")
+    tags = image_tags.get(image_id)
+    if tags is None:
+        image = c.get("Image") or _short_image_id(image_id)
+    else:
+        image = tags[0] if tags else _short_image_id(image_id)
+
+    names = c.get("Names") or [""]
+    labels = c.get("Labels") or {}
+    state = c.get("State") or "unknown"
+    return ContainerSummary(
+        id=c["Id"][:12],
+        name=names[0].lstrip("/"),
+        image=image,
+        status=state,
+        state=state,
+        created=_parse_timestamp(c.get("Created", 0)),
+        # Only published ports, matching the inspect-based mapping list
+        ports=[p for p in (c.get("Ports") or []) if "PublicPort" in p],
+        compose_project=labels.get(COMPOSE_PROJECT_LABEL),
+    )
+
+
+async def inspect_container(container_id: str) -> dict:
+    """Inspect a container by ID or name and return its raw attributes."""
     client = get_client()
-    container = client.containers.get(container_id)
-    return container
+    return await client.get_json(f"/containers/{quote_id(container_id)}/json")
+
+
+def _canonical_container_id(container_id: str) -> str:
+    """Map a name or ID to the short ID via the inventory, when it is ready."""
+    inventory = _ready_inventory()
+    if inventory is not None:
+        return inventory.resolve(container_id) or container_id
+    return container_id
+
+
+async def _post_action(action: str, container_id: str, timeout: int) -> None:
+    params = None if action == "start" else {"t": timeout}
+    with lane(Lane.CONTROL):
+        await get_client().post(
+            f"/containers/{quote_id(container_id)}/{action}",
+            params=params,
+            # stop/restart wait up to `timeout` before the daemon kills the container
+            timeout=settings.docker_timeout + (0 if action == "start" else timeout),
+        )
+
+
+async def perform_action(action: str, container_id: str, timeout: int = 10) -> bool:
+    """
+    Run start/stop/restart on a container, joining an identical action in flight.
+
+    Concurrent requests for the same action on the same container share one
+    daemon call and its outcome. Returns True if an in-flight call was joined.
+    """
+    key = (action, _canonical_container_id(container_id))
+    task = _inflight_actions.get(key)
+    joined = task is not None
+    if task is None:
+        task = asyncio.create_task(_post_action(action, container_id, timeout), name=f"action-{action}")
+        _inflight_actions[key] = task
+
+        def done(t: asyncio.Task) -> None:
+            if _inflight_actions.get(key) is t:
+                del _inflight_actions[key]
+            if not t.cancelled():
+                t.exception()  # Retrieved here in case every caller went away
+
+        task.add_done_callback(done)
+
+    # Shielded so one caller disconnecting does not cancel the shared action
+    await asyncio.shield(task)
+    return joined
 
 
-def start_container(container_id: str) -> None:
+async def start_container(container_id: str) -> None:
     """Start a container."""
-    container = get_container(container_id)
-    container.start()
+    await perform_action("start", container_id)
     logger.info("container_started", container_id=container_id)
 
 
-def stop_container(container_id: str) -> None:
+async def stop_container(container_id: str, timeout: int = 10) -> None:
     """Stop a container."""
-    container = get_container(container_id)
-    container.stop()
+    await perform_action("stop", container_id, timeout)
     logger.info("container_stopped", container_id=container_id)
 
 
-def restart_container(container_id: str, timeout: int = 10) -> None:
+async def restart_container(container_id: str, timeout: int = 10) -> None:
     """Restart a container."""
-    container = get_container(container_id)
-    container.restart(timeout=timeout)
+    await perform_action("restart", container_id, timeout)
     logger.info("container_restarted", container_id=container_id)
 
 
-def get_container_details(container_id: str) -> dict:
+def _action_settled(action: str, state: dict) -> bool:
+    """Whether a container reached the state an action aims for (healthy, if it has a healthcheck)."""
+    if action == "stop":
+        return not state.get("Running")
+    if not state.get("Running"):
+        if state.get("Status") in ("exited", "dead"):
+            raise DockerAgentException(f"Container exited (code {state.get('ExitCode')})", status_code=409)
+        return False
+    health = (state.get("Health") or {}).get("Status")
+    if health == "unhealthy":
+        raise DockerAgentException("Container is unhealthy", status_code=409)
+    return health in (None, "none", "healthy")
+
+
+async def _wait_settled(action: str, container_id: str, wait_timeout: float) -> dict:
+    """Wait until an action's target state is reached, re-checking on container events."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait_timeout
+    event_filter = EventFilter(containers=[container_id], actions=["start", "die", "stop", "health_status"])
+    async with subscribe_events(event_filter) as events:
+        while True:
+            state = (await inspect_container(container_id)).get("State", {})
+            if _action_settled(action, state):
+                return state
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise DockerAgentException(f"Not settled after {wait_timeout}s", status_code=504)
+            try:
+                # Re-check on the next matching event, or periodically as a fallback
+                await asyncio.wait_for(anext(events), min(remaining, 5.0))
+            except (asyncio.TimeoutError, StopAsyncIteration):
+                pass
+
+
+async def run_bulk_action(
+    action: str,
+    container_ids: Optional[list[str]] = None,
+    labels: Optional[list[str]] = None,
+    max_parallel: Optional[int] = None,
+    rolling: bool = False,
+    timeout: int = 10,
+    wait_timeout: float = 60.0,
+) -> AsyncIterator[dict]:
+    """
+    Apply an action to many containers, yielding per-container results.
+
+    Containers are processed at most ``max_parallel`` at a time. In rolling
+    mode they go in batches of that size, each waiting until its containers
+    are running (and healthy, if they define a healthcheck) or stopped before
+    the next starts; the first failure stops the roll and the remaining
+    containers are reported as skipped. Yields ``{"container_id", "action",
+    "status", "joined", "duration_ms"}`` records (plus "error" or "state")
+    and a final ``{"action", "total", "succeeded", "failed", "skipped"}``.
+    """
+    ids = await resolve_container_ids(container_ids, labels, running_only=False)
+    return _bulk_action_records(
+        action, ids, max_parallel or settings.container_actions_max_parallel, rolling, timeout, wait_timeout
+    )
+
+
+async def _bulk_action_records(
+    action: str,
+    container_ids: list[str],
+    max_parallel: int,
+    rolling: bool,
+    timeout: int,
+    wait_timeout: float,
+) -> AsyncIterator[dict]:
+    semaphore = asyncio.Semaphore(max_parallel)
+    counts = {"succeeded": 0, "failed": 0, "skipped": 0}
+
+    async def run(container_id: str) -> dict:
+        started = time.perf_counter()
+        record = {"container_id": container_id, "action": action, "joined": False}
+        async with semaphore:
+            try:
+                record["joined"] = await perform_action(action, container_id, timeout)
+                if rolling:
+                    state = await _wait_settled(action, container_id, wait_timeout)
+                    health = (state.get("Health") or {}).get("Status")
+                    record["state"] = state.get("Status") + (f" ({health})" if health and state.get("Running") else "")
+                record["status"] = "ok"
+            except Exception as e:
+                record["status"] = "error"
+                record["error"] = getattr(e, "message", None) or str(e)
+        record["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        counts["succeeded" if record["status"] == "ok" else "failed"] += 1
+        return record
+
+    batches = (
+        [container_ids[i:i + max_parallel] for i in range(0, len(container_ids), max_parallel)]
+        if rolling else [container_ids]
+    )
+    for index, batch in enumerate(batches):
+        tasks = [asyncio.create_task(run(cid)) for cid in batch]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if rolling and counts["failed"]:
+            for container_id in [cid for rest in batches[index + 1:] for cid in rest]:
+                counts["skipped"] += 1
+                yield {"container_id": container_id, "action": action, "status": "skipped"}
+            break
+
+    logger.info("bulk_action_completed", action=action, total=len(container_ids), **counts)
+    yield {"action": action, "total": len(container_ids), **counts}
+
+
+async def get_container_details(container_id: str) -> ContainerDetail:
     """Get detailed information about a container."""
-    container = get_container(container_id)
-    attrs = container.attrs
+    attrs = await inspect_container(container_id)
+    image = await _image_name(attrs.get("Image", ""), fallback=attrs.get("Config", {}).get("Image", ""))
+    return _detail_from_payload(attrs, image)
+
+
+def _detail_from_payload(attrs: dict, image: str) -> ContainerDetail:
+    """Build a ContainerDetail from a /containers/{id}/json payload."""
+    image_id = attrs.get("Image", "")
 
     # Extract useful information
     config = attrs.get("Config", {})
@@ -206,14 +594,14 @@ def get_container_details(container_id: str) -> dict:
                 "host_ip": "",
             })
 
-    return {
-        "id": container.id,
-        "short_id": container.short_id,
-        "name": container.name,
-        "image": container.image.tags[0] if container.image.tags else container.image.short_id,
-        "image_id": container.image.id,
+    return ContainerDetail.model_validate({
+        "id": attrs["Id"],
+        "short_id": attrs["Id"][:12],
+        "name": _container_name(attrs),
+        "image": image,
+        "image_id": image_id,
         "created": _parse_timestamp(attrs.get("Created", 0)),
-        "status": container.status,
+        "status": state.get("Status", ""),
         "state": {
             "status": state.get("Status", ""),
             "running": state.get("Running", False),
@@ -242,14 +630,338 @@ def get_container_details(container_id: str) -> dict:
         "mounts": mounts,
         "networks": networks,
         "ports": ports,
-    }
+    })
 
 
-def get_logs(container_id: str, tail: int = 100) -> str:
-    """Get container logs."""
-    container = get_container(container_id)
-    logs = container.logs(tail=tail)
-    return logs.decode("utf-8", errors="replace")
+def _log_stream_params(stream: str) -> dict:
+    """Daemon stdout/stderr flags for a stream filter ("all", "stdout" or "stderr")."""
+    return {"stdout": stream != "stderr", "stderr": stream != "stdout"}
+
+
+def _log_parser(attrs: dict, timestamps: bool = False) -> LogStreamParser:
+    return LogStreamParser(
+        tty=attrs.get("Config", {}).get("Tty", False),
+        timestamps=timestamps,
+        max_line_length=settings.log_max_line_length,
+    )
+
+
+async def get_logs(container_id: str, tail: int = 100, stream: str = "all") -> str:
+    """Get container logs, optionally only stdout or stderr."""
+    attrs = await inspect_container(container_id)
+    response = await get_client().request(
+        "GET",
+        f"/containers/{quote_id(container_id)}/logs",
+        params={**_log_stream_params(stream), "tail": tail},
+    )
+    parser = _log_parser(attrs)
+    lines = parser.feed(response.content) + parser.flush()
+    return "".join(line.text + "\n" for line in lines)
+
+
+def _rfc3339_to_nanos(value: str) -> int:
+    """Convert a Docker RFC3339Nano timestamp to Unix nanoseconds without float rounding."""
+    head, _, rest = value.partition(".")
+    digits = len(rest) - len(rest.lstrip("0123456789"))
+    fraction, zone = rest[:digits], rest[digits:]
+    dt = datetime.fromisoformat((head + zone).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp()) * 1_000_000_000 + int(fraction.ljust(9, "0")[:9])
+
+
+def _format_cursor(nanos: int) -> str:
+    """Format Unix nanoseconds as a Docker "seconds.nanoseconds" timestamp."""
+    return f"{nanos // 1_000_000_000}.{nanos % 1_000_000_000:09d}"
+
+
+def parse_log_cursor(value: Optional[str]) -> Optional[str]:
+    """Normalise a since/until cursor (Unix seconds or RFC3339) for the daemon."""
+    if not value:
+        return None
+    try:
+        if value.replace(".", "", 1).isdigit():
+            seconds, _, fraction = value.partition(".")
+            return _format_cursor(int(seconds) * 1_000_000_000 + int(fraction.ljust(9, "0")[:9] or 0))
+        return _format_cursor(_rfc3339_to_nanos(value))
+    except ValueError:
+        raise DockerAgentException(f"Invalid log cursor: {value!r}", status_code=400)
+
+
+def _log_record(line: LogLine) -> bytes:
+    """Encode a log line as an NDJSON record."""
+    return (json.dumps({"timestamp": line.timestamp, "stream": line.stream, "line": line.text}) + "\n").encode()
+
+
+async def stream_log_page(
+    container_id: str,
+    limit: int = 1000,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    stream: str = "all",
+) -> AsyncIterator[bytes]:
+    """
+    Open a page of container logs as NDJSON records, newest page first.
+
+    The container is inspected up front so errors surface before streaming
+    starts. Records are ``{"timestamp", "stream", "line"}`` objects followed by a final
+    ``{"next_cursor"}`` object: pass it back as ``until`` to fetch the
+    previous (older) page; it is null once the beginning is reached.
+    """
+    attrs = await inspect_container(container_id)
+    params = {**_log_stream_params(stream), "timestamps": True}
+    return _log_page_records(
+        attrs["Id"], _log_parser(attrs, timestamps=True), params,
+        limit, parse_log_cursor(since), parse_log_cursor(until),
+    )
+
+
+async def _log_page_records(
+    container_id: str,
+    parser: LogStreamParser,
+    params: dict,
+    limit: int,
+    since: Optional[str],
+    until: Optional[str],
+) -> AsyncIterator[bytes]:
+    if since:
+        params["since"] = since
+    if until:
+        params["until"] = until
+    else:
+        # Newest page: the daemon tails the log file without scanning it
+        params["tail"] = limit
+
+    path = f"/containers/{quote_id(container_id)}/logs"
+    oldest: Optional[str] = None
+    more = False
+
+    async with get_client().stream("GET", path, params) as response:
+        lines = iter_log_lines(response, parser)
+        if until:
+            # The daemon applies tail before until, so keep the last `limit`
+            # lines before the cursor in a bounded window instead.
+            page: deque[LogLine] = deque(maxlen=limit)
+            async for line in lines:
+                more = more or len(page) == limit
+                page.append(line)
+            for line in page:
+                oldest = oldest or line.timestamp
+                yield _log_record(line)
+        else:
+            count = 0
+            async for line in lines:
+                oldest = oldest or line.timestamp
+                count += 1
+                yield _log_record(line)
+            more = count >= limit
+
+    next_cursor = None
+    if more and oldest:
+        # Docker's until is inclusive; step back 1ns so the boundary line isn't repeated
+        next_cursor = _format_cursor(_rfc3339_to_nanos(oldest) - 1)
+    yield (json.dumps({"next_cursor": next_cursor}) + "\n").encode()
+
+
+async def search_logs(
+    pattern: str,
+    container_ids: Optional[list[str]] = None,
+    labels: Optional[list[str]] = None,
+    since: Optional[str] = None,
+    limit: int = 100,
+    ignore_case: bool = False,
+    stream: str = "all",
+) -> AsyncIterator[dict]:
+    """
+    Search container logs for a regex, yielding matches as they are found.
+
+    The pattern, cursor and container selection are validated before this
+    returns, so errors surface as normal HTTP errors. Containers are read
+    concurrently and their lines matched in batches in a process pool;
+    reading stops as soon as ``limit`` matches have been produced.
+    Yields ``{"container_id", "container_name", "stream", "timestamp",
+    "line"}`` matches, ``{"container_id", "error"}`` for containers that
+    could not be read, ``{"error"}`` if matching timed out and the search was
+    aborted, and a final ``{"matched", "limit_reached"}`` summary.
+    """
+    if len(pattern) > settings.log_search_max_pattern_length:
+        raise DockerAgentException(
+            f"Pattern is too long ({len(pattern)} > {settings.log_search_max_pattern_length} characters)",
+            status_code=400,
+        )
+    flags = re.IGNORECASE if ignore_case else 0
+    try:
+        re.compile(pattern, flags)
+    except re.error as e:
+        raise DockerAgentException(f"Invalid pattern: {e}", status_code=400)
+    since = parse_log_cursor(since)
+    ids = await resolve_container_ids(container_ids, labels, running_only=False)
+    return _search_records(ids, pattern, flags, since, limit, stream)
+
+
+async def _search_records(
+    container_ids: list[str],
+    pattern: str,
+    flags: int,
+    since: Optional[str],
+    limit: int,
+    stream: str,
+) -> AsyncIterator[dict]:
+    results: asyncio.Queue[Optional[dict]] = asyncio.Queue(maxsize=limit)
+    semaphore = asyncio.Semaphore(settings.log_search_concurrency)
+    matched = 0
+
+    async def search(container_id: str) -> None:
+        attrs = await inspect_container(container_id)
+        base = {"container_id": attrs["Id"][:12], "container_name": _container_name(attrs)}
+        params = {**_log_stream_params(stream), "timestamps": True}
+        if since:
+            params["since"] = since
+
+        async def flush(batch: list[LogLine]) -> None:
+            nonlocal matched
+            hits = await log_search.search_batch(
+                settings.log_search_workers,
+                pattern,
+                flags,
+                [line.text for line in batch],
+                settings.log_search_timeout,
+            )
+            for i in hits:
+                if matched >= limit:
+                    return
+                matched += 1
+                line = batch[i]
+                await results.put({**base, "stream": line.stream, "timestamp": line.timestamp, "line": line.text})
+
+        async with get_client().stream("GET", f"/containers/{quote_id(container_id)}/logs", params) as response:
+            batch: list[LogLine] = []
+            async for line in iter_log_lines(response, _log_parser(attrs, timestamps=True)):
+                if matched >= limit:
+                    return
+                batch.append(line)
+                if len(batch) >= settings.log_search_batch_size:
+                    await flush(batch)
+                    batch = []
+            if batch:
+                await flush(batch)
+
+    async def guarded(container_id: str) -> None:
+        async with semaphore:
+            if matched >= limit:
+                return
+            try:
+                with lane(Lane.BULK):
+                    await search(container_id)
+            except (asyncio.CancelledError, log_search.SearchTimeout):
+                raise
+            except Exception as e:
+                logger.warning("log_search_error", container_id=container_id, error=str(e))
+                await results.put({"container_id": container_id, "error": str(e)})
+
+    async def run() -> None:
+        tasks = [asyncio.create_task(guarded(cid)) for cid in container_ids]
+        try:
+            await asyncio.gather(*tasks)
+        except log_search.SearchTimeout as e:
+            # The same pattern would time out on the other containers too
+            for task in tasks:
+                task.cancel()
+            logger.warning("log_search_timeout", pattern=pattern, timeout=settings.log_search_timeout)
+            await results.put({"error": str(e)})
+        await results.put(None)
+
+    runner = asyncio.create_task(run(), name="log-search")
+    try:
+        while (record := await results.get()) is not None:
+            yield record
+    finally:
+        runner.cancel()
+
+    logger.info("log_search_completed", containers=len(container_ids), matched=matched)
+    yield {"matched": matched, "limit_reached": matched >= limit}
+
+
+async def _resolve_log_sources(
+    container_ids: Optional[list[str]],
+    labels: Optional[list[str]],
+) -> list[dict]:
+    """Inspect the containers selected for a merged log stream."""
+    ids = await resolve_container_ids(container_ids, labels, running_only=False)
+    if len(ids) > settings.log_merge_max_containers:
+        raise DockerAgentException(
+            f"Too many containers to merge ({len(ids)} > {settings.log_merge_max_containers})",
+            status_code=400,
+        )
+    return await asyncio.gather(*(inspect_container(cid) for cid in ids))
+
+
+async def _container_log_records(attrs: dict, params: dict) -> AsyncIterator[dict]:
+    """One container's log lines as records tagged with the container."""
+    base = {"container_id": attrs["Id"][:12], "container_name": _container_name(attrs)}
+    async with get_client().stream("GET", f"/containers/{attrs['Id']}/logs", params) as response:
+        async for line in iter_log_lines(response, _log_parser(attrs, timestamps=True)):
+            yield {**base, "stream": line.stream, "timestamp": line.timestamp, "line": line.text}
+
+
+def _record_time(record: dict) -> str:
+    # Daemon timestamps are fixed-width RFC3339Nano UTC, so they sort as strings
+    return record["timestamp"] or ""
+
+
+async def merge_logs(
+    container_ids: Optional[list[str]] = None,
+    labels: Optional[list[str]] = None,
+    tail: int = 100,
+    since: Optional[str] = None,
+    stream: str = "all",
+) -> AsyncIterator[dict]:
+    """
+    Time-ordered log history of several containers.
+
+    Each container's log (last ``tail`` lines, optionally since a time) is
+    already in order, so the streams are combined with a k-way heap merge.
+    """
+    sources = await _resolve_log_sources(container_ids, labels)
+    params = {**_log_stream_params(stream), "timestamps": True, "tail": tail}
+    since = parse_log_cursor(since)
+    if since:
+        params["since"] = since
+    return merge_sorted([_container_log_records(attrs, params) for attrs in sources], key=_record_time)
+
+
+async def follow_merged_logs(
+    container_ids: Optional[list[str]] = None,
+    labels: Optional[list[str]] = None,
+    tail: int = 10,
+    stream: str = "all",
+) -> AsyncIterator[str]:
+    """
+    Follow several containers' logs as one stream of JSON records.
+
+    Lines are ordered within a short reorder window (LOG_MERGE_WINDOW) and
+    delivered in batched frames like the single-container log socket.
+    """
+    sources = await _resolve_log_sources(container_ids, labels)
+    params = {**_log_stream_params(stream), "timestamps": True, "tail": tail, "follow": True}
+    records = merge_live(
+        [_container_log_records(attrs, params) for attrs in sources],
+        key=_record_time,
+        window=settings.log_merge_window,
+    )
+    return batch_lines(
+        (json.dumps(record) async for record in records),
+        batch_size=settings.log_ws_batch_size,
+        batch_interval=settings.log_ws_batch_interval,
+        queue_size=settings.log_ws_queue_size,
+        policy=settings.log_ws_slow_consumer_policy,
+    )
+
+
+async def encode_ndjson(records: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Encode a record stream as NDJSON lines."""
+    async for record in records:
+        yield (json.dumps(record) + "\n").encode()
 
 
 def _calculate_cpu_percent(stats: dict) -> float:
@@ -300,14 +1012,71 @@ def _calculate_block_io(stats: dict) -> tuple[int, int]:
     return read_bytes, write_bytes
 
 
-def get_container_stats(container_id: str) -> ContainerStats:
-    """Get container resource statistics with correct calculations."""
-    container = get_container(container_id)
-    stats = container.stats(stream=False)
+def _cgroup_reader() -> Optional[CgroupStatsReader]:
+    """The cgroup stats reader when STATS_BACKEND=cgroup."""
+    global _cgroup_stats
+    if settings.stats_backend != "cgroup":
+        return None
+    if _cgroup_stats is None:
+        _cgroup_stats = CgroupStatsReader(
+            settings.stats_cgroup_root,
+            proc_root=settings.stats_cgroup_proc_root,
+            sample_cache_size=settings.stats_sample_cache_size,
+            sample_max_age=settings.stats_sample_max_age,
+        )
+    return _cgroup_stats
+
 
+async def get_container_stats(container_id: str, one_shot: Optional[bool] = None) -> ContainerStats:
+    """
+    Get container resource statistics with correct calculations.
+
+    With the cgroup backend the stats are read from the container's cgroup
+    files (names are resolved through the inventory); containers not found
+    there, or whose files cannot be read, fall back to the daemon. In one-shot mode the daemon answers immediately without its
+    sampling interval, and CPU usage is computed against the previous poll
+    cached for the container. Without a recent previous sample this degrades
+    to the regular (slower) two-sample read.
+    """
+    reader = _cgroup_reader()
+    if reader is not None:
+        # Names are resolved through the inventory; the cgroup index is by ID
+        found, _ = await asyncio.to_thread(reader.read_many, [_canonical_container_id(container_id)])
+        if found:
+            return found[0].model_copy(update={"container_id": container_id})
+    return await _daemon_container_stats(container_id, one_shot)
+
+
+async def _daemon_container_stats(container_id: str, one_shot: Optional[bool] = None) -> ContainerStats:
+    """Read container stats through the daemon's stats endpoint."""
+    if one_shot is None:
+        one_shot = settings.stats_one_shot
+    path = f"/containers/{quote_id(container_id)}/stats"
+
+    stats = None
+    if one_shot:
+        sample = await get_client().get_json(path, params={"stream": False, "one-shot": True})
+        key = sample.get("id") or container_id
+        previous = _cpu_samples.get(key)
+        _cpu_samples.put(key, sample.get("cpu_stats", {}))
+        if previous is not None:
+            stats = {**sample, "precpu_stats": previous}
+
+    if stats is None:
+        stats = await get_client().get_json(path, params={"stream": False})
+        _cpu_samples.put(stats.get("id") or container_id, stats.get("cpu_stats", {}))
+
+    return _stats_from_payload(container_id, stats)
+
+
+def _stats_from_payload(container_id: str, stats: dict) -> ContainerStats:
+    """Build ContainerStats from a /containers/{id}/stats sample."""
     mem_usage = stats.get("memory_stats", {}).get("usage", 0)
     mem_limit = stats.get("memory_stats", {}).get("limit", 1)
     mem_percent = round((mem_usage / mem_limit) * 100, 2) if mem_limit > 0 else 0.0
+    # cgroup v2 reports inactive_file, v1 total_inactive_file
+    memory_stat = stats.get("memory_stats", {}).get("stats") or {}
+    mem_inactive_file = memory_stat.get("inactive_file", memory_stat.get("total_inactive_file"))
 
     cpu_percent = _calculate_cpu_percent(stats)
     network_rx, network_tx = _calculate_network_io(stats)
@@ -319,6 +1088,7 @@ def get_container_stats(container_id: str) -> ContainerStats:
         memory_usage=mem_usage,
         memory_limit=mem_limit,
         memory_percent=mem_percent,
+        memory_inactive_file=mem_inactive_file,
         network_rx=network_rx,
         network_tx=network_tx,
         block_read=block_read,
@@ -326,6 +1096,165 @@ def get_container_stats(container_id: str) -> ContainerStats:
     )
 
 
+async def resolve_container_ids(
+    container_ids: Optional[list[str]] = None,
+    labels: Optional[list[str]] = None,
+    running_only: bool = True,
+) -> list[str]:
+    """
+    Resolve explicit IDs or a label selector ("key" or "key=value") to container IDs.
+
+    Without either, returns every (running) container from the inventory.
+    """
+    if container_ids:
+        return list(dict.fromkeys(container_ids))
+
+    if labels:
+        filters = {"label": labels}
+        if running_only:
+            filters["status"] = ["running"]
+        summaries = await get_client().get_json(
+            "/containers/json",
+            params={"all": True, "filters": json.dumps(filters)},
+        )
+        return [c["Id"][:12] for c in summaries]
+
+    return [c.id for c in await list_containers(all=not running_only)]
+
+
+async def get_bulk_stats(
+    container_ids: Optional[list[str]] = None,
+    labels: Optional[list[str]] = None,
+) -> tuple[list[ContainerStats], list[ContainerStatsError]]:
+    """
+    Collect stats for many containers concurrently.
+
+    Concurrency is capped and each container has its own timeout; failures are
+    returned alongside the successful results instead of failing the batch.
+    With the cgroup backend the whole batch is read from cgroupfs in one
+    worker thread and only containers missing there go to the daemon.
+    """
+    ids = await resolve_container_ids(container_ids, labels)
+    requested = len(ids)
+    stats: list[ContainerStats] = []
+    reader = _cgroup_reader()
+    if reader is not None and ids:
+        stats, ids = await asyncio.to_thread(reader.read_many, ids)
+
+    semaphore = asyncio.Semaphore(settings.stats_bulk_concurrency)
+    timeout = settings.stats_bulk_timeout
+
+    async def collect(container_id: str) -> ContainerStats:
+        async with semaphore:
+            return await asyncio.wait_for(_daemon_container_stats(container_id), timeout)
+
+    # Tasks created here inherit the bulk lane, so a large fan-out queues
+    # behind container actions and interactive reads
+    with lane(Lane.BULK):
+        results = await asyncio.gather(*(collect(c) for c in ids), return_exceptions=True)
+
+    errors = []
+    for container_id, result in zip(ids, results):
+        if isinstance(result, ContainerStats):
+            stats.append(result)
+        elif isinstance(result, asyncio.TimeoutError):
+            errors.append(ContainerStatsError(container_id=container_id, error=f"Timed out after {timeout}s"))
+        else:
+            errors.append(ContainerStatsError(container_id=container_id, error=str(result)))
+
+    logger.debug("bulk_stats_collected", requested=requested, collected=len(stats), failed=len(errors))
+    return stats, errors
+
+
+async def _sample_all_stats() -> list[ContainerStats]:
+    containers = await list_containers(all=False)
+    stats: list[ContainerStats] = []
+    if containers:
+        stats, _ = await get_bulk_stats([c.id for c in containers])
+    _container_metrics.update(stats, containers)
+    return stats
+
+
+async def render_container_metrics() -> bytes:
+    """Per-container Prometheus exposition from the latest sampler tick."""
+    if uses_stream_broker():
+        return await _from_broker("/metrics/containers")
+    return _container_metrics.render()
+
+
+def stats_sampler_wanted() -> bool:
+    """
+    Whether this process should run the stats sampler.
+
+    One sampler feeds both the stats history and /metrics/containers. With a
+    stream broker it runs only there, so daemon polling does not grow with
+    the number of workers; workers read its results from the broker.
+    """
+    if uses_stream_broker():
+        return False
+    return settings.stats_history_enabled or (settings.metrics_enabled and settings.container_metrics_enabled)
+
+
+def start_stats_history() -> None:
+    """Start the background sampler that feeds per-container stats history."""
+    global _stats_history
+    if _stats_history is None:
+        _stats_history = StatsHistoryStore(
+            _sample_all_stats,
+            interval=settings.stats_history_interval,
+            capacity=settings.stats_history_capacity,
+            max_containers=settings.stats_history_max_containers,
+        )
+        _stats_history.start()
+
+
+async def stop_stats_history() -> None:
+    """Stop the stats history sampler."""
+    global _stats_history
+    if _stats_history is not None:
+        await _stats_history.stop()
+        _stats_history = None
+
+
+async def get_stats_history(
+    container_id: str,
+    since: Optional[float] = None,
+    step: Optional[float] = None,
+) -> StatsHistoryResponse:
+    """
+    Get downsampled stats history for a container.
+
+    Defaults to the whole retained window at the sampling interval; ``step``
+    is never finer than the sampling interval.
+    """
+    if not settings.stats_history_enabled:
+        raise DockerAgentException("Stats history is disabled", status_code=404)
+    if uses_stream_broker():
+        params = {key: value for key, value in (("since", since), ("step", step)) if value is not None}
+        body = await _from_broker(f"/stats/{quote_id(container_id)}/history", params)
+        return StatsHistoryResponse.model_validate_json(body)
+    if _stats_history is None:
+        raise DockerAgentException("Stats history is disabled", status_code=404)
+
+    history = _stats_history.get(container_id)
+    if history is None:
+        # Names and full IDs map to the short ID the sampler records under
+        attrs = await inspect_container(container_id)
+        history = _stats_history.get(attrs["Id"])
+
+    now = time.time()
+    since = since if since is not None else now - _stats_history.window
+    step = max(step or _stats_history.interval, _stats_history.interval)
+
+    timestamps, series = history.downsample(since, step) if history else ([], {})
+    return StatsHistoryResponse(
+        container_id=container_id,
+        step=step,
+        timestamps=timestamps,
+        series=series,
+    )
+
+
 def _parse_timestamp(value: Any) -> int:
     """Parse a timestamp value to Unix timestamp integer."""
     if isinstance(value, int):
@@ -339,17 +1268,17 @@ def _parse_timestamp(value: Any) -> int:
     return 0
 
 
-def list_images() -> list[ImageSummary]:
+async def list_images() -> list[ImageSummary]:
     """List all Docker images."""
     client = get_client()
-    images = client.images.list()
+    images = await client.get_json("/images/json")
 
     result = [
         ImageSummary(
-            id=img.short_id,
-            tags=img.tags,
-            size=img.attrs.get("Size", 0),
-            created=_parse_timestamp(img.attrs.get("Created", 0)),
+            id=_short_image_id(img["Id"]),
+            tags=[tag for tag in (img.get("RepoTags") or []) if tag != "<none>:<none>"],
+            size=img.get("Size", 0),
+            created=_parse_timestamp(img.get("Created", 0)),
         )
         for img in images
     ]
@@ -358,10 +1287,10 @@ def list_images() -> list[ImageSummary]:
     return result
 
 
-def get_version() -> VersionResponse:
+async def get_version() -> VersionResponse:
     """Get Docker version information."""
     client = get_client()
-    version = client.version()
+    version = await client.get_json("/version")
 
     return VersionResponse(
         api_version=version.get("ApiVersion", "unknown"),
@@ -371,21 +1300,16 @@ def get_version() -> VersionResponse:
     )
 
 
-async def stream_logs(container_id: str) -> Generator[str, None, None]:
-    """Stream container logs asynchronously."""
-    container = get_container(container_id)
-    logs = container.logs(stream=True, follow=True, tail=50)
-    loop = asyncio.get_event_loop()
+async def stream_logs(container_id: str, stream: str = "all") -> AsyncIterator[str]:
+    """Stream container logs asynchronously, optionally only stdout or stderr."""
+    attrs = await inspect_container(container_id)
+    params = {**_log_stream_params(stream), "follow": True, "tail": 50}
 
     logger.debug("log_stream_started", container_id=container_id)
     try:
-        while True:
-            line = await loop.run_in_executor(None, next, logs, None)
-            if line is None:
-                break
-            yield line.decode("utf-8", errors="replace").strip()
-    except StopIteration:
-        pass
+        async with get_client().stream("GET", f"/containers/{quote_id(container_id)}/logs", params) as response:
+            async for line in iter_log_lines(response, _log_parser(attrs)):
+                yield line.text
     except Exception as e:
         logger.error("log_stream_error", container_id=container_id, error=str(e))
         raise
@@ -393,53 +1317,70 @@ async def stream_logs(container_id: str) -> Generator[str, None, None]:
         logger.debug("log_stream_ended", container_id=container_id)
 
 
-async def stream_events() -> Generator[str, None, None]:
-    """Stream Docker events asynchronously."""
-    client = get_client()
-    events = client.events(decode=True)
-    loop = asyncio.get_event_loop()
+def stream_log_frames(container_id: str, stream: str = "all") -> AsyncIterator[str]:
+    """Stream container logs as batched, newline-joined frames for WebSocket delivery."""
+    return batch_lines(
+        stream_logs(container_id, stream=stream),
+        batch_size=settings.log_ws_batch_size,
+        batch_interval=settings.log_ws_batch_interval,
+        queue_size=settings.log_ws_queue_size,
+        policy=settings.log_ws_slow_consumer_policy,
+    )
 
-    logger.debug("event_stream_started")
-    try:
-        while True:
-            event = await loop.run_in_executor(None, next, events, None)
-            if event is None:
-                break
-            yield json.dumps(event)
-    except Exception as e:
-        logger.error("event_stream_error", error=str(e))
-        raise
-    finally:
-        logger.debug("event_stream_ended")
 
+@asynccontextmanager
+async def subscribe_events(
+    event_filter: Optional[EventFilter] = None,
+    queue_size: Optional[int] = None,
+) -> AsyncIterator[Subscription]:
+    """Subscribe to the shared Docker events stream, optionally filtered server-side."""
+    global _event_hub
+    if _event_hub is None:
+        _event_hub = EventHub(get_client(), queue_size=settings.events_subscriber_queue_size)
+    async with _event_hub.subscribe(event_filter, queue_size) as subscription:
+        yield subscription
 
-async def stream_stats(container_id: str) -> Generator[str, None, None]:
+
+async def stream_stats(container_id: str) -> AsyncIterator[str]:
     """Stream container stats asynchronously with correct calculations."""
-    container = get_container(container_id)
-    stats_stream = container.stats(stream=True, decode=True)
-    loop = asyncio.get_event_loop()
+    path = f"/containers/{quote_id(container_id)}/stats"
 
     logger.debug("stats_stream_started", container_id=container_id)
     try:
-        while True:
-            stats = await loop.run_in_executor(None, next, stats_stream, None)
-            if stats is None:
-                break
-
-            cpu_percent = _calculate_cpu_percent(stats)
-            mem_usage = stats.get("memory_stats", {}).get("usage", 0)
-            mem_limit = stats.get("memory_stats", {}).get("limit", 1)
-            mem_percent = round((mem_usage / mem_limit) * 100, 2) if mem_limit > 0 else 0.0
-
-            result = ContainerStatsStream(
-                cpu_percent=cpu_percent,
-                memory_usage=mem_usage,
-                memory_percent=mem_percent,
-                timestamp=datetime.now(timezone.utc).isoformat(),
-            )
-            yield result.model_dump_json()
+        async with get_client().stream("GET", path, {"stream": True}) as response:
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                stats = json.loads(line)
+                _cpu_samples.put(stats.get("id") or container_id, stats.get("cpu_stats", {}))
+
+                cpu_percent = _calculate_cpu_percent(stats)
+                mem_usage = stats.get("memory_stats", {}).get("usage", 0)
+                mem_limit = stats.get("memory_stats", {}).get("limit", 1)
+                mem_percent = round((mem_usage / mem_limit) * 100, 2) if mem_limit > 0 else 0.0
+
+                result = ContainerStatsStream(
+                    cpu_percent=cpu_percent,
+                    memory_usage=mem_usage,
+                    memory_percent=mem_percent,
+                    timestamp=datetime.now(timezone.utc).isoformat(),
+                )
+                yield result.model_dump_json()
     except Exception as e:
         logger.error("stats_stream_error", container_id=container_id, error=str(e))
         raise
     finally:
         logger.debug("stats_stream_ended", container_id=container_id)
+
+
+@asynccontextmanager
+async def subscribe_stats(container_id: str) -> AsyncIterator[Subscription]:
+    """Subscribe to a container's shared stats stream (one daemon stream per container)."""
+    global _stats_hub
+    if _stats_hub is None:
+        _stats_hub = StatsHub(stream_stats, queue_size=settings.stats_subscriber_queue_size)
+
+    # Resolve names/short IDs so every subscriber of a container shares one channel
+    attrs = await inspect_container(container_id)
+    async with _stats_hub.subscribe(attrs["Id"]) as subscription:
+        yield subscription
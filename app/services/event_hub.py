@@ -0,0 +1,157 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, NamedTuple, Optional
+
+from app.core.logging import get_logger
+from app.services.broadcast import Subscription
+from app.services.docker_engine import DockerEngineClient
+
+logger = get_logger(__name__)
+
+
+class DockerEvent(NamedTuple):
+    """One daemon event: the raw JSON line as received, and its decoded form."""
+
+    raw: str
+    data: dict
+
+
+class EventFilter:
+    """
+    Server-side filter for one events subscriber.
+
+    Each criterion is a list of accepted values (any may match); empty
+    criteria match everything. Containers match by ID prefix or name,
+    labels as ``key`` or ``key=value`` (all must match), and actions by
+    full or base action (``health_status`` matches ``health_status: healthy``).
+    """
+
+    __slots__ = ("types", "actions", "containers", "labels")
+
+    def __init__(
+        self,
+        types: Optional[list[str]] = None,
+        actions: Optional[list[str]] = None,
+        containers: Optional[list[str]] = None,
+        labels: Optional[list[str]] = None,
+    ):
+        self.types = set(types or ())
+        self.actions = set(actions or ())
+        self.containers = [c.lstrip("/") for c in containers or ()]
+        self.labels = [label.partition("=") for label in labels or ()]
+
+    def matches(self, event: dict) -> bool:
+        """Whether a decoded event passes every criterion."""
+        if self.types and event.get("Type") not in self.types:
+            return False
+
+        if self.actions:
+            action = event.get("Action") or ""
+            if action not in self.actions and action.split(":", 1)[0] not in self.actions:
+                return False
+
+        actor = event.get("Actor") or {}
+        attributes = actor.get("Attributes") or {}
+        if self.containers:
+            if event.get("Type") != "container":
+                return False
+            actor_id = actor.get("ID", "")
+            name = attributes.get("name")
+            if not any(actor_id.startswith(c) or c == name for c in self.containers):
+                return False
+
+        for key, sep, value in self.labels:
+            if key not in attributes or (sep and attributes[key] != value):
+                return False
+        return True
+
+
+class _EventChannel:
+    """One upstream events stream and its subscribers."""
+
+    def __init__(self):
+        self.subscribers: dict[Subscription, Optional[EventFilter]] = {}
+        self.connected = asyncio.Event()
+        self.error: Optional[BaseException] = None
+        self.task: asyncio.Task | None = None
+
+
+class EventHub:
+    """
+    Shares one daemon events stream across all subscribers.
+
+    Each event is decoded once to evaluate subscriber filters and passed on
+    with its raw line untouched. The upstream stream is opened for the first
+    subscriber and closed when the last one leaves; if it fails, every
+    subscriber is closed with the error and the next subscribe reconnects.
+    """
+
+    def __init__(self, client: DockerEngineClient, queue_size: int):
+        self._client = client
+        self._queue_size = queue_size
+        self._channel: Optional[_EventChannel] = None
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        event_filter: Optional[EventFilter] = None,
+        queue_size: Optional[int] = None,
+    ) -> AsyncIterator[Subscription]:
+        """
+        Subscribe to events matching a filter.
+
+        Waits until the upstream stream is connected, so events emitted after
+        this returns are guaranteed to be delivered (up to the queue size).
+        """
+        channel = self._channel
+        if channel is None:
+            channel = self._channel = _EventChannel()
+            channel.task = asyncio.create_task(self._pump(channel), name="event-hub")
+            logger.debug("event_channel_opened")
+
+        subscription = Subscription(queue_size or self._queue_size)
+        channel.subscribers[subscription] = event_filter
+        try:
+            await channel.connected.wait()
+            if channel.error is not None:
+                raise channel.error
+            yield subscription
+        finally:
+            channel.subscribers.pop(subscription, None)
+            if subscription.dropped:
+                logger.debug("event_subscriber_dropped", dropped=subscription.dropped)
+            if not channel.subscribers and self._channel is channel:
+                self._channel = None
+                channel.task.cancel()
+                logger.debug("event_channel_closed")
+
+    def subscriber_count(self) -> int:
+        """Subscribers on the current upstream stream."""
+        return len(self._channel.subscribers) if self._channel else 0
+
+    async def _pump(self, channel: _EventChannel) -> None:
+        error: Optional[BaseException] = None
+        try:
+            async with self._client.stream("GET", "/events") as response:
+                channel.connected.set()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    event = DockerEvent(line, json.loads(line))
+                    for subscription, event_filter in channel.subscribers.items():
+                        if event_filter is None or event_filter.matches(event.data):
+                            subscription.publish(event)
+            error = ConnectionError("events stream closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+            logger.warning("event_stream_error", error=str(e))
+        finally:
+            channel.error = error
+            channel.connected.set()
+            if self._channel is channel:
+                self._channel = None
+            for subscription in channel.subscribers:
+                subscription.close(error)
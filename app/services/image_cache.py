@@ -0,0 +1,58 @@
+import asyncio
+import time
+from typing import Optional
+
+from app.core.logging import get_logger
+from app.services.docker_engine import DockerEngineClient
+
+logger = get_logger(__name__)
+
+# Unknown IDs (e.g. containers of deleted images) reload at most this often
+MISS_RELOAD_INTERVAL = 1.0  # seconds
+
+
+class ImageTagCache:
+    """
+    Image ID -> repo tags map loaded with a single /images/json call.
+
+    Invalidated by image events (via the container inventory) and reloaded
+    lazily when it expires or an unknown image ID is looked up, so container
+    lists never need a per-container image inspect.
+    """
+
+    def __init__(self, client: DockerEngineClient, ttl: float):
+        self._client = client
+        self._ttl = ttl
+        self._tags: Optional[dict[str, list[str]]] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Drop the cached map; the next lookup reloads it."""
+        self._tags = None
+
+    async def get(self, image_ids: Optional[set[str]] = None) -> dict[str, list[str]]:
+        """Return the tag map, reloading if stale or missing any of image_ids."""
+        if self._is_fresh(image_ids):
+            return self._tags
+
+        async with self._lock:
+            # Another waiter may have reloaded while we queued for the lock
+            if not self._is_fresh(image_ids):
+                await self._load()
+        return self._tags
+
+    def _is_fresh(self, image_ids: Optional[set[str]]) -> bool:
+        age = time.monotonic() - self._loaded_at
+        if self._tags is None or age > self._ttl:
+            return False
+        return not image_ids or age < MISS_RELOAD_INTERVAL or image_ids.issubset(self._tags.keys())
+
+    async def _load(self) -> None:
+        images = await self._client.get_json("/images/json")
+        self._tags = {
+            img["Id"]: [tag for tag in (img.get("RepoTags") or []) if tag != "<none>:<none>"]
+            for img in images
+        }
+        self._loaded_at = time.monotonic()
+        logger.debug("image_tags_loaded", count=len(self._tags))
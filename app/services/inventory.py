@@ -0,0 +1,196 @@
+import asyncio
+import uuid
+from contextlib import AbstractAsyncContextManager
+from typing import Awaitable, Callable, Optional
+
+from app.core.logging import get_logger
+from app.schemas.containers import ContainerSummary
+from app.services.broadcast import Subscription
+from app.services.docker_engine import DockerEngineClient
+from app.services.event_hub import EventFilter
+
+logger = get_logger(__name__)
+
+# Container event actions that change what the list endpoints report
+CONTAINER_ACTIONS = {
+    "create", "start", "restart", "die", "stop", "kill", "pause", "unpause",
+    "rename", "update", "destroy",
+}
+# Image event actions that change image tags or the image count reported by /health
+IMAGE_ACTIONS = {"delete", "import", "load", "pull", "tag", "untag"}
+
+RECONNECT_DELAY = 1.0  # seconds, doubled up to RECONNECT_MAX_DELAY
+RECONNECT_MAX_DELAY = 30.0
+# Events buffered while a refetch is in flight; overflowing triggers a full resync
+EVENT_QUEUE_SIZE = 1024
+
+FetchContainers = Callable[[Optional[dict]], Awaitable[list[ContainerSummary]]]
+SubscribeEvents = Callable[[EventFilter, int], AbstractAsyncContextManager[Subscription]]
+
+
+class ContainerInventory:
+    """
+    In-memory container inventory kept current by the Docker events stream.
+
+    Bootstraps once from the daemon, then applies container events as they
+    arrive through the shared event hub. Every change bumps a monotonically
+    increasing version; together with the per-instance ``instance_id`` it
+    identifies the list's contents within this process (e.g. to cache the
+    rendered response). While the events stream is down the inventory
+    reports itself as not ready so callers fall back to querying the daemon;
+    if events are dropped it re-bootstraps.
+    """
+
+    def __init__(
+        self,
+        client: DockerEngineClient,
+        fetch_containers: FetchContainers,
+        subscribe_events: SubscribeEvents,
+        on_image_event: Optional[Callable[[], None]] = None,
+    ):
+        self._client = client
+        self._fetch_containers = fetch_containers
+        self._subscribe_events = subscribe_events
+        self._on_image_event = on_image_event
+        self._containers: dict[str, ContainerSummary] = {}
+        # Container name -> short ID, kept in step with _containers
+        self._by_name: dict[str, str] = {}
+        self._snapshot: Optional[list[ContainerSummary]] = None
+        self._system: dict = {}
+        self._task: Optional[asyncio.Task] = None
+        self.instance_id = uuid.uuid4().hex
+        self.version = 0
+        self.ready = False
+
+    def start(self) -> None:
+        """Start the background bootstrap/events task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="container-inventory")
+
+    async def stop(self) -> None:
+        """Cancel the background task."""
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def list_containers(self, all: bool = True) -> list[ContainerSummary]:
+        """Return containers newest first, optionally only running ones."""
+        if self._snapshot is None:
+            # ID breaks ties so every worker renders the same order (and ETag)
+            self._snapshot = sorted(self._containers.values(), key=lambda c: (c.created, c.id), reverse=True)
+        if all:
+            return self._snapshot
+        return [c for c in self._snapshot if c.state == "running"]
+
+    def resolve(self, container_id: str) -> Optional[str]:
+        """Short ID of a container given by name, short or full ID; None if unknown."""
+        if len(container_id) >= 12 and container_id[:12] in self._containers:
+            return container_id[:12]
+        return self._by_name.get(container_id.lstrip("/"))
+
+    def counts(self) -> tuple[int, int]:
+        """Return (running, total) container counts."""
+        running = sum(1 for c in self._containers.values() if c.state == "running")
+        return running, len(self._containers)
+
+    @property
+    def system(self) -> dict:
+        """Cached /info and /version payloads captured at bootstrap."""
+        return self._system
+
+    async def _run(self) -> None:
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                event_filter = EventFilter(types=["container", "image"])
+                async with self._subscribe_events(event_filter, EVENT_QUEUE_SIZE) as subscription:
+                    # Subscribe before bootstrapping so no event is missed in between;
+                    # events that arrive meanwhile are buffered and applied afterwards.
+                    await self._bootstrap()
+                    delay = RECONNECT_DELAY
+                    dropped = 0
+                    async for event in subscription:
+                        if subscription.dropped != dropped:
+                            dropped = subscription.dropped
+                            logger.warning("inventory_events_dropped", dropped=dropped)
+                            await self._bootstrap()
+                        await self._apply(event.data)
+                raise ConnectionError("events stream closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.ready = False
+                logger.warning("inventory_stream_error", error=str(e), retry_in=delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def _bootstrap(self) -> None:
+        containers, info, version = await asyncio.gather(
+            self._fetch_containers(None),
+            self._client.get_json("/info"),
+            self._client.get_json("/version"),
+        )
+        self._replace(containers)
+        self._system = {"info": info, "version": version}
+        self.ready = True
+        logger.info("inventory_bootstrapped", containers=len(containers), version=self.version)
+
+    async def _apply(self, event: dict) -> None:
+        event_type = event.get("Type")
+        action = (event.get("Action") or "").split(":", 1)[0]
+
+        if event_type == "image" and action in IMAGE_ACTIONS:
+            if self._on_image_event is not None:
+                self._on_image_event()
+            # Tag changes alter the image names shown for existing containers
+            containers, info = await asyncio.gather(
+                self._fetch_containers(None),
+                self._client.get_json("/info"),
+            )
+            self._replace(containers)
+            self._system = {**self._system, "info": info}
+            return
+
+        if event_type != "container" or (action not in CONTAINER_ACTIONS and action != "health_status"):
+            return
+
+        container_id = (event.get("Actor") or {}).get("ID") or event.get("id", "")
+        short_id = container_id[:12]
+        if action == "destroy":
+            self._remove(short_id)
+            return
+
+        found = await self._fetch_containers({"id": [container_id]})
+        if not found:
+            self._remove(short_id)
+            return
+        current = self._containers.get(short_id)
+        if current != found[0]:
+            if current is not None and self._by_name.get(current.name) == short_id:
+                del self._by_name[current.name]
+            self._containers[short_id] = found[0]
+            self._by_name[found[0].name] = short_id
+            self._changed()
+
+    def _remove(self, short_id: str) -> None:
+        removed = self._containers.pop(short_id, None)
+        if removed is not None:
+            if self._by_name.get(removed.name) == short_id:
+                del self._by_name[removed.name]
+            self._changed()
+
+    def _replace(self, containers: list[ContainerSummary]) -> None:
+        new = {c.id: c for c in containers}
+        if new != self._containers:
+            self._containers = new
+            self._by_name = {c.name: c.id for c in containers}
+            self._changed()
+
+    def _changed(self) -> None:
+        self._snapshot = None
+        self.version += 1
@@ -0,0 +1,62 @@
+import asyncio
+from typing import AsyncIterator
+
+from app.core.exceptions import SlowConsumerError
+from app.services.broadcast import Subscription
+
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+
+
+async def batch_lines(
+    lines: AsyncIterator[str],
+    batch_size: int,
+    batch_interval: float,
+    queue_size: int,
+    policy: str = DROP_OLDEST,
+) -> AsyncIterator[str]:
+    """
+    Coalesce a line stream into newline-joined frames for a slow-ish client.
+
+    A reader task drains ``lines`` into a bounded queue of ``queue_size``
+    lines, so the daemon stream is never blocked by the consumer and memory
+    per client stays bounded. Each frame holds up to ``batch_size`` lines,
+    waiting at most ``batch_interval`` seconds to fill. When the queue is
+    full, ``drop_oldest`` discards the oldest lines and prefixes the next
+    frame with a "[N lines skipped]" marker; ``disconnect`` ends the stream
+    with SlowConsumerError instead.
+    """
+    subscription = Subscription(queue_size)
+
+    async def pump() -> None:
+        error = None
+        try:
+            async for line in lines:
+                if policy == DISCONNECT and subscription.full:
+                    # The client is dropped anyway; discard its backlog
+                    subscription.drain(queue_size)
+                    raise SlowConsumerError(queue_size)
+                subscription.publish(line)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            subscription.close(error)
+
+    task = asyncio.create_task(pump(), name="log-batcher")
+    reported = 0
+    try:
+        async for line in subscription:
+            batch = [line] + subscription.drain(batch_size - 1)
+            if len(batch) < batch_size and batch_interval > 0:
+                await asyncio.sleep(batch_interval)
+                batch += subscription.drain(batch_size - len(batch))
+
+            skipped = subscription.dropped - reported
+            if skipped:
+                reported = subscription.dropped
+                batch.insert(0, f"[{skipped} lines skipped]")
+            yield "\n".join(batch)
+    finally:
+        task.cancel()
@@ -0,0 +1,107 @@
+import asyncio
+import heapq
+import time
+from typing import AsyncIterator, Callable, TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_END = object()
+
+
+async def merge_sorted(sources: list[AsyncIterator[T]], key: Callable[[T], str]) -> AsyncIterator[T]:
+    """
+    K-way merge of individually sorted async streams using a heap.
+
+    Holds one pending item per source, so memory is O(k) regardless of
+    stream length. Ties keep source order.
+    """
+    heap: list[tuple[str, int, T]] = []
+    try:
+        for index, source in enumerate(sources):
+            item = await anext(source, _END)
+            if item is not _END:
+                heap.append((key(item), index, item))
+        heapq.heapify(heap)
+
+        while heap:
+            _, index, item = heap[0]
+            yield item
+            following = await anext(sources[index], _END)
+            if following is _END:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (key(following), index, following))
+    finally:
+        # Release the underlying daemon streams if the consumer stopped early
+        for source in sources:
+            await _close(source)
+
+
+async def merge_live(
+    sources: list[AsyncIterator[T]],
+    key: Callable[[T], str],
+    window: float,
+) -> AsyncIterator[T]:
+    """
+    Merge live (followed) streams in approximate key order.
+
+    Items are held in a heap for up to ``window`` seconds after arriving so
+    ones from slower sources can be slotted in order; the smallest key is
+    released once it has waited out the window, so each item is delayed by
+    at most about twice the window. Ends when every source has ended.
+    """
+    arrivals: asyncio.Queue = asyncio.Queue()
+
+    async def pump(source: AsyncIterator[T]) -> None:
+        try:
+            async for item in source:
+                arrivals.put_nowait(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("log_merge_source_error", error=str(e))
+        finally:
+            arrivals.put_nowait(_END)
+
+    tasks = [asyncio.create_task(pump(source), name="log-merge-source") for source in sources]
+    heap: list[tuple[str, int, float, T]] = []
+    seq = 0
+    active = len(tasks)
+    try:
+        while active or heap:
+            timeout = max(0.0, heap[0][2] + window - time.monotonic()) if heap else None
+            try:
+                item = await asyncio.wait_for(arrivals.get(), timeout) if active else None
+            except asyncio.TimeoutError:
+                item = None
+            if item is _END:
+                active -= 1
+            elif item is not None:
+                heapq.heappush(heap, (key(item), seq, time.monotonic(), item))
+                seq += 1
+
+            # Drain everything else that is already queued before releasing
+            while not arrivals.empty():
+                item = arrivals.get_nowait()
+                if item is _END:
+                    active -= 1
+                else:
+                    heapq.heappush(heap, (key(item), seq, time.monotonic(), item))
+                    seq += 1
+
+            cutoff = time.monotonic() - window
+            while heap and (heap[0][2] <= cutoff or not active):
+                yield heapq.heappop(heap)[3]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _close(source: AsyncIterator) -> None:
+    aclose = getattr(source, "aclose", None)
+    if aclose is not None:
+        await aclose()
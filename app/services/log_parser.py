@@ -0,0 +1,171 @@
+from typing import AsyncIterator, NamedTuple, Optional, Union
+
+import httpx
+
+# Multiplexed stream header: [stream_type, 0, 0, 0, size (4 bytes, big-endian)]
+FRAME_HEADER_SIZE = 8
+STREAM_NAMES = {0: "stdin", 1: "stdout", 2: "stderr"}
+
+Buffer = Union[bytes, bytearray]
+
+
+class LogLine(NamedTuple):
+    """One reassembled log line."""
+
+    stream: str
+    timestamp: Optional[str]
+    text: str
+
+
+class _PendingLine:
+    """Partial line carried over between frames/chunks for one stream."""
+
+    __slots__ = ("data", "timestamp", "truncated")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.timestamp: Optional[str] = None
+        self.truncated = False
+
+
+class LogStreamParser:
+    """
+    Incremental parser for Docker log streams.
+
+    Non-TTY streams are multiplexed into frames with 8-byte headers; TTY
+    streams are raw stdout bytes. Incoming chunks are scanned in place by
+    offset and sliced through a memoryview, so frame payloads and complete
+    lines are decoded straight from the receive buffer rather than copied.
+    Partial lines are reassembled per stream, each line is tagged with its
+    stream and optional timestamp (``timestamps=true`` on the request), and
+    lines longer than ``max_line_length`` bytes are truncated.
+    """
+
+    def __init__(self, tty: bool, timestamps: bool = False, max_line_length: int = 16384):
+        self.tty = tty
+        self.timestamps = timestamps
+        self.max_line_length = max_line_length
+        self._buffer = bytearray()
+        self._pending = {name: _PendingLine() for name in STREAM_NAMES.values()}
+
+    def feed(self, chunk: bytes) -> list[LogLine]:
+        """Consume a chunk and return the lines it completed."""
+        lines: list[LogLine] = []
+        if self.tty:
+            with memoryview(chunk) as view:
+                self._split(chunk, view, 0, len(chunk), "stdout", lines, frame=False)
+            return lines
+
+        # Only an incomplete trailing frame is ever carried between chunks
+        if self._buffer:
+            self._buffer += chunk
+            data: Buffer = self._buffer
+        else:
+            data = chunk
+
+        offset = 0
+        size = len(data)
+        with memoryview(data) as view:
+            while size - offset >= FRAME_HEADER_SIZE:
+                length = int.from_bytes(view[offset + 4:offset + FRAME_HEADER_SIZE], "big")
+                start = offset + FRAME_HEADER_SIZE
+                end = start + length
+                if end > size:
+                    break
+                stream = STREAM_NAMES.get(data[offset], "stdout")
+                self._split(data, view, start, end, stream, lines, frame=True)
+                offset = end
+
+        if data is self._buffer:
+            del self._buffer[:offset]
+        else:
+            self._buffer += chunk[offset:]
+        return lines
+
+    def flush(self) -> list[LogLine]:
+        """Return any unterminated lines at end of stream."""
+        lines = []
+        for stream, pending in self._pending.items():
+            if pending.data or pending.truncated:
+                lines.append(self._emit(stream, pending, None, 0, 0))
+        return lines
+
+    def _split(
+        self,
+        data: Buffer,
+        view: memoryview,
+        start: int,
+        end: int,
+        stream: str,
+        lines: list[LogLine],
+        frame: bool,
+    ) -> None:
+        pending = self._pending[stream]
+
+        # Each frame is one daemon message with its own timestamp prefix;
+        # continuation frames of a long line repeat it. TTY lines are split
+        # from their timestamp once reassembled (see _emit).
+        if self.timestamps and frame:
+            start = self._take_timestamp(data, start, end, pending)
+
+        while start < end:
+            newline = data.find(b"\n", start, end)
+            if newline < 0:
+                self._append(pending, view[start:end])
+                return
+            lines.append(self._emit(stream, pending, view, start, newline))
+            start = newline + 1
+
+    @staticmethod
+    def _at_line_start(pending: _PendingLine) -> bool:
+        return not pending.data and not pending.truncated
+
+    def _take_timestamp(self, data: Buffer, start: int, end: int, pending: _PendingLine) -> int:
+        space = data.find(b" ", start, end)
+        if space < 0:
+            return start
+        if self._at_line_start(pending):
+            pending.timestamp = data[start:space].decode("ascii", errors="replace")
+        return space + 1
+
+    def _append(self, pending: _PendingLine, segment: memoryview) -> None:
+        room = self.max_line_length - len(pending.data)
+        if len(segment) > room:
+            segment = segment[:max(room, 0)]
+            pending.truncated = True
+        pending.data += segment
+
+    def _emit(
+        self,
+        stream: str,
+        pending: _PendingLine,
+        view: Optional[memoryview],
+        start: int,
+        end: int,
+    ) -> LogLine:
+        if self._at_line_start(pending):
+            end = min(end, start + self.max_line_length)
+            text = str(view[start:end], "utf-8", "replace") if view is not None else ""
+        else:
+            if view is not None:
+                self._append(pending, view[start:end])
+            text = pending.data.decode("utf-8", errors="replace")
+            pending.data.clear()
+            pending.truncated = False
+        timestamp = pending.timestamp
+        pending.timestamp = None
+        if self.tty and self.timestamps:
+            prefix, sep, rest = text.partition(" ")
+            if sep:
+                timestamp, text = prefix, rest
+        return LogLine(stream, timestamp, text.rstrip("\r"))
+
+
+async def iter_log_lines(response: httpx.Response, parser: LogStreamParser) -> AsyncIterator[LogLine]:
+    """Parse a streamed logs response into lines."""
+    async for chunk in response.aiter_bytes():
+        for line in parser.feed(chunk):
+            yield line
+    for line in parser.flush():
+        yield line
+
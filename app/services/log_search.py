@@ -0,0 +1,80 @@
+import asyncio
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional
+
+# Worker processes only import this module, so keep it free of app imports.
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+class SearchTimeout(Exception):
+    """A matching batch outran the search timeout; the pool was restarted."""
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern: str, flags: int) -> re.Pattern:
+    return re.compile(pattern, flags)
+
+
+def match_indices(pattern: str, flags: int, lines: list[str]) -> list[int]:
+    """Return the indices of lines matching the pattern (runs in a worker process)."""
+    search = _compile(pattern, flags).search
+    return [i for i, line in enumerate(lines) if search(line)]
+
+
+def start_pool(workers: int) -> ProcessPoolExecutor:
+    """Create the shared search pool on first use."""
+    global _pool
+    if _pool is None:
+        # spawn: forking a process with a running event loop is unsafe
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """
+    Kill the worker processes; their running and queued batches fail with
+    BrokenProcessPool.
+
+    Terminating is the only way to stop a regex that is backtracking; a plain
+    shutdown would leave it running.
+    """
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False)
+
+
+async def _match(workers: int, pattern: str, flags: int, lines: list[str], timeout: float) -> list[int]:
+    loop = asyncio.get_running_loop()
+    pool = start_pool(workers)
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(pool, match_indices, pattern, flags, lines), timeout)
+    except asyncio.TimeoutError:
+        if _pool is pool:
+            shutdown_pool()
+        raise SearchTimeout(f"Pattern matching took longer than {timeout:g}s; search aborted") from None
+    except BrokenProcessPool:
+        if _pool is pool:
+            shutdown_pool()
+        raise
+
+
+async def search_batch(workers: int, pattern: str, flags: int, lines: list[str], timeout: float) -> list[int]:
+    """
+    Match a batch of lines in the process pool without blocking the event loop.
+
+    A batch still unfinished after ``timeout`` seconds restarts the pool and
+    raises SearchTimeout.
+    """
+    try:
+        return await _match(workers, pattern, flags, lines, timeout)
+    except BrokenProcessPool:
+        # Killed by another search's timeout restart (or a crashed worker)
+        return await _match(workers, pattern, flags, lines, timeout)
@@ -0,0 +1,171 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Iterator
+
+from app.core.metrics import SCHEDULER_ACTIVE, SCHEDULER_WAIT, SCHEDULER_WAITING
+
+
+class Lane(IntEnum):
+    """Priority lanes for Docker request/response calls; lower runs first."""
+
+    CONTROL = 0  # Container actions and liveness pings
+    INTERACTIVE = 1  # Single-resource reads for API and MCP users
+    BULK = 2  # Fan-out reads: bulk stats, history sampling, log search
+
+
+STREAMS = "streams"
+
+_current_lane: ContextVar[Lane] = ContextVar("docker_lane", default=Lane.INTERACTIVE)
+
+
+@contextmanager
+def lane(value: Lane) -> Iterator[None]:
+    """Run Docker calls made in this context (and tasks it creates) in a lane."""
+    token = _current_lane.set(value)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+class PrioritySemaphore:
+    """Semaphore that grants waiters lowest priority first, FIFO within a priority."""
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: int) -> None:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+
+        entry = (priority, next(self._seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, entry)
+        try:
+            await entry[2]
+        except asyncio.CancelledError:
+            if entry[2].done() and not entry[2].cancelled():
+                # Granted just as we were cancelled: hand the slot on
+                self.release()
+            elif entry in self._waiters:
+                # Still queued; if release() already popped it, the slot went
+                # to the next waiter (it skips cancelled futures)
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._value += 1
+
+
+class LaneStats:
+    """Queue depth and wait-time counters for one lane, mirrored to Prometheus."""
+
+    __slots__ = ("waiting", "active", "completed", "wait_seconds_total", "max_wait_seconds", "_metrics")
+
+    def __init__(self, name: str):
+        self.waiting = 0
+        self.active = 0
+        self.completed = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        # Label children bound once, so the hot path does no lookups
+        self._metrics = (SCHEDULER_WAITING.labels(name), SCHEDULER_ACTIVE.labels(name), SCHEDULER_WAIT.labels(name))
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__[:-1]}
+
+
+class DockerScheduler:
+    """
+    Admission control for Docker daemon calls.
+
+    Request/response calls share ``max_concurrent`` slots granted by lane
+    priority, so a queued container action is served before queued reads;
+    bulk reads may hold at most ``bulk_concurrent`` of them, leaving room for
+    interactive calls. Long-lived streams are admitted separately (up to
+    ``max_streams``) and never compete for request slots.
+    """
+
+    def __init__(self, max_concurrent: int, bulk_concurrent: int, max_streams: int):
+        self.max_concurrent = max_concurrent
+        self.bulk_concurrent = bulk_concurrent
+        self.max_streams = max_streams
+        self._slots = PrioritySemaphore(max_concurrent)
+        self._bulk = asyncio.Semaphore(bulk_concurrent)
+        self._streams = asyncio.Semaphore(max_streams)
+        self.lanes = {name: LaneStats(name) for name in [lane.name.lower() for lane in Lane] + [STREAMS]}
+
+    @asynccontextmanager
+    async def request_slot(self) -> AsyncIterator[None]:
+        """Hold a request slot in the current lane for the duration of a call."""
+        current = _current_lane.get()
+        bulk = current is Lane.BULK
+
+        async def acquire() -> None:
+            if bulk:
+                await self._bulk.acquire()
+            try:
+                await self._slots.acquire(current)
+            except BaseException:
+                if bulk:
+                    self._bulk.release()
+                raise
+
+        async with self._admitted(current.name.lower(), acquire):
+            try:
+                yield
+            finally:
+                self._slots.release()
+                if bulk:
+                    self._bulk.release()
+
+    @asynccontextmanager
+    async def stream_slot(self) -> AsyncIterator[None]:
+        """Hold a stream slot for the lifetime of a streaming response."""
+        async with self._admitted(STREAMS, self._streams.acquire):
+            try:
+                yield
+            finally:
+                self._streams.release()
+
+    @asynccontextmanager
+    async def _admitted(self, name: str, acquire) -> AsyncIterator[None]:
+        stats = self.lanes[name]
+        waiting_gauge, active_gauge, wait_histogram = stats._metrics
+        started = time.monotonic()
+        stats.waiting += 1
+        waiting_gauge.inc()
+        try:
+            await acquire()
+        finally:
+            stats.waiting -= 1
+            waiting_gauge.dec()
+        waited = time.monotonic() - started
+        stats.wait_seconds_total += waited
+        stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+        wait_histogram.observe(waited)
+        stats.active += 1
+        active_gauge.inc()
+        try:
+            yield
+        finally:
+            stats.active -= 1
+            active_gauge.dec()
+            stats.completed += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """Counters per lane."""
+        return {name: stats.as_dict() for name, stats in self.lanes.items()}
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from array import array
+from typing import Awaitable, Callable, Optional
+
+from app.core.logging import get_logger
+from app.schemas.stats import ContainerStats
+
+logger = get_logger(__name__)
+
+# Metric name -> array typecode. Floats are 4 bytes, byte counters 8 bytes.
+METRICS = {
+    "cpu_percent": "f",
+    "memory_usage": "q",
+    "network_rx": "q",
+    "network_tx": "q",
+    "block_read": "q",
+    "block_write": "q",
+}
+
+
+class ContainerHistory:
+    """
+    Fixed-capacity ring buffers of samples for one container.
+
+    Timestamps and every metric live in preallocated ``array`` columns that
+    share one write cursor, so memory per container is constant:
+    capacity * (8 + 4 + 5 * 8) bytes.
+    """
+
+    __slots__ = ("capacity", "timestamps", "columns", "_next", "_size", "updated_at")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array("d", [0.0]) * capacity
+        self.columns = {name: array(code, [0]) * capacity for name, code in METRICS.items()}
+        self._next = 0
+        self._size = 0
+        self.updated_at = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, stats: ContainerStats) -> None:
+        """Record a sample, overwriting the oldest one when full."""
+        i = self._next
+        self.timestamps[i] = timestamp
+        for name, column in self.columns.items():
+            column[i] = getattr(stats, name)
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.updated_at = timestamp
+
+    def _physical(self, logical: int) -> int:
+        return (self._next - self._size + logical) % self.capacity
+
+    def _first_since(self, since: float) -> int:
+        """Binary search for the oldest logical index with timestamp >= since."""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamps[self._physical(mid)] < since:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def downsample(self, since: float, step: float) -> tuple[list[float], dict[str, dict[str, list[float]]]]:
+        """
+        Aggregate samples newer than ``since`` into ``step``-second buckets.
+
+        Buckets are aligned to multiples of step so repeated queries are
+        stable. Returns bucket start times and min/max/avg per metric.
+        """
+        bucket_starts: list[float] = []
+        series = {name: {"min": [], "max": [], "avg": []} for name in self.columns}
+        sums = {name: 0.0 for name in self.columns}
+        count = 0
+        current = None
+
+        def flush() -> None:
+            for name in self.columns:
+                series[name]["avg"].append(round(sums[name] / count, 2))
+                sums[name] = 0.0
+
+        for logical in range(self._first_since(since), self._size):
+            p = self._physical(logical)
+            ts = self.timestamps[p]
+            bucket = ts - ts % step
+            if bucket != current:
+                if current is not None:
+                    flush()
+                current = bucket
+                count = 0
+                bucket_starts.append(bucket)
+                for name, column in self.columns.items():
+                    series[name]["min"].append(column[p])
+                    series[name]["max"].append(column[p])
+
+            count += 1
+            for name, column in self.columns.items():
+                value = column[p]
+                sums[name] += value
+                agg = series[name]
+                if value < agg["min"][-1]:
+                    agg["min"][-1] = value
+                if value > agg["max"][-1]:
+                    agg["max"][-1] = value
+
+        if current is not None:
+            flush()
+
+        # float32 columns: trim representation noise (e.g. 24.940000534057617)
+        for name, code in METRICS.items():
+            if code == "f":
+                for key in ("min", "max"):
+                    series[name][key] = [round(v, 2) for v in series[name][key]]
+        return bucket_starts, series
+
+
+class StatsHistoryStore:
+    """
+    Per-container histories fed by a periodic background sampler.
+
+    Holds at most ``max_containers`` histories; when full, the least recently
+    updated one is evicted, and histories whose samples have all aged out of
+    the window are dropped.
+    """
+
+    def __init__(
+        self,
+        collect: Callable[[], Awaitable[list[ContainerStats]]],
+        interval: float,
+        capacity: int,
+        max_containers: int,
+    ):
+        self._collect = collect
+        self.interval = interval
+        self.capacity = capacity
+        self.max_containers = max_containers
+        self._histories: dict[str, ContainerHistory] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def window(self) -> float:
+        """Seconds of history each container can hold."""
+        return self.interval * self.capacity
+
+    def get(self, container_id: str) -> Optional[ContainerHistory]:
+        """History for a (short) container ID, if any samples were recorded."""
+        return self._histories.get(container_id[:12])
+
+    def start(self) -> None:
+        """Start the background sampler."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="stats-history-sampler")
+
+    async def stop(self) -> None:
+        """Stop the background sampler."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def record(self, timestamp: float, samples: list[ContainerStats]) -> None:
+        """Append one tick of samples and expire stale histories."""
+        for stats in samples:
+            key = stats.container_id[:12]
+            history = self._histories.get(key)
+            if history is None:
+                if len(self._histories) >= self.max_containers:
+                    oldest = min(self._histories, key=lambda k: self._histories[k].updated_at)
+                    del self._histories[oldest]
+                history = self._histories[key] = ContainerHistory(self.capacity)
+            history.append(timestamp, stats)
+
+        cutoff = timestamp - self.window
+        for key in [k for k, h in self._histories.items() if h.updated_at < cutoff]:
+            del self._histories[key]
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                self.record(time.time(), await self._collect())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("stats_history_sample_error", error=str(e))
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
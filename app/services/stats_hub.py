@@ -0,0 +1,80 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from app.core.logging import get_logger
+from app.services.broadcast import Subscription
+
+logger = get_logger(__name__)
+
+OpenStream = Callable[[str], AsyncIterator[str]]
+
+
+class _StatsChannel:
+    """One upstream stats stream for a container and its subscribers."""
+
+    def __init__(self, container_id: str):
+        self.container_id = container_id
+        self.subscribers: set[Subscription] = set()
+        self.task: asyncio.Task | None = None
+
+
+class StatsHub:
+    """
+    Shares one daemon stats stream per container across all subscribers.
+
+    Each tick is computed and JSON-encoded once by the upstream generator and
+    published to every subscriber's bounded queue. The upstream stream is
+    opened for the first subscriber and torn down when the last one leaves.
+    """
+
+    def __init__(self, open_stream: OpenStream, queue_size: int):
+        self._open_stream = open_stream
+        self._queue_size = queue_size
+        self._channels: dict[str, _StatsChannel] = {}
+
+    @asynccontextmanager
+    async def subscribe(self, container_id: str) -> AsyncIterator[Subscription]:
+        """Subscribe to encoded stats ticks for a (resolved, full) container ID."""
+        channel = self._channels.get(container_id)
+        if channel is None:
+            channel = _StatsChannel(container_id)
+            channel.task = asyncio.create_task(
+                self._pump(channel), name=f"stats-hub-{container_id[:12]}"
+            )
+            self._channels[container_id] = channel
+            logger.debug("stats_channel_opened", container_id=container_id)
+
+        subscription = Subscription(self._queue_size)
+        channel.subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            channel.subscribers.discard(subscription)
+            if subscription.dropped:
+                logger.debug("stats_subscriber_dropped", container_id=container_id, dropped=subscription.dropped)
+            if not channel.subscribers and self._channels.get(container_id) is channel:
+                del self._channels[container_id]
+                channel.task.cancel()
+                logger.debug("stats_channel_closed", container_id=container_id)
+
+    def subscriber_count(self) -> int:
+        """Total subscribers across all channels."""
+        return sum(len(c.subscribers) for c in self._channels.values())
+
+    async def _pump(self, channel: _StatsChannel) -> None:
+        error = None
+        try:
+            async for payload in self._open_stream(channel.container_id):
+                for subscription in channel.subscribers:
+                    subscription.publish(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            # Upstream ended on its own: detach the channel and release subscribers
+            if self._channels.get(channel.container_id) is channel:
+                del self._channels[channel.container_id]
+            for subscription in channel.subscribers:
+                subscription.close(error)
@@ -0,0 +1,36 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class CpuSampleCache:
+    """
+    Last seen ``cpu_stats`` per container, with LRU eviction and a max age.
+
+    Lets one-shot stats reads (which carry no ``precpu_stats``) compute CPU
+    usage against the previous poll instead of waiting a sampling interval.
+    """
+
+    def __init__(self, max_size: int, max_age: float):
+        self._max_size = max_size
+        self._max_age = max_age
+        self._samples: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def get(self, container_id: str) -> Optional[dict]:
+        """Return the previous cpu_stats for a container if it is recent enough."""
+        entry = self._samples.get(container_id)
+        if entry is None:
+            return None
+        taken_at, cpu_stats = entry
+        if time.monotonic() - taken_at > self._max_age:
+            self._samples.pop(container_id, None)
+            return None
+        return cpu_stats
+
+    def put(self, container_id: str, cpu_stats: dict) -> None:
+        """Record the latest cpu_stats for a container."""
+        self._samples[container_id] = (time.monotonic(), cpu_stats)
+        self._samples.move_to_end(container_id)
+        while len(self._samples) > self._max_size:
+            self._samples.popitem(last=False)
+
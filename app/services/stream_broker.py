@@ -0,0 +1,226 @@
+"""
+Host-local broker that shares daemon streams between worker processes.
+
+Every gunicorn worker has its own Docker client, so without a broker each
+one opens its own events stream and its own stats stream per watched
+container. The broker owns those upstream connections instead: workers
+open shareable streams (see ``docker_engine.is_shared_stream``) against the
+broker's unix socket, using the same Engine API paths, and the broker fans
+each upstream line out to every subscriber. Daemon load then no longer
+grows with the worker count.
+
+The broker also runs the single stats sampler: workers read stats history
+and per-container metrics from its ``/agent`` endpoints rather than each
+polling the daemon themselves.
+
+Run alongside the workers (gunicorn.conf.py starts it when
+DOCKER_BROKER_SOCKET is set):
+
+    python -m app.services.stream_broker
+"""
+import asyncio
+import os
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from docker.errors import NotFound
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.api.responses import json_response
+from app.core.config import settings
+from app.core.exceptions import DockerAgentException, docker_agent_exception_handler, docker_not_found_handler
+from app.core.logging import get_logger, setup_logging
+from app.services import docker_service
+from app.services.broadcast import Subscription
+from app.services.container_metrics import CONTENT_TYPE
+from app.services.docker_engine import DockerEngineClient, is_shared_stream
+
+logger = get_logger(__name__)
+
+ChannelKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class SubscriberLagging(ConnectionError):
+    """A subscriber fell a full queue behind its stream and was disconnected."""
+
+
+class _BrokerChannel:
+    """One upstream daemon stream and the worker connections reading it."""
+
+    def __init__(self, key: ChannelKey):
+        self.key = key
+        self.subscribers: set[Subscription] = set()
+        self.connected = asyncio.Event()
+        self.error: Optional[BaseException] = None
+        self.task: asyncio.Task | None = None
+
+
+class StreamBroker:
+    """
+    Shares one upstream stream per (path, query) across worker connections.
+
+    Lines are passed through untouched, so workers parse exactly what the
+    daemon sent. A subscriber that falls ``queue_size`` lines behind is
+    disconnected rather than silently skipped: its worker sees the stream
+    end and reconnects (resyncing whatever it derives from the stream).
+    """
+
+    def __init__(self, client: DockerEngineClient, queue_size: int):
+        self._client = client
+        self._queue_size = queue_size
+        self._channels: dict[ChannelKey, _BrokerChannel] = {}
+
+    @asynccontextmanager
+    async def subscribe(self, path: str, params: dict[str, str]) -> AsyncIterator[Subscription]:
+        """Subscribe to a shared stream; waits until the upstream is connected."""
+        key = (path, tuple(sorted(params.items())))
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = _BrokerChannel(key)
+            channel.task = asyncio.create_task(self._pump(channel), name=f"stream-broker {path}")
+            logger.info("broker_channel_opened", path=path)
+
+        subscription = Subscription(self._queue_size)
+        channel.subscribers.add(subscription)
+        try:
+            await channel.connected.wait()
+            if channel.error is not None:
+                raise channel.error
+            yield subscription
+        finally:
+            channel.subscribers.discard(subscription)
+            if not channel.subscribers and self._channels.get(key) is channel:
+                del self._channels[key]
+                channel.task.cancel()
+                logger.info("broker_channel_closed", path=path)
+
+    def stats(self) -> dict:
+        """Open upstream streams and their subscriber counts."""
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+        }
+
+    async def _pump(self, channel: _BrokerChannel) -> None:
+        path, params = channel.key
+        error: Optional[BaseException] = None
+        try:
+            async with self._client.stream("GET", path, dict(params)) as response:
+                channel.connected.set()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    for subscription in list(channel.subscribers):
+                        if subscription.full:
+                            channel.subscribers.discard(subscription)
+                            subscription.close(SubscriberLagging("subscriber fell behind the stream"))
+                            logger.warning("broker_subscriber_lagging", path=path)
+                        else:
+                            subscription.publish(line)
+            error = ConnectionError("upstream stream closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+            logger.warning("broker_upstream_error", path=path, error=str(e))
+        finally:
+            channel.error = error
+            channel.connected.set()
+            if self._channels.get(channel.key) is channel:
+                del self._channels[channel.key]
+            for subscription in channel.subscribers:
+                subscription.close(error)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the inventory and the stats sampler once for all workers."""
+    if settings.inventory_enabled:
+        docker_service.start_inventory()
+    if docker_service.stats_sampler_wanted():
+        docker_service.start_stats_history()
+    yield
+    await docker_service.stop_stats_history()
+    await docker_service.stop_inventory()
+    await docker_service.close_client()
+
+
+def create_app(broker: StreamBroker) -> FastAPI:
+    """
+    The broker's HTTP surface: Engine API paths for shareable streams, and
+    the stats sampler's results under ``/agent``.
+    """
+    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None, lifespan=lifespan)
+    app.add_exception_handler(DockerAgentException, docker_agent_exception_handler)
+    app.add_exception_handler(NotFound, docker_not_found_handler)
+
+    # Registered before the Engine API catch-all below
+    @app.get("/agent/stats/{container_id}/history")
+    async def stats_history(
+        container_id: str,
+        since: Optional[float] = Query(None),
+        step: Optional[float] = Query(None, gt=0),
+    ):
+        return json_response(await docker_service.get_stats_history(container_id, since=since, step=step))
+
+    @app.get("/agent/metrics/containers")
+    async def container_metrics():
+        return Response(content=await docker_service.render_container_metrics(), media_type=CONTENT_TYPE)
+
+    @app.get("/{version}/{path:path}")
+    async def stream(version: str, path: str, request: Request):
+        path = f"/{path}"
+        if not is_shared_stream(path):
+            return JSONResponse({"message": f"{path} is not a shared stream"}, status_code=404)
+
+        stack = AsyncExitStack()
+        try:
+            subscription = await stack.enter_async_context(broker.subscribe(path, dict(request.query_params)))
+        except NotFound as e:
+            await stack.aclose()
+            return JSONResponse({"message": e.explanation or str(e)}, status_code=404)
+        except Exception as e:
+            await stack.aclose()
+            return JSONResponse({"message": str(e)}, status_code=502)
+
+        async def lines() -> AsyncIterator[str]:
+            try:
+                async for line in subscription:
+                    yield line + "\n"
+            except ConnectionError:
+                # Ending the response is how the worker learns the stream is gone
+                pass
+            finally:
+                await stack.aclose()
+
+        return StreamingResponse(lines(), media_type="application/json")
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    setup_logging()
+    path = settings.docker_broker_socket
+    if not path:
+        raise SystemExit("DOCKER_BROKER_SOCKET is not set")
+
+    # uvicorn makes the socket world-writable; keep it in a private directory
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    if os.path.exists(path):
+        os.unlink(path)
+
+    # Talk to the daemon directly and run the sampler here, not in the workers
+    docker_service.become_stream_broker()
+    broker = StreamBroker(docker_service.get_client(), settings.docker_broker_queue_size)
+    logger.info("stream_broker_starting", socket=path)
+    # Shutdown ends open streams promptly; workers then reconnect to the daemon
+    uvicorn.run(create_app(broker), uds=path, log_level="warning", access_log=False, timeout_graceful_shutdown=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Microbenchmarks for docker_service's parsing and calculation hot paths.
+
+Replays recorded Engine API payloads (benchmarks/payloads/) scaled to 10,
+1,000 and 10,000 containers, writes the timings as JSON and compares them
+with a saved baseline (no Docker daemon needed):
+
+    python benchmarks/bench_docker_service.py --save-baseline   # on the reference commit
+    python benchmarks/bench_docker_service.py                   # later: compare with it
+
+Refresh the payloads from a live daemon (DOCKER_HOST) with
+``--record <container>``.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import pydantic
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+os.environ.setdefault("MCP_ENABLED", "false")
+
+from app.schemas.containers import ContainerListResponse  # noqa: E402
+from app.schemas.stats import BulkStatsResponse  # noqa: E402
+from app.services.docker_service import (  # noqa: E402
+    _calculate_block_io,
+    _calculate_cpu_percent,
+    _calculate_network_io,
+    _detail_from_payload,
+    _parse_timestamp,
+    _stats_from_payload,
+    _summary_from_payload,
+)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PAYLOAD_DIR = os.path.join(BENCH_DIR, "payloads")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+PAYLOAD_FILES = {
+    "summary": "containers_json.json",
+    "inspect": "container_inspect.json",
+    "stats": "container_stats.json",
+}
+SIZES = (10, 1000, 10000)
+
+
+def load_payloads() -> dict[str, dict]:
+    payloads = {}
+    for kind, name in PAYLOAD_FILES.items():
+        with open(os.path.join(PAYLOAD_DIR, name)) as f:
+            payloads[kind] = json.load(f)
+    return payloads
+
+
+def scale(payloads: dict[str, dict], count: int) -> dict[str, list]:
+    """
+    ``count`` distinct containers derived from the recorded ones.
+
+    Identity fields, ports and counters vary per container; the large nested
+    sections (labels, env, mounts) are shared, since nothing under test
+    mutates its input.
+    """
+    summary, inspect, stats = payloads["summary"], payloads["inspect"], payloads["stats"]
+    base_id = summary["Id"]
+    summaries, inspects, samples = [], [], []
+    for i in range(count):
+        container_id = f"{i:08x}{base_id[8:]}"
+        name = f"/service-{i}"
+        port = str(20000 + i % 40000)
+        summaries.append({
+            **summary,
+            "Id": container_id,
+            "Names": [name],
+            "Created": summary["Created"] + i,
+            "Ports": [{**p, "PublicPort": int(port)} if "PublicPort" in p else p for p in summary["Ports"]],
+        })
+        network_settings = inspect["NetworkSettings"]
+        inspects.append({
+            **inspect,
+            "Id": container_id,
+            "Name": name,
+            "NetworkSettings": {
+                **network_settings,
+                "Ports": {
+                    key: [{**m, "HostPort": port} for m in mappings] if mappings else mappings
+                    for key, mappings in network_settings["Ports"].items()
+                },
+            },
+        })
+        cpu_stats = stats["cpu_stats"]
+        samples.append({
+            **stats,
+            "id": container_id,
+            "name": name,
+            "cpu_stats": {
+                **cpu_stats,
+                "cpu_usage": {**cpu_stats["cpu_usage"], "total_usage": cpu_stats["cpu_usage"]["total_usage"] + i * 1000},
+            },
+        })
+    return {"summaries": summaries, "inspects": inspects, "stats": samples}
+
+
+def build_cases(data: dict[str, list]) -> dict[str, Callable[[], Any]]:
+    """One callable per hot path, each processing every container once."""
+    summaries, inspects, samples = data["summaries"], data["inspects"], data["stats"]
+    image_tags = {summaries[0]["ImageID"]: [summaries[0]["Image"]]}
+    created_iso = [attrs["Created"] for attrs in inspects]
+    created_int = [c["Created"] for c in summaries]
+
+    # Built once up front for the serialization-only cases
+    summary_models = [_summary_from_payload(c, image_tags) for c in summaries]
+    detail_models = [_detail_from_payload(attrs, attrs["Config"]["Image"]) for attrs in inspects]
+    stats_models = [_stats_from_payload(s["id"][:12], s) for s in samples]
+
+    return {
+        "calculate_cpu_percent": lambda: [_calculate_cpu_percent(s) for s in samples],
+        "calculate_network_io": lambda: [_calculate_network_io(s) for s in samples],
+        "calculate_block_io": lambda: [_calculate_block_io(s) for s in samples],
+        "parse_timestamp_int": lambda: [_parse_timestamp(v) for v in created_int],
+        "parse_timestamp_iso": lambda: [_parse_timestamp(v) for v in created_iso],
+        # list_containers: port filtering, image/label lookups, model construction
+        "list_summaries_build": lambda: [_summary_from_payload(c, image_tags) for c in summaries],
+        # get_container_details: mounts/networks/ports dicts, model validation
+        "container_details_build": lambda: [
+            _detail_from_payload(attrs, attrs["Config"]["Image"]) for attrs in inspects
+        ],
+        "container_stats_build": lambda: [_stats_from_payload(s["id"][:12], s) for s in samples],
+        "list_response_serialize": lambda: ContainerListResponse(
+            containers=summary_models, total=len(summary_models)
+        ).model_dump_json(by_alias=True),
+        "container_details_serialize": lambda: [d.model_dump_json(by_alias=True) for d in detail_models],
+        "bulk_stats_serialize": lambda: BulkStatsResponse(
+            stats=stats_models, total=len(stats_models)
+        ).model_dump_json(by_alias=True),
+    }
+
+
+def measure(fn: Callable[[], Any], min_time: float, max_runs: int) -> dict:
+    """Time repeated calls (GC paused, like timeit) until ``min_time`` is spent."""
+    fn()
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        while len(timings) < 3 or (time.perf_counter() - started < min_time and len(timings) < max_runs):
+            t0 = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - t0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "runs": len(timings),
+    }
+
+
+def run(sizes: list[int], only: list[str], min_time: float, max_runs: int) -> dict:
+    payloads = load_payloads()
+    results: dict[str, dict] = {}
+    for count in sizes:
+        cases = build_cases(scale(payloads, count))
+        for name, fn in cases.items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            timing = measure(fn, min_time, max_runs)
+            timing["per_container_us"] = timing["median_ms"] * 1000 / count
+            results.setdefault(name, {})[str(count)] = timing
+            print(
+                f"  {name:<30} n={count:<6} {timing['median_ms']:10.3f} ms (best {timing['min_ms']:.3f})"
+                f"  {timing['per_container_us']:8.2f} us/container"
+            )
+    return results
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pydantic": pydantic.VERSION,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Print the change against the baseline; returns the regressed case names.
+
+    Compares best-of-runs times, which are far less sensitive to other load
+    on the machine than medians.
+    """
+    regressions = []
+    print(f"\nBest time against baseline {baseline['meta'].get('commit')} ({baseline['meta'].get('created')})")
+    for name, by_size in results.items():
+        for size, timing in by_size.items():
+            before = baseline["results"].get(name, {}).get(size)
+            if before is None:
+                continue
+            ratio = timing["min_ms"] / before["min_ms"]
+            if ratio > 1 + threshold:
+                verdict = "SLOWER"
+                regressions.append(f"{name}[{size}]")
+            elif ratio < 1 - threshold:
+                verdict = "faster"
+            else:
+                verdict = ""
+            print(
+                f"  {name:<30} n={size:<6} {before['min_ms']:10.3f} -> {timing['min_ms']:10.3f} ms"
+                f"  {(ratio - 1) * 100:+7.1f}%  {verdict}"
+            )
+    return regressions
+
+
+def write_json(path: str, data: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+async def record(container: str) -> None:
+    """Replace the payload files with one container's live Engine API responses."""
+    from app.services.docker_service import create_client
+
+    client = create_client()
+    try:
+        attrs = await client.get_json(f"/containers/{container}/json")
+        entries = await client.get_json(
+            "/containers/json", params={"all": True, "filters": json.dumps({"id": [attrs["Id"]]})}
+        )
+        stats = await client.get_json(f"/containers/{attrs['Id']}/stats", params={"stream": False})
+    finally:
+        await client.close()
+    for kind, payload in (("summary", entries[0]), ("inspect", attrs), ("stats", stats)):
+        write_json(os.path.join(PAYLOAD_DIR, PAYLOAD_FILES[kind]), payload)
+    print(f"Recorded {attrs['Name'].lstrip('/')} into {PAYLOAD_DIR}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")], default=list(SIZES),
+                        help="Comma-separated container counts (default: 10,1000,10000)")
+    parser.add_argument("--only", action="append", default=[], help="Run only cases containing this text")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to spend per case and size")
+    parser.add_argument("--max-runs", type=int, default=1000)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="Also store the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any case regressed")
+    parser.add_argument("--record", metavar="CONTAINER", help="Record payloads from a live daemon and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record))
+        return
+
+    print(f"docker_service hot paths (median of repeated runs, sizes {args.sizes})")
+    results = run(args.sizes, args.only, args.min_time, args.max_runs)
+    report = {"meta": environment(), "results": results}
+    write_json(args.output, report)
+    print(f"\nWrote {args.output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, report)
+        print(f"Saved baseline {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Requests/sec through the app's full middleware stack, before and after the
+pure ASGI RequestIDMiddleware.
+
+Drives app.main's app in-process (no network, no daemon) with two extra
+routes: a small JSON response and a 100-chunk streaming response. "before"
+swaps in the previous BaseHTTPMiddleware implementation:
+
+    python benchmarks/bench_middleware.py --requests 5000 --concurrency 20
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+from typing import Callable
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+os.environ.setdefault("MCP_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from fastapi import Request, Response  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.core.logging import bind_context, clear_context, get_logger, setup_logging  # noqa: E402
+from app.core.metrics import HTTP_REQUEST_DURATION, route_template  # noqa: E402
+from app.core.middleware import RequestIDMiddleware  # noqa: E402
+from app.main import app  # noqa: E402
+
+logger = get_logger("app.core.middleware")
+
+
+class BaseHTTPRequestIDMiddleware(BaseHTTPMiddleware):
+    """The previous RequestIDMiddleware, kept here for comparison."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        bind_context(request_id=request_id, method=request.method, path=request.url.path)
+        request.state.request_id = request_id
+        start_time = time.perf_counter()
+        try:
+            response = await call_next(request)
+            process_time = time.perf_counter() - start_time
+            response.headers["X-Request-ID"] = request_id
+            response.headers["X-Process-Time"] = f"{process_time:.4f}"
+            logger.info("request_completed", status_code=response.status_code, duration_ms=round(process_time * 1000, 2))
+            HTTP_REQUEST_DURATION.labels(
+                request.method, route_template(request.scope), response.status_code
+            ).observe(process_time)
+            return response
+        except Exception as e:
+            process_time = time.perf_counter() - start_time
+            HTTP_REQUEST_DURATION.labels(request.method, route_template(request.scope), 500).observe(process_time)
+            logger.error("request_failed", error=str(e), duration_ms=round(process_time * 1000, 2))
+            raise
+        finally:
+            clear_context()
+
+
+@app.get("/bench/ping")
+async def ping():
+    return {"status": "ok"}
+
+
+@app.get("/bench/stream")
+async def stream():
+    async def chunks():
+        for i in range(100):
+            yield b'{"line": %d}\n' % i
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+def use_middleware(cls: type) -> None:
+    """Swap the request ID middleware class and force the stack to rebuild."""
+    app.user_middleware = [
+        Middleware(cls) if m.cls in (RequestIDMiddleware, BaseHTTPRequestIDMiddleware) else m
+        for m in app.user_middleware
+    ]
+    app.middleware_stack = None
+
+
+async def requests_per_second(path: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get(path)
+        assert "x-request-id" in response.headers and "x-process-time" in response.headers
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                response = await client.get(path)
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+        return (requests // concurrency * concurrency) / (time.perf_counter() - started)
+
+
+async def run(requests: int, concurrency: int) -> dict:
+    results = {}
+    for label, cls in (("before", BaseHTTPRequestIDMiddleware), ("after", RequestIDMiddleware)):
+        use_middleware(cls)
+        for path in ("/bench/ping", "/bench/stream"):
+            results[f"{label} {path}"] = await requests_per_second(path, requests, concurrency)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    # Keep the per-request log call (it is part of the cost) but discard its output
+    setup_logging()
+    root = logging.getLogger()
+    for handler in root.handlers:
+        handler.setStream(open(os.devnull, "w"))
+
+    results = asyncio.run(run(args.requests, args.concurrency))
+    print(f"Requests/sec through the middleware stack ({args.requests} requests, concurrency {args.concurrency})")
+    for name, rps in results.items():
+        print(f"  {name:<24} {rps:10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
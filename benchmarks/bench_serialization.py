@@ -0,0 +1,165 @@
+"""
+Per-request CPU of the JSON response paths, before and after the fast path.
+
+Serves synthetic container lists/details through in-process FastAPI apps
+(no network, no daemon) and reports CPU time per request:
+
+    python benchmarks/bench_serialization.py --containers 1000 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from pydantic_core import to_json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.responses import json_response, versioned_json  # noqa: E402
+from app.schemas.containers import ContainerDetail, ContainerListResponse, ContainerSummary  # noqa: E402
+
+
+def make_summaries(count: int) -> list[ContainerSummary]:
+    return [
+        ContainerSummary(
+            id=f"{i:012x}",
+            name=f"service-{i}",
+            image="registry.example.com/team/service:1.2.3",
+            status="running",
+            state="running",
+            created=1735123456 + i,
+            ports=[{"PrivatePort": 8080, "PublicPort": 20000 + i, "Type": "tcp", "IP": "0.0.0.0"}],
+            compose_project=f"project-{i % 20}",
+        )
+        for i in range(count)
+    ]
+
+
+def make_detail() -> dict:
+    return {
+        "id": "f" * 64,
+        "short_id": "f" * 12,
+        "name": "service-0",
+        "image": "registry.example.com/team/service:1.2.3",
+        "image_id": "sha256:" + "a" * 64,
+        "created": 1735123456,
+        "status": "running",
+        "state": {
+            "status": "running", "running": True, "paused": False, "restarting": False,
+            "pid": 4242, "exit_code": 0, "started_at": "2026-01-01T00:00:00Z", "finished_at": "",
+        },
+        "config": {
+            "hostname": "service-0", "user": "app", "env": [f"VAR_{i}=value-{i}" for i in range(40)],
+            "cmd": ["serve", "--port", "8080"], "entrypoint": None, "working_dir": "/app",
+            "labels": {f"org.example.label-{i}": f"value-{i}" for i in range(30)},
+        },
+        "host_config": {"memory_limit": 0, "cpu_shares": 0, "restart_policy": {"Name": "always"}, "privileged": False},
+        "mounts": [
+            {"type": "bind", "source": f"/srv/{i}", "destination": f"/data/{i}", "mode": "rw", "read_only": False}
+            for i in range(5)
+        ],
+        "networks": {"bridge": {"ip_address": "172.17.0.2", "gateway": "172.17.0.1", "mac_address": "02:42:ac:11:00:02"}},
+        "ports": [{"container_port": 8080, "host_port": 20000, "protocol": "tcp", "host_ip": "0.0.0.0"}],
+    }
+
+
+def build_app(summaries: list[ContainerSummary], detail: dict) -> FastAPI:
+    app = FastAPI()
+    version = 1
+
+    def list_model() -> ContainerListResponse:
+        return ContainerListResponse(containers=summaries, total=len(summaries), version=version)
+
+    # Before: FastAPI re-validates the returned model/dict against response_model
+    # and encodes it through jsonable_encoder + json.dumps
+    @app.get("/before/containers", response_model=ContainerListResponse)
+    async def before_containers():
+        return list_model()
+
+    @app.get("/before/detail", response_model=ContainerDetail)
+    async def before_detail():
+        return dict(detail)
+
+    # After: typed models serialized once by pydantic-core
+    @app.get("/after/containers", response_model=ContainerListResponse)
+    async def after_containers():
+        return json_response(list_model())
+
+    @app.get("/after/containers-versioned", response_model=ContainerListResponse)
+    async def after_containers_versioned(request: Request):
+        async def build():
+            return list_model()
+        return await versioned_json(request, f"containers:bench:{version}", build, etag_exclude={"version"})
+
+    @app.get("/after/detail", response_model=ContainerDetail)
+    async def after_detail():
+        return json_response(ContainerDetail.model_validate(detail))
+
+    return app
+
+
+async def cpu_per_request(client: httpx.AsyncClient, path: str, requests: int, headers: dict = None) -> float:
+    """Mean process CPU time per request in milliseconds (after a warm-up)."""
+    for _ in range(5):
+        await client.get(path, headers=headers)
+    started = time.process_time()
+    for _ in range(requests):
+        response = await client.get(path, headers=headers)
+        assert response.status_code in (200, 304), response.status_code
+    return (time.process_time() - started) / requests * 1000
+
+
+def cpu_per_call(fn, calls: int) -> float:
+    fn()
+    started = time.process_time()
+    for _ in range(calls):
+        fn()
+    return (time.process_time() - started) / calls * 1000
+
+
+async def run(containers: int, requests: int) -> dict:
+    summaries = make_summaries(containers)
+    app = build_app(summaries, make_detail())
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        before = (await client.get("/before/containers")).json()
+        after = (await client.get("/after/containers")).json()
+        assert before == after, "fast path output differs"
+        assert (await client.get("/before/detail")).json() == (await client.get("/after/detail")).json()
+
+        for name in ("before/containers", "after/containers", "after/containers-versioned", "before/detail", "after/detail"):
+            results[name] = await cpu_per_request(client, f"/{name}", requests)
+
+        etag = (await client.get("/after/containers-versioned")).headers["etag"]
+        results["after/containers-304"] = await cpu_per_request(
+            client, "/after/containers-versioned", requests, headers={"If-None-Match": etag}
+        )
+
+    results["before/mcp-list"] = cpu_per_call(
+        lambda: json.dumps([c.model_dump() for c in summaries], indent=2, default=str), requests
+    )
+    results["after/mcp-list"] = cpu_per_call(
+        lambda: to_json(summaries, by_alias=False, fallback=str).decode(), requests
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--containers", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.containers, args.requests))
+    print(f"CPU per request, {args.containers} containers ({args.requests} requests each)")
+    for name, ms in results.items():
+        print(f"  {name:<30} {ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Loaded automatically by gunicorn from the working directory.
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+# Imported up front: child_exit runs in a signal handler, where a first import
+# can re-enter itself when several workers exit together
+from prometheus_client import multiprocess
+
+# Seconds to wait for the stream broker's socket before starting workers anyway
+# (they fall back to direct daemon streams until it is up)
+BROKER_START_TIMEOUT = 10.0
+# Seconds before restarting a stream broker that exited, so one that cannot start does not spin
+BROKER_RESTART_DELAY = 2.0
+
+_broker = None
+_broker_lock = threading.Lock()
+_stopping = threading.Event()
+
+
+def on_starting(server):
+    """Start with an empty Prometheus multiprocess directory and fresh rate limit counters."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+    storage = urlparse(os.environ.get("RATE_LIMIT_STORAGE_URI", ""))
+    if storage.scheme == "shm" and storage.path:
+        try:
+            os.remove(storage.path)
+        except FileNotFoundError:
+            pass
+
+    socket_path = os.environ.get("DOCKER_BROKER_SOCKET")
+    if socket_path:
+        _start_broker(server, socket_path)
+        threading.Thread(target=_supervise_broker, args=(server, socket_path), name="broker-supervisor", daemon=True).start()
+
+
+def _start_broker(server, socket_path):
+    """Run the shared event/stats stream broker next to the workers."""
+    global _broker
+    try:
+        os.remove(socket_path)
+    except FileNotFoundError:
+        pass
+    # Own session: a terminal Ctrl-C reaches the arbiter, which stops the broker in on_exit
+    _broker = subprocess.Popen([sys.executable, "-m", "app.services.stream_broker"], start_new_session=True)
+    deadline = time.monotonic() + BROKER_START_TIMEOUT
+    while not os.path.exists(socket_path):
+        if _broker.poll() is not None or time.monotonic() > deadline:
+            server.log.warning("Stream broker is not up; workers will stream from the daemon directly")
+            return
+        time.sleep(0.05)
+    server.log.info("Stream broker listening on %s (pid %s)", socket_path, _broker.pid)
+
+
+def _supervise_broker(server, socket_path):
+    """
+    Restart the stream broker whenever it exits, until the arbiter stops.
+
+    Workers fall back to daemon streams while it is down, but stats history
+    and /metrics/containers are only served by the broker's sampler.
+    """
+    while True:
+        code = _broker.wait()
+        if _stopping.wait(BROKER_RESTART_DELAY):
+            return
+        with _broker_lock:
+            if _stopping.is_set():
+                return
+            server.log.warning("Stream broker exited with code %s; restarting it", code)
+            _start_broker(server, socket_path)
+
+
+def on_exit(server):
+    """Stop the stream broker with the arbiter."""
+    _stopping.set()
+    with _broker_lock:
+        if _broker is not None and _broker.poll() is None:
+            _broker.terminate()
+            try:
+                _broker.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                _broker.kill()
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges from the aggregated metrics."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,5 @@
+import os
+
+# Settings are loaded at import time; give the required ones test values
+os.environ.setdefault("SECRET_KEY", "test-secret-key-test-secret-key-test")
+os.environ.setdefault("MCP_ENABLED", "false")
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.services.broadcast import Subscription
+from app.services.log_batcher import batch_lines
+
+
+async def _collect(subscription):
+    return [item async for item in subscription]
+
+
+def test_close_on_full_queue_keeps_every_item():
+    subscription = Subscription(3)
+    for item in ("a", "b", "c"):
+        subscription.publish(item)
+    subscription.close()
+
+    assert asyncio.run(_collect(subscription)) == ["a", "b", "c"]
+    assert subscription.dropped == 0
+
+
+def test_close_wakes_waiting_reader():
+    async def run():
+        subscription = Subscription(3)
+        reader = asyncio.create_task(_collect(subscription))
+        await asyncio.sleep(0)
+        subscription.publish("a")
+        subscription.close()
+        return await reader
+
+    assert asyncio.run(run()) == ["a"]
+
+
+def test_error_raised_after_queued_items():
+    subscription = Subscription(2)
+    subscription.publish("a")
+    subscription.publish("b")
+    subscription.close(ConnectionError("gone"))
+
+    async def run():
+        items = []
+        with pytest.raises(ConnectionError):
+            async for item in subscription:
+                items.append(item)
+        return items
+
+    assert asyncio.run(run()) == ["a", "b"]
+
+
+def test_iteration_stays_ended_and_late_publishes_are_ignored():
+    subscription = Subscription(2)
+    subscription.close()
+    subscription.publish("late")
+
+    assert asyncio.run(_collect(subscription)) == []
+    assert asyncio.run(_collect(subscription)) == []
+
+
+def test_drain_stops_at_close():
+    subscription = Subscription(4)
+    subscription.publish("a")
+    subscription.close()
+
+    assert subscription.drain(10) == ["a"]
+    assert asyncio.run(_collect(subscription)) == []
+
+
+def test_batch_lines_keeps_last_line_when_reader_is_behind():
+    async def lines():
+        for i in range(5):
+            yield f"line {i}"
+
+    async def run():
+        frames = []
+        async for frame in batch_lines(lines(), batch_size=100, batch_interval=0, queue_size=5):
+            frames.append(frame)
+        return frames
+
+    assert asyncio.run(run()) == ["\n".join(f"line {i}" for i in range(5))]
@@ -0,0 +1,108 @@
+import os
+import threading
+
+from app.services import cgroup_stats
+from app.services.cgroup_stats import CgroupStatsReader
+
+CONTAINER_ID = "ab" * 32
+
+
+def _make_container(root, container_id=CONTAINER_ID, **files):
+    path = root / "system.slice" / f"docker-{container_id}.scope"
+    path.mkdir(parents=True)
+    contents = {
+        "cpu.stat": "usage_usec 1000000\nuser_usec 800000\nsystem_usec 200000\n",
+        "memory.current": "104857600\n",
+        "memory.max": "max\n",
+        "memory.stat": "anon 73400320\nfile 31457280\ninactive_file 20971520\n",
+        "io.stat": "8:0 rbytes=4096 wbytes=8192 rios=1 wios=2\n",
+        "cpu.pressure": "some avg10=1.50 avg60=0.00 avg300=0.00 total=0\n",
+        "cgroup.procs": "",
+    }
+    contents.update(files)
+    for name, text in contents.items():
+        (path / name).write_text(text)
+    return path
+
+
+def test_reads_container_stats(tmp_path, monkeypatch):
+    monkeypatch.setattr(cgroup_stats, "CPU_WARMUP", 0)
+    _make_container(tmp_path)
+    reader = CgroupStatsReader(str(tmp_path))
+
+    stats, missing = reader.read_many([CONTAINER_ID[:12]])
+
+    assert missing == []
+    assert stats[0].memory_usage == 104857600
+    assert stats[0].memory_inactive_file == 20971520
+    assert (stats[0].block_read, stats[0].block_write) == (4096, 8192)
+    assert stats[0].cpu_pressure == 1.5
+
+
+def test_malformed_value_reads_as_missing(tmp_path, monkeypatch):
+    monkeypatch.setattr(cgroup_stats, "CPU_WARMUP", 0)
+    _make_container(tmp_path, **{"memory.current": "garbage\n"})
+    reader = CgroupStatsReader(str(tmp_path))
+
+    stats, missing = reader.read_many([CONTAINER_ID])
+
+    assert missing == [] and stats[0].memory_usage == 0
+
+
+def test_unparseable_file_falls_back_to_daemon(tmp_path, monkeypatch):
+    monkeypatch.setattr(cgroup_stats, "CPU_WARMUP", 0)
+    _make_container(tmp_path, **{"io.stat": "8:0 rbytes=oops\n"})
+    reader = CgroupStatsReader(str(tmp_path))
+
+    stats, missing = reader.read_many([CONTAINER_ID])
+
+    assert stats == [] and missing == [CONTAINER_ID]
+
+
+def test_names_do_not_rescan_the_hierarchy(tmp_path, monkeypatch):
+    _make_container(tmp_path)
+    reader = CgroupStatsReader(str(tmp_path))
+    scans = []
+    listdir = os.listdir
+    monkeypatch.setattr(cgroup_stats.os, "listdir", lambda p: scans.append(p) or listdir(p))
+
+    for _ in range(5):
+        assert reader.find("web") is None
+
+    assert scans == []
+
+
+def test_id_misses_rescan_at_most_once_per_interval(tmp_path):
+    _make_container(tmp_path)
+    reader = CgroupStatsReader(str(tmp_path))
+    assert reader.find(CONTAINER_ID) is not None
+
+    # A container started after the last scan is found once the interval passes
+    _make_container(tmp_path, container_id="cd" * 32)
+    assert reader.find("cd" * 6) is None
+    reader._indexed_at -= cgroup_stats.INDEX_REBUILD_INTERVAL
+    assert reader.find("cd" * 6) is not None
+
+
+def test_concurrent_reads_share_the_sample_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cgroup_stats, "CPU_WARMUP", 0)
+    ids = [f"{i:02x}" * 32 for i in range(20)]
+    for container_id in ids:
+        _make_container(tmp_path, container_id=container_id)
+    reader = CgroupStatsReader(str(tmp_path), sample_cache_size=5, sample_max_age=0)
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(50):
+                reader.read_many(ids)
+        except Exception as e:  # pragma: no cover - the failure being tested for
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
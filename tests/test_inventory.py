@@ -0,0 +1,82 @@
+import asyncio
+
+from app.schemas.containers import ContainerSummary
+from app.services.inventory import ContainerInventory
+
+WEB_ID = "a" * 64
+DB_ID = "b" * 64
+
+
+def summary(full_id, name, state="running"):
+    return ContainerSummary(id=full_id[:12], name=name, image="nginx", status="Up", state=state, created=1)
+
+
+class FakeDaemon:
+    def __init__(self, *containers):
+        self.containers = {c.id: c for c in containers}
+
+    async def fetch(self, filters):
+        if filters is None:
+            return list(self.containers.values())
+        return [c for c in self.containers.values() if c.id in {i[:12] for i in filters["id"]}]
+
+
+def container_event(action, full_id):
+    return {"Type": "container", "Action": action, "Actor": {"ID": full_id}}
+
+
+def make_inventory(daemon):
+    inventory = ContainerInventory(client=None, fetch_containers=daemon.fetch, subscribe_events=None)
+    inventory._replace(asyncio.run(daemon.fetch(None)))
+    return inventory
+
+
+def test_resolve_by_name_short_and_full_id():
+    inventory = make_inventory(FakeDaemon(summary(WEB_ID, "web"), summary(DB_ID, "db")))
+    assert inventory.resolve("web") == WEB_ID[:12]
+    assert inventory.resolve("/db") == DB_ID[:12]
+    assert inventory.resolve(WEB_ID[:12]) == WEB_ID[:12]
+    assert inventory.resolve(DB_ID) == DB_ID[:12]
+    assert inventory.resolve("missing") is None
+    assert inventory.resolve("c" * 64) is None
+
+
+def test_resolve_follows_events():
+    daemon = FakeDaemon(summary(WEB_ID, "web"))
+    inventory = make_inventory(daemon)
+
+    daemon.containers[DB_ID[:12]] = summary(DB_ID, "db")
+    asyncio.run(inventory._apply(container_event("create", DB_ID)))
+    assert inventory.resolve("db") == DB_ID[:12]
+
+    daemon.containers[WEB_ID[:12]] = summary(WEB_ID, "frontend")
+    asyncio.run(inventory._apply(container_event("rename", WEB_ID)))
+    assert inventory.resolve("frontend") == WEB_ID[:12]
+    assert inventory.resolve("web") is None
+
+    del daemon.containers[DB_ID[:12]]
+    asyncio.run(inventory._apply(container_event("destroy", DB_ID)))
+    assert inventory.resolve("db") is None
+    assert inventory.resolve(DB_ID) is None
+
+
+def test_name_reused_by_new_container():
+    new_id = "c" * 64
+    daemon = FakeDaemon(summary(WEB_ID, "web"))
+    inventory = make_inventory(daemon)
+
+    # docker rm web && docker run --name web: the destroy may arrive after the create
+    daemon.containers = {new_id[:12]: summary(new_id, "web")}
+    asyncio.run(inventory._apply(container_event("create", new_id)))
+    asyncio.run(inventory._apply(container_event("destroy", WEB_ID)))
+    assert inventory.resolve("web") == new_id[:12]
+
+
+def test_resync_rebuilds_name_index():
+    daemon = FakeDaemon(summary(WEB_ID, "web"))
+    inventory = make_inventory(daemon)
+
+    daemon.containers = {DB_ID[:12]: summary(DB_ID, "db")}
+    inventory._replace(asyncio.run(daemon.fetch(None)))
+    assert inventory.resolve("web") is None
+    assert inventory.resolve("db") == DB_ID[:12]
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from app.services.log_merge import merge_live, merge_sorted
+
+
+def by_time(item):
+    return item[0]
+
+
+class Source:
+    """Async source yielding (timestamp, label) items, optionally paced or failing."""
+
+    def __init__(self, items, delay=0.0, error=None):
+        self.items = items
+        self.delay = delay
+        self.error = error
+        self.closed = False
+
+    def __aiter__(self):
+        return self.generate()
+
+    async def generate(self):
+        try:
+            for item in self.items:
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                yield item
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.closed = True
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+def sources(*specs):
+    return [aiter(spec) for spec in specs]
+
+
+def test_merge_sorted_orders_across_sources():
+    a = Source([("01", "a"), ("04", "a"), ("05", "a")])
+    b = Source([("02", "b"), ("03", "b"), ("06", "b")])
+    merged = asyncio.run(collect(merge_sorted(sources(a, b), key=by_time)))
+    assert [t for t, _ in merged] == ["01", "02", "03", "04", "05", "06"]
+
+
+def test_merge_sorted_ties_keep_source_order():
+    a = Source([("01", "a"), ("02", "a")])
+    b = Source([("01", "b"), ("02", "b")])
+    c = Source([("01", "c")])
+    merged = asyncio.run(collect(merge_sorted(sources(c, a, b), key=by_time)))
+    assert merged == [("01", "c"), ("01", "a"), ("01", "b"), ("02", "a"), ("02", "b")]
+
+
+def test_merge_sorted_source_ending_early():
+    a = Source([("01", "a")])
+    b = Source([("02", "b"), ("03", "b")])
+    empty = Source([])
+    merged = asyncio.run(collect(merge_sorted(sources(a, empty, b), key=by_time)))
+    assert merged == [("01", "a"), ("02", "b"), ("03", "b")]
+
+
+def test_merge_sorted_source_error_propagates_and_closes_sources():
+    a = Source([("01", "a"), ("02", "a")], error=ConnectionError("daemon went away"))
+    b = Source([("01", "b"), ("05", "b"), ("06", "b")])
+    received = []
+
+    async def run():
+        async for item in merge_sorted(sources(a, b), key=by_time):
+            received.append(item)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+    assert received == [("01", "a"), ("01", "b"), ("02", "a")]
+    assert a.closed and b.closed
+
+
+def test_merge_sorted_closes_sources_when_consumer_stops():
+    a = Source([("01", "a"), ("03", "a")])
+    b = Source([("02", "b"), ("04", "b")])
+
+    async def run():
+        merged = merge_sorted(sources(a, b), key=by_time)
+        first = await anext(merged)
+        await merged.aclose()
+        return first
+
+    assert asyncio.run(run()) == ("01", "a")
+    assert a.closed and b.closed
+
+
+def test_merge_live_reorders_within_window():
+    # b's earlier items arrive after a's later ones, but within the window
+    a = Source([("02", "a"), ("04", "a")], delay=0.005)
+    b = Source([("01", "b"), ("03", "b")], delay=0.02)
+    merged = asyncio.run(collect(merge_live(sources(a, b), key=by_time, window=0.2)))
+    assert [t for t, _ in merged] == ["01", "02", "03", "04"]
+
+
+def test_merge_live_ties_keep_arrival_order():
+    a = Source([("01", "a")])
+    b = Source([("01", "b")], delay=0.01)
+    merged = asyncio.run(collect(merge_live(sources(a, b), key=by_time, window=0.2)))
+    assert merged == [("01", "a"), ("01", "b")]
+
+
+def test_merge_live_continues_after_source_ends_or_fails():
+    ended = Source([("01", "a")])
+    failing = Source([("02", "b")], error=ConnectionError("daemon went away"))
+    slow = Source([("03", "c"), ("04", "c"), ("05", "c")], delay=0.03)
+    merged = asyncio.run(collect(merge_live(sources(ended, failing, slow), key=by_time, window=0.01)))
+    assert [t for t, _ in merged] == ["01", "02", "03", "04", "05"]
+
+
+def test_merge_live_releases_items_without_waiting_for_other_sources():
+    fast = Source([("01", "a")])
+    idle = Source([("09", "b")], delay=0.5)
+
+    async def run():
+        merged = merge_live(sources(fast, idle), key=by_time, window=0.02)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first = await anext(merged)
+        elapsed = loop.time() - started
+        await merged.aclose()
+        return first, elapsed
+
+    first, elapsed = asyncio.run(run())
+    assert first == ("01", "a")
+    assert elapsed < 0.3
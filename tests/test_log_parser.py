@@ -0,0 +1,100 @@
+from app.services.docker_service import _log_stream_params
+from app.services.log_parser import LogLine, LogStreamParser
+
+STDOUT, STDERR = 1, 2
+
+
+def frame(stream: int, payload: bytes) -> bytes:
+    return bytes([stream, 0, 0, 0]) + len(payload).to_bytes(4, "big") + payload
+
+
+def feed_all(parser: LogStreamParser, chunks: list[bytes]) -> list[LogLine]:
+    lines = []
+    for chunk in chunks:
+        lines += parser.feed(chunk)
+    return lines + parser.flush()
+
+
+def test_frames_in_one_chunk():
+    parser = LogStreamParser(tty=False)
+    data = frame(STDOUT, b"one\ntwo\n") + frame(STDERR, b"oops\n")
+    assert feed_all(parser, [data]) == [
+        LogLine("stdout", None, "one"),
+        LogLine("stdout", None, "two"),
+        LogLine("stderr", None, "oops"),
+    ]
+
+
+def test_header_split_across_chunks():
+    data = frame(STDOUT, b"hello\n") + frame(STDERR, b"world\n")
+    for cut in range(1, 8):
+        parser = LogStreamParser(tty=False)
+        chunks = [data[:cut], data[cut:14 + cut], data[14 + cut:]]
+        assert feed_all(parser, chunks) == [
+            LogLine("stdout", None, "hello"),
+            LogLine("stderr", None, "world"),
+        ], cut
+
+
+def test_payload_split_across_chunks():
+    data = frame(STDOUT, b"first line\nsecond line\n")
+    parser = LogStreamParser(tty=False)
+    lines = [line for i in range(len(data)) for line in parser.feed(data[i:i + 1])]
+    assert lines == [LogLine("stdout", None, "first line"), LogLine("stdout", None, "second line")]
+    assert parser.flush() == []
+
+
+def test_partial_lines_reassembled_per_stream():
+    parser = LogStreamParser(tty=False)
+    chunks = [
+        frame(STDOUT, b"out-") + frame(STDERR, b"err-"),
+        frame(STDOUT, b"line\n") + frame(STDERR, b"line\n"),
+    ]
+    assert feed_all(parser, chunks) == [LogLine("stdout", None, "out-line"), LogLine("stderr", None, "err-line")]
+
+
+def test_unterminated_last_line_flushed():
+    parser = LogStreamParser(tty=False)
+    assert parser.feed(frame(STDOUT, b"done\ntail")) == [LogLine("stdout", None, "done")]
+    assert parser.flush() == [LogLine("stdout", None, "tail")]
+
+
+def test_timestamps_taken_once_per_line():
+    parser = LogStreamParser(tty=False, timestamps=True)
+    chunks = [
+        frame(STDOUT, b"2024-01-01T00:00:00Z long "),
+        frame(STDOUT, b"2024-01-01T00:00:00Z line\n"),
+        frame(STDERR, b"2024-01-01T00:00:01Z err\n"),
+    ]
+    assert feed_all(parser, chunks) == [
+        LogLine("stdout", "2024-01-01T00:00:00Z", "long line"),
+        LogLine("stderr", "2024-01-01T00:00:01Z", "err"),
+    ]
+
+
+def test_long_lines_truncated():
+    parser = LogStreamParser(tty=False, max_line_length=4)
+    chunks = [frame(STDOUT, b"abcdef"), frame(STDOUT, b"gh\nxy\n")]
+    assert feed_all(parser, chunks) == [LogLine("stdout", None, "abcd"), LogLine("stdout", None, "xy")]
+
+
+def test_tty_raw_stream():
+    parser = LogStreamParser(tty=True, timestamps=True)
+    # Bytes that would look like a frame header are plain output in TTY mode
+    chunks = [b"2024-01-01T00:00:00Z \x02\x00 raw", b" text\r\n2024-01-01T00:00:01Z next\r\n", b"2024-01-01T00:00:02Z tail"]
+    assert feed_all(parser, chunks) == [
+        LogLine("stdout", "2024-01-01T00:00:00Z", "\x02\x00 raw text"),
+        LogLine("stdout", "2024-01-01T00:00:01Z", "next"),
+        LogLine("stdout", "2024-01-01T00:00:02Z", "tail"),
+    ]
+
+
+def test_stderr_only_filter():
+    assert _log_stream_params("stderr") == {"stdout": False, "stderr": True}
+    assert _log_stream_params("stdout") == {"stdout": True, "stderr": False}
+    assert _log_stream_params("all") == {"stdout": True, "stderr": True}
+
+    # The daemon then sends only stderr frames; they keep their stream tag
+    parser = LogStreamParser(tty=False)
+    chunks = [frame(STDERR, b"first\nsec"), frame(STDERR, b"ond\n")]
+    assert feed_all(parser, chunks) == [LogLine("stderr", None, "first"), LogLine("stderr", None, "second")]
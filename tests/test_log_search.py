@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import DockerAgentException
+from app.services import docker_service, log_search
+
+BACKTRACKING = r"(a+)+$"
+BACKTRACKING_LINE = "a" * 40 + "b"
+
+
+@pytest.fixture(autouse=True)
+def pool():
+    yield
+    log_search.shutdown_pool()
+
+
+def test_matches_batch():
+    assert asyncio.run(log_search.search_batch(1, "err", 0, ["ok", "error", "stderr"], 30)) == [1, 2]
+
+
+def test_backtracking_pattern_times_out_and_pool_recovers():
+    async def run():
+        await log_search.search_batch(1, "x", 0, ["x"], 30)  # pool startup is not part of the test
+        processes = list(log_search._pool._processes.values())
+        with pytest.raises(log_search.SearchTimeout):
+            await log_search.search_batch(1, BACKTRACKING, 0, [BACKTRACKING_LINE], 1)
+        assert log_search._pool is None
+        for process in processes:
+            process.join(5)
+            assert not process.is_alive()
+        return await log_search.search_batch(1, "b", 0, ["a", "b"], 30)
+
+    assert asyncio.run(run()) == [1]
+
+
+def test_batches_killed_by_another_timeout_are_retried():
+    async def run():
+        await log_search.search_batch(1, "x", 0, ["x"], 30)
+        slow = asyncio.create_task(log_search.search_batch(1, BACKTRACKING, 0, [BACKTRACKING_LINE], 1))
+        await asyncio.sleep(0.1)
+        # Queued behind the backtracking batch on the only worker
+        fast = asyncio.create_task(log_search.search_batch(1, "b", 0, ["b"], 30))
+        with pytest.raises(log_search.SearchTimeout):
+            await slow
+        return await fast
+
+    assert asyncio.run(run()) == [0]
+
+
+def test_rejects_overlong_pattern(monkeypatch):
+    monkeypatch.setattr(settings, "log_search_max_pattern_length", 8)
+    with pytest.raises(DockerAgentException) as excinfo:
+        asyncio.run(docker_service.search_logs("a" * 9))
+    assert excinfo.value.status_code == 400
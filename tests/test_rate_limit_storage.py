@@ -0,0 +1,149 @@
+import multiprocessing
+
+import pytest
+from limits.storage import storage_from_string
+
+from app.core import rate_limit_storage
+from app.core.rate_limit_storage import MAX_PROBE, SharedMemoryStorage
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit_storage, "time", clock)
+    return clock
+
+
+def _storage(tmp_path, slots=64):
+    return SharedMemoryStorage(f"shm://{tmp_path / 'ratelimit'}?slots={slots}")
+
+
+def _hit(uri, key, times):
+    storage = storage_from_string(uri)
+    for _ in range(times):
+        storage.incr(key, 60)
+
+
+def test_counts_within_window(tmp_path, clock):
+    storage = _storage(tmp_path)
+    assert storage.get("k") == 0
+    assert storage.incr("k", 60) == 1
+    assert storage.incr("k", 60, amount=2) == 3
+    assert storage.get("k") == 3
+    assert storage.get("other") == 0
+    assert storage.get_expiry("k") == int(clock.now + 60)
+
+
+def test_expired_window_starts_over(tmp_path, clock):
+    storage = _storage(tmp_path)
+    storage.incr("k", 60)
+    storage.incr("k", 60)
+
+    clock.now += 60
+    assert storage.get("k") == 0
+    assert storage.get_expiry("k") == int(clock.now)
+    assert storage.incr("k", 60) == 1
+    assert storage.get_expiry("k") == int(clock.now + 60)
+
+
+def test_elastic_expiry_extends_window(tmp_path, clock):
+    storage = _storage(tmp_path)
+    storage.incr("k", 60)
+    clock.now += 30
+    storage.incr("k", 60, elastic_expiry=True)
+    assert storage.get_expiry("k") == int(clock.now + 60)
+
+
+def test_clear_and_reset(tmp_path, clock):
+    storage = _storage(tmp_path)
+    storage.incr("a", 60)
+    storage.incr("b", 60)
+
+    storage.clear("a")
+    assert storage.get("a") == 0
+    assert storage.get("b") == 1
+    assert storage.incr("a", 60) == 1
+
+    assert storage.reset() == 2
+    assert storage.get("a") == storage.get("b") == 0
+
+
+def test_cleared_slot_keeps_later_keys_reachable(tmp_path, clock):
+    # One probe window covers the whole table, so every key shares it
+    storage = _storage(tmp_path, slots=MAX_PROBE)
+    keys = [f"key-{i}" for i in range(4)]
+    for key in keys:
+        storage.incr(key, 60)
+    for key in keys[:-1]:
+        storage.clear(key)
+    assert storage.get(keys[-1]) == 1
+
+
+def test_full_probe_window_reuses_expired_slot_first(tmp_path, clock):
+    storage = _storage(tmp_path, slots=MAX_PROBE)
+    for i in range(MAX_PROBE):
+        storage.incr(f"key-{i}", 60 if i != 5 else 10)
+
+    clock.now += 20
+    storage.incr("new", 60)
+    assert storage.get("new") == 1
+    assert storage.get("key-5") == 0
+    assert all(storage.get(f"key-{i}") == 1 for i in range(MAX_PROBE) if i != 5)
+
+
+def test_full_probe_window_evicts_earliest_expiry(tmp_path, clock):
+    storage = _storage(tmp_path, slots=MAX_PROBE)
+    for i in range(MAX_PROBE):
+        storage.incr(f"key-{i}", 100 + i if i != 7 else 50)
+
+    storage.incr("new", 60)
+    assert storage.get("new") == 1
+    assert storage.get("key-7") == 0
+    assert all(storage.get(f"key-{i}") == 1 for i in range(MAX_PROBE) if i != 7)
+
+
+def test_instances_share_one_file(tmp_path):
+    uri = f"shm://{tmp_path / 'ratelimit'}?slots=64"
+    first, second = storage_from_string(uri), storage_from_string(uri)
+    first.incr("k", 60)
+    second.incr("k", 60)
+    assert first.get("k") == second.get("k") == 2
+
+
+def test_processes_share_counts(tmp_path):
+    uri = f"shm://{tmp_path / 'ratelimit'}?slots=64"
+    storage = storage_from_string(uri)
+    storage.incr("k", 60)
+
+    # Forked children inherit the mapping and must re-open it for their own flock
+    context = multiprocessing.get_context("fork")
+    children = [context.Process(target=_hit, args=(uri, "k", 50)) for _ in range(4)]
+    for child in children:
+        child.start()
+    storage.incr("k", 60)
+    for child in children:
+        child.join(10)
+        assert child.exitcode == 0
+
+    assert storage.get("k") == 202
+
+
+def test_forked_child_reopens_inherited_storage(tmp_path):
+    storage = _storage(tmp_path)
+    storage.incr("k", 60)
+
+    context = multiprocessing.get_context("fork")
+    child = context.Process(target=lambda: [storage.incr("k", 60) for _ in range(10)])
+    child.start()
+    child.join(10)
+
+    assert child.exitcode == 0
+    assert storage.get("k") == 11
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.api import responses
+from app.api.responses import versioned_json
+
+
+class Listing(BaseModel):
+    items: list[str]
+    version: int
+
+
+class FakeInventory:
+    def __init__(self):
+        self.version = 1
+        self.items = ["web", "db", "cache"]
+        self.builds = 0
+
+    def update(self, items):
+        self.items = items
+        self.version += 1
+
+
+@pytest.fixture
+def inventory():
+    return FakeInventory()
+
+
+@pytest.fixture
+def client(inventory, monkeypatch):
+    monkeypatch.setattr(responses, "_bodies", OrderedDict())
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items(request: Request, all: bool = False):
+        version = inventory.version
+
+        async def build():
+            inventory.builds += 1
+            shown = inventory.items if all else inventory.items[:1]
+            return Listing(items=shown, version=version)
+
+        return await versioned_json(request, f"items:{all}:{version}", build, etag_exclude={"version"})
+
+    return TestClient(app)
+
+
+def test_repeated_request_gets_304(client, inventory):
+    first = client.get("/items")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == responses.REVALIDATE
+
+    again = client.get("/items", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert inventory.builds == 1
+
+    # Cached body is served again without rebuilding
+    assert client.get("/items").content == first.content
+    assert inventory.builds == 1
+
+
+def test_new_inventory_version_changes_etag(client, inventory):
+    etag = client.get("/items").headers["etag"]
+    inventory.update(["api", "db"])
+
+    response = client.get("/items", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["items"] == ["api"]
+
+
+def test_version_bump_with_same_content_keeps_etag(client, inventory):
+    etag = client.get("/items").headers["etag"]
+    inventory.update(list(inventory.items))
+
+    assert client.get("/items", headers={"If-None-Match": etag}).status_code == 304
+    assert inventory.builds == 2
+
+
+def test_query_params_have_their_own_etag(client):
+    some = client.get("/items")
+    every = client.get("/items", params={"all": "true"})
+    assert some.headers["etag"] != every.headers["etag"]
+    assert client.get("/items", params={"all": "true"}, headers={"If-None-Match": some.headers["etag"]}).status_code == 200
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        "{etag}",
+        "{strong}",
+        '"stale", {etag}',
+        '"stale",{strong} , "other"',
+        "*",
+    ],
+)
+def test_if_none_match_forms(client, header):
+    etag = client.get("/items").headers["etag"]
+    strong = etag.removeprefix("W/")
+    response = client.get("/items", headers={"If-None-Match": header.format(etag=etag, strong=strong)})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("header", ['"stale"', 'W/"stale", "other"', ""])
+def test_if_none_match_mismatch(client, header):
+    client.get("/items")
+    assert client.get("/items", headers={"If-None-Match": header}).status_code == 200
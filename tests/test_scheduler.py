@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.services.scheduler import PrioritySemaphore
+
+
+async def _held_semaphore() -> PrioritySemaphore:
+    semaphore = PrioritySemaphore(1)
+    await semaphore.acquire(0)
+    return semaphore
+
+
+def test_cancel_after_grant_passes_slot_on():
+    async def scenario():
+        semaphore = await _held_semaphore()
+        waiter = asyncio.create_task(semaphore.acquire(0))
+        other = asyncio.create_task(semaphore.acquire(1))
+        await asyncio.sleep(0)
+
+        # The slot is granted to `waiter`, which is cancelled before it resumes
+        semaphore.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        await asyncio.wait_for(other, 1)
+        semaphore.release()
+        assert semaphore._value == 1 and not semaphore._waiters
+
+    asyncio.run(scenario())
+
+
+def test_cancel_then_release_before_waiter_resumes():
+    async def scenario():
+        semaphore = await _held_semaphore()
+        waiter = asyncio.create_task(semaphore.acquire(0))
+        other = asyncio.create_task(semaphore.acquire(1))
+        await asyncio.sleep(0)
+
+        # Cancelled while queued, and release() pops the entry before the
+        # waiter handles its CancelledError
+        waiter.cancel()
+        semaphore.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        await asyncio.wait_for(other, 1)
+        semaphore.release()
+        assert semaphore._value == 1 and not semaphore._waiters
+
+    asyncio.run(scenario())
+
+
+def test_cancel_while_queued_leaves_queue():
+    async def scenario():
+        semaphore = await _held_semaphore()
+        waiter = asyncio.create_task(semaphore.acquire(0))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert not semaphore._waiters
+        semaphore.release()
+        assert semaphore._value == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+import pytest
+
+from app.core import security
+from app.core.config import settings
+from app.core.exceptions import InvalidTokenError, TokenExpiredError
+from app.core.security import create_access_token, decode_access_token
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def token_cache(monkeypatch):
+    monkeypatch.setattr(settings, "jwt_cache_size", 16)
+    monkeypatch.setattr(settings, "algorithm", "HS256")
+    security._validated_tokens.clear()
+    yield
+    security._validated_tokens.clear()
+
+
+@pytest.fixture
+def verifications(monkeypatch):
+    calls = []
+    decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_repeat_presentation_is_a_cache_hit(verifications):
+    token = create_access_token({"sub": "admin"})
+    assert decode_access_token(token)["sub"] == "admin"
+    assert decode_access_token(token)["sub"] == "admin"
+    assert len(verifications) == 1
+
+
+def test_expired_cached_token_raises(verifications, monkeypatch):
+    token = create_access_token({"sub": "admin"}, expires_delta=timedelta(minutes=5))
+    exp = decode_access_token(token)["exp"]
+
+    monkeypatch.setattr(security, "time", FakeClock(exp + 1))
+    with pytest.raises(TokenExpiredError):
+        decode_access_token(token)
+    assert len(verifications) == 1
+    assert not security._validated_tokens
+
+
+def test_changed_secret_invalidates_cache(monkeypatch):
+    token = create_access_token({"sub": "admin"})
+    decode_access_token(token)
+
+    monkeypatch.setattr(settings, "secret_key", "another-secret-key-another-secret-key")
+    with pytest.raises(InvalidTokenError):
+        decode_access_token(token)
+
+
+def test_changed_algorithm_invalidates_cache(monkeypatch):
+    token = create_access_token({"sub": "admin"})
+    decode_access_token(token)
+
+    monkeypatch.setattr(settings, "algorithm", "HS512")
+    with pytest.raises(InvalidTokenError):
+        decode_access_token(token)
+
+
+def test_callers_get_their_own_copy():
+    token = create_access_token({"sub": "admin"})
+    first = decode_access_token(token)
+    first["sub"] = "mallory"
+
+    second = decode_access_token(token)
+    assert second["sub"] == "admin"
+    second["role"] = "root"
+    assert "role" not in decode_access_token(token)
+
+
+def test_cache_is_bounded(monkeypatch, verifications):
+    monkeypatch.setattr(settings, "jwt_cache_size", 2)
+    tokens = [create_access_token({"sub": f"user-{i}"}) for i in range(3)]
+    for token in tokens:
+        decode_access_token(token)
+    assert len(security._validated_tokens) == 2
+
+    # The least recently used token was evicted and is verified again
+    decode_access_token(tokens[0])
+    assert verifications.count(tokens[0]) == 2
+
+
+def test_invalid_token_not_cached():
+    with pytest.raises(InvalidTokenError):
+        decode_access_token("not-a-token")
+    assert not security._validated_tokens
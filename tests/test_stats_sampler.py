@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import DockerAgentException
+from app.services import docker_service
+
+BROKER_SOCKET = "/nonexistent/broker.sock"
+
+
+@pytest.fixture
+def broker_socket(monkeypatch):
+    monkeypatch.setattr(settings, "docker_broker_socket", BROKER_SOCKET)
+    monkeypatch.setattr(settings, "stats_history_enabled", True)
+    monkeypatch.setattr(docker_service, "_is_stream_broker", False)
+
+
+def test_sampler_runs_in_broker_not_workers(broker_socket):
+    assert docker_service.uses_stream_broker()
+    assert not docker_service.stats_sampler_wanted()
+
+    docker_service.become_stream_broker()
+    assert not docker_service.uses_stream_broker()
+    assert docker_service.stats_sampler_wanted()
+
+
+def test_sampler_runs_in_process_without_broker(monkeypatch):
+    monkeypatch.setattr(settings, "docker_broker_socket", "")
+    monkeypatch.setattr(settings, "stats_history_enabled", True)
+    assert docker_service.stats_sampler_wanted()
+
+
+def test_worker_history_unavailable_while_broker_is_down(broker_socket):
+    async def fetch():
+        try:
+            await docker_service.get_stats_history("svc0")
+        finally:
+            await docker_service.close_client()
+
+    with pytest.raises(DockerAgentException) as excinfo:
+        asyncio.run(fetch())
+    assert excinfo.value.status_code == 503